@@ -18,31 +18,26 @@ N_LEVELS = 100         # Number of price levels to display (1-100)
 N_SIG_FIGS = 5        # Price precision/aggregation (2-5)
 
 
-def display_orderbook(data):
-    """Display the order book in a trading terminal style"""
-    if data.get("channel") != "l2Book":
-        return
-
+def format_orderbook(data):
+    """Build the order book screen as a single string"""
     coin = data["data"]["coin"]
     levels = data["data"]["levels"]
 
-    # Clear screen for smooth updates (optional - comment out if you want history)
-    print("\033[2J\033[H", end="")
-
     # Calculate spread
     best_bid = float(levels[0][0]['px']) if levels[0] else 0
     best_ask = float(levels[1][0]['px']) if levels[1] else 0
     spread = best_ask - best_bid
     spread_pct = (spread / best_bid * 100) if best_bid > 0 else 0
 
-    print(f"\n{'='*100}")
-    print(f"📊 {coin} Order Book - Live Market Depth".center(100))
-    print(f"{'='*100}\n")
-
-    # Header for side-by-side display
-    print(f"{'BIDS (Buyers)':^40} │ {'ASKS (Sellers)':^40}")
-    print(f"{'Price':<14} {'Size':<14} {'Orders':<8} │ {'Price':<14} {'Size':<14} {'Orders':<8}")
-    print(f"{'─'*40}─┼─{'─'*40}")
+    lines = [
+        f"\n{'='*100}",
+        f"📊 {coin} Order Book - Live Market Depth".center(100),
+        f"{'='*100}\n",
+        # Header for side-by-side display
+        f"{'BIDS (Buyers)':^40} │ {'ASKS (Sellers)':^40}",
+        f"{'Price':<14} {'Size':<14} {'Orders':<8} │ {'Price':<14} {'Size':<14} {'Orders':<8}",
+        f"{'─'*40}─┼─{'─'*40}",
+    ]
 
     # Get N_LEVELS for each side
     bids = levels[0][:N_LEVELS] if levels[0] else []
@@ -67,12 +62,23 @@ def display_orderbook(data):
         else:
             ask_line = " " * 40
 
-        print(f"{bid_line} │ {ask_line}")
+        lines.append(f"{bid_line} │ {ask_line}")
 
     # Spread display
-    print(f"\n{'─'*100}")
-    print(f"💰 Best Bid: ${best_bid:,.2f}  |  Best Ask: ${best_ask:,.2f}  |  Spread: ${spread:.4f} ({spread_pct:.4f}%)".center(100))
-    print(f"{'─'*100}\n")
+    lines.append(f"\n{'─'*100}")
+    lines.append(f"💰 Best Bid: ${best_bid:,.2f}  |  Best Ask: ${best_ask:,.2f}  |  Spread: ${spread:.4f} ({spread_pct:.4f}%)".center(100))
+    lines.append(f"{'─'*100}\n")
+    return "\n".join(lines)
+
+
+def display_orderbook(data):
+    """Display the order book in a trading terminal style"""
+    if data.get("channel") != "l2Book":
+        return
+
+    # Clear screen for smooth updates (optional - comment out if you want history)
+    # and write the whole screen at once so it doesn't flicker
+    print("\033[2J\033[H" + format_orderbook(data))
 
 
 async def main():
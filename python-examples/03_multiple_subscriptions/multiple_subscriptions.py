@@ -47,17 +47,26 @@ def handle_l2_book(data):
         print(f"📊 {coin} Book: Bid ${bid_price} | Ask ${ask_price} | Spread ${spread:.2f}")
 
 
+def ignore_message(data):
+    """Ignore subscription confirmation messages"""
+    pass
+
+
+# Channel -> handler, looked up once per message instead of walking an if/elif chain
+HANDLERS = {
+    "trades": handle_trade,
+    "l2Book": handle_l2_book,
+    "subscriptionResponse": ignore_message,
+}
+
+
 def route_message(data):
     """Route messages to appropriate handlers"""
     channel = data.get("channel")
+    handler = HANDLERS.get(channel)
 
-    if channel == "trades":
-        handle_trade(data)
-    elif channel == "l2Book":
-        handle_l2_book(data)
-    elif channel == "subscriptionResponse":
-        # Ignore subscription confirmation messages
-        pass
+    if handler:
+        handler(data)
     else:
         print(f"Unknown channel: {channel}")
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Leaderboard Benchmark
+Cost per trade at 500 coins: full sort + VWAP rescan on every dashboard vs incremental rankings
+"""
+
+import random
+import time
+
+from multi_coin_tracker import RANKINGS, MultiCoinTracker
+
+COINS = 500
+TRADES = 200_000
+DISPLAY_EVERY = 10  # Dashboard refresh interval in trades, as in the example
+TOP_K = 10
+SEED = 7
+REPEATS = 3
+
+
+def make_frames():
+    rng = random.Random(SEED)
+    coins = [f"COIN{i}" for i in range(COINS)]
+    weights = [1 / (rank + 1) for rank in range(COINS)]  # A few coins trade far more than the rest
+    prices = {coin: rng.uniform(0.01, 100_000) for coin in coins}
+    frames = []
+    for coin in rng.choices(coins, weights, k=TRADES):
+        prices[coin] *= 1 + rng.gauss(0, 0.001)
+        frames.append({"channel": "trades", "data": [{
+            "coin": coin, "side": rng.choice("AB"), "px": f"{prices[coin]:.6f}", "sz": f"{rng.uniform(0.001, 10):.4f}",
+        }]})
+    return frames
+
+
+def rescan_vwap(tracker):
+    """VWAP the way it was computed before: a pass over the whole window"""
+    total_volume = sum(t["size"] for t in tracker.trades)
+    return sum(t["price"] * t["size"] for t in tracker.trades) / total_volume if total_volume > 0 else 0
+
+
+def full_sort_dashboard(tracker):
+    """What display_summary used to do: sort every coin, rescan VWAP for the shown rows"""
+    ranked = sorted(tracker.trackers.items(), key=lambda x: x[1].total_volume, reverse=True)
+    return [(coin, rescan_vwap(coin_tracker)) for coin, coin_tracker in ranked[:TOP_K]]
+
+
+def run(frames, rankings, dashboard):
+    """Best ns per trade over REPEATS fresh trackers"""
+    results = [run_once(frames, rankings, dashboard) for _ in range(REPEATS)]
+    return min(results, key=lambda result: result[0])
+
+
+def run_once(frames, rankings, dashboard):
+    tracker = MultiCoinTracker(display_interval=0, rankings=rankings)
+    start = time.perf_counter_ns()
+    for i, data in enumerate(frames, 1):
+        tracker.handle_trade(data)
+        if dashboard and i % DISPLAY_EVERY == 0:
+            dashboard(tracker)
+    return (time.perf_counter_ns() - start) / len(frames), tracker
+
+
+def check(tracker):
+    """Leaderboards agree with a full sort, running VWAP with a rescan"""
+    for name, leaderboard in tracker.leaderboards.items():
+        key = RANKINGS[name]
+        expected = sorted((key(t), t.coin) for t in tracker.trackers.values())[-TOP_K:][::-1]
+        assert leaderboard.top(TOP_K) == [coin for _, coin in expected], name
+    for coin_tracker in tracker.trackers.values():
+        assert abs(coin_tracker.get_vwap() - rescan_vwap(coin_tracker)) <= 1e-9 * rescan_vwap(coin_tracker), coin_tracker.coin
+
+
+def main():
+    frames = make_frames()
+    print(f"⏱️  {TRADES:,} trades across {COINS} coins, top {TOP_K} every {DISPLAY_EVERY} trades, best of {REPEATS}\n")
+    print(f"{'Configuration':<44} {'µs/trade':>10}")
+    print("-" * 56)
+
+    configs = [
+        ("full sort + VWAP rescan (before)", (), full_sort_dashboard),
+        ("leaderboard by volume", ("volume",), lambda tracker: tracker.snapshot(TOP_K)),
+        ("all 4 leaderboards, dashboard by volume", tuple(RANKINGS), lambda tracker: tracker.snapshot(TOP_K)),
+        ("no dashboard, no leaderboards", (), None),
+    ]
+    configs += [(f"no dashboard, {name} leaderboard only", (name,), None) for name in RANKINGS]
+
+    for name, rankings, dashboard in configs:
+        ns, tracker = run(frames, rankings, dashboard)
+        print(f"{name:<44} {ns / 1e3:>10.2f}")
+
+    _, tracker = run_once(frames, tuple(RANKINGS), None)
+    check(tracker)
+    print("\n✅ Leaderboards match a full sort; running VWAP matches a rescan")
+    for name, leaderboard in tracker.leaderboards.items():
+        print(f"   {name:<15} top 3: {', '.join(leaderboard.top(3))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import asyncio
 import json
 import os
 import websockets
+from bisect import bisect_left, insort
 from collections import deque
 from datetime import datetime
 from dotenv import load_dotenv
@@ -15,15 +16,24 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+WINDOW = 50           # Trades kept per coin for VWAP and price change
+RESYNC_EVERY = 1_000  # Recompute the running window sums this often to shed float drift
+
+
 class CoinTracker:
     """Track trading metrics for a specific coin"""
 
     def __init__(self, coin):
         self.coin = coin
-        self.trades = deque(maxlen=50)  # Last 50 trades
+        self.trades = deque(maxlen=WINDOW)  # Last 50 trades
         self.total_volume = 0
         self.buy_volume = 0
         self.sell_volume = 0
+        self.trade_count = 0
+
+        # Running sums over the window, so VWAP doesn't rescan the deque
+        self.window_value = 0.0
+        self.window_volume = 0.0
 
     def add_trade(self, trade):
         """Add a trade and update metrics"""
@@ -31,12 +41,24 @@ class CoinTracker:
         size = float(trade["sz"])
         side = trade["side"]
 
+        if len(self.trades) == WINDOW:
+            oldest = self.trades[0]  # Evicted by the append below
+            self.window_value -= oldest["price"] * oldest["size"]
+            self.window_volume -= oldest["size"]
+
         self.trades.append({
             "price": price,
             "size": size,
             "side": side,
             "timestamp": datetime.now()
         })
+        self.window_value += price * size
+        self.window_volume += size
+
+        self.trade_count += 1
+        if self.trade_count % RESYNC_EVERY == 0:
+            self.window_value = sum(t["price"] * t["size"] for t in self.trades)
+            self.window_volume = sum(t["size"] for t in self.trades)
 
         self.total_volume += size
         if side == "B":
@@ -45,12 +67,8 @@ class CoinTracker:
             self.sell_volume += size
 
     def get_vwap(self):
-        """Calculate Volume-Weighted Average Price"""
-        if not self.trades:
-            return 0
-        total_value = sum(t["price"] * t["size"] for t in self.trades)
-        total_volume = sum(t["size"] for t in self.trades)
-        return total_value / total_volume if total_volume > 0 else 0
+        """Calculate Volume-Weighted Average Price over the window"""
+        return self.window_value / self.window_volume if self.window_volume > 0 else 0
 
     def get_buy_sell_ratio(self):
         """Calculate buy/sell volume ratio"""
@@ -62,13 +80,73 @@ class CoinTracker:
         """Get most recent trade price"""
         return self.trades[-1]["price"] if self.trades else 0
 
+    def get_price_change(self):
+        """Percent change from the first to the last trade in the window"""
+        if len(self.trades) < 2:
+            return 0
+        first = self.trades[0]["price"]
+        return (self.trades[-1]["price"] - first) / first * 100 if first > 0 else 0
+
+    def get_vwap_deviation(self):
+        """Percent distance of the latest price from the window VWAP"""
+        vwap = self.get_vwap()
+        return (self.get_latest_price() - vwap) / vwap * 100 if vwap > 0 else 0
+
+
+# Ranking name -> sort key for a CoinTracker
+RANKINGS = {
+    "volume": lambda tracker: tracker.total_volume,
+    "trades": lambda tracker: tracker.trade_count,
+    "price_change": CoinTracker.get_price_change,
+    "vwap_deviation": CoinTracker.get_vwap_deviation,
+}
+
+
+class Leaderboard:
+    """Coins kept sorted by one key, updated one coin at a time.
+
+    A sorted list of (key, coin) plus each coin's current key: an update is one
+    bisect to remove the old entry and one insort, and top/bottom K are slices.
+    """
+
+    def __init__(self, key):
+        self.key = key          # CoinTracker -> sortable value
+        self.ranked = []        # [(value, coin)], ascending
+        self.values = {}        # coin -> value currently in `ranked`
+
+    def update(self, tracker):
+        coin = tracker.coin
+        value = self.key(tracker)
+        old = self.values.get(coin)
+        if old is not None:
+            if old == value:
+                return
+            del self.ranked[bisect_left(self.ranked, (old, coin))]
+        self.values[coin] = value
+        insort(self.ranked, (value, coin))
+
+    def top(self, k):
+        """Coins with the largest values, largest first"""
+        return [coin for _, coin in reversed(self.ranked[-k:])] if k else []
+
+    def bottom(self, k):
+        """Coins with the smallest values, smallest first"""
+        return [coin for _, coin in self.ranked[:k]]
+
+    def __len__(self):
+        return len(self.ranked)
+
 
 class MultiCoinTracker:
     """Track multiple coins simultaneously"""
 
-    def __init__(self):
+    def __init__(self, display_interval=10, rankings=("volume",)):
         self.trackers = {}  # coin -> CoinTracker
         self.total_trades = 0
+        self.display_interval = display_interval  # 0 = never print from handle_trade
+
+        # Maintained on every trade; snapshot(by=...) reads the top K without sorting
+        self.leaderboards = {name: Leaderboard(RANKINGS[name]) for name in rankings}
 
     def handle_trade(self, data):
         """Process incoming trade data"""
@@ -78,53 +156,79 @@ class MultiCoinTracker:
                 continue
 
             # Initialize tracker if new coin
-            if coin not in self.trackers:
-                self.trackers[coin] = CoinTracker(coin)
+            tracker = self.trackers.get(coin)
+            if tracker is None:
+                tracker = self.trackers[coin] = CoinTracker(coin)
 
-            self.trackers[coin].add_trade(trade)
+            tracker.add_trade(trade)
+            for leaderboard in self.leaderboards.values():
+                leaderboard.update(tracker)
             self.total_trades += 1
 
             # Display summary every 10 trades
-            if self.total_trades % 10 == 0:
+            if self.display_interval and self.total_trades % self.display_interval == 0:
                 self.display_summary()
 
+    def top(self, k=10, by="volume"):
+        """The k leading coins by a ranking; rankings not maintained fall back to a full sort"""
+        leaderboard = self.leaderboards.get(by)
+        if leaderboard is not None:
+            return leaderboard.top(k)
+        key = RANKINGS[by]
+        return [tracker.coin for tracker in sorted(self.trackers.values(), key=key, reverse=True)[:k]]
+
+    def snapshot(self, limit=10, by="volume"):
+        """Immutable copy of the dashboard data, safe to hand to another thread"""
+        leaders = [self.trackers[coin] for coin in self.top(limit, by)]
+        rows = tuple(
+            (
+                tracker.coin,
+                tracker.get_latest_price(),
+                tracker.get_vwap(),
+                tracker.total_volume,
+                tracker.get_buy_sell_ratio(),
+                len(tracker.trades),
+            )
+            for tracker in leaders
+        )
+        return {"total_trades": self.total_trades, "coin_count": len(self.trackers), "rows": rows}
+
     def display_summary(self):
         """Display trading metrics for all coins"""
         if not self.trackers:
             return
 
-        print(f"\n{'='*80}")
-        print(f"📊 Multi-Coin Trading Dashboard - Total Trades: {self.total_trades}")
-        print(f"{'='*80}")
-        print(f"{'Coin':<8} {'Latest $':<12} {'VWAP $':<12} {'Volume':<10} {'B/S Ratio':<10} {'Trades':<8}")
-        print(f"{'-'*80}")
-
-        # Sort by total volume
-        sorted_coins = sorted(
-            self.trackers.items(),
-            key=lambda x: x[1].total_volume,
-            reverse=True
+        print(format_summary(self.snapshot()))
+
+
+def format_summary(snapshot):
+    """Build the dashboard for a MultiCoinTracker snapshot as a single string"""
+    lines = [
+        f"\n{'='*80}",
+        f"📊 Multi-Coin Trading Dashboard - Total Trades: {snapshot['total_trades']}",
+        f"{'='*80}",
+        f"{'Coin':<8} {'Latest $':<12} {'VWAP $':<12} {'Volume':<10} {'B/S Ratio':<10} {'Trades':<8}",
+        f"{'-'*80}",
+    ]
+
+    for coin, latest, vwap, volume, ratio, trade_count in snapshot["rows"]:  # Top 10
+        ratio_str = f"{ratio:.2f}" if ratio != float('inf') else "∞"
+
+        lines.append(
+            f"{coin:<8} "
+            f"${latest:<11,.2f} "
+            f"${vwap:<11,.2f} "
+            f"{volume:<10.2f} "
+            f"{ratio_str:<10} "
+            f"{trade_count:<8}"
         )
 
-        for coin, tracker in sorted_coins[:10]:  # Show top 10
-            vwap = tracker.get_vwap()
-            latest = tracker.get_latest_price()
-            ratio = tracker.get_buy_sell_ratio()
-            ratio_str = f"{ratio:.2f}" if ratio != float('inf') else "∞"
-
-            print(
-                f"{coin:<8} "
-                f"${latest:<11,.2f} "
-                f"${vwap:<11,.2f} "
-                f"{tracker.total_volume:<10.2f} "
-                f"{ratio_str:<10} "
-                f"{len(tracker.trades):<8}"
-            )
-
-        if len(self.trackers) > 10:
-            print(f"\n... and {len(self.trackers) - 10} more coins")
+    hidden = snapshot["coin_count"] - len(snapshot["rows"])
+    if hidden > 0:
+        lines.append(f"\n... and {hidden} more coins")
 
-        print(f"{'='*80}\n")
+    lines.append(f"{'='*80}\n")
+    return "\n".join(lines)
 
 
 async def main():
@@ -7,24 +7,83 @@ Handles disconnections and automatically reconnects
 import asyncio
 import json
 import os
+import random
+import time
 import websockets
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Demo configuration
+FORCE_DISCONNECT_EVERY = 0  # Seconds between forced disconnects to measure recovery (0 = off)
+USE_STANDBY = True          # Keep a warm standby connection ready for instant failover
+
+
+def _frame_coin(data):
+    """Coin of a decoded trades / l2Book / l4Book frame, for per-coin profiling; None for other channels"""
+    channel, payload = data.get("channel"), data.get("data")
+    if not payload:
+        return None
+    if channel == "trades":
+        return payload[0].get("coin")
+    if channel == "l2Book":
+        return payload.get("coin")
+    if channel != "l4Book":
+        return None
+    # l4Book Updates often carry the coin only per order status or book diff
+    body = payload.get("Snapshot") or payload.get("Updates") or {}
+    if body.get("coin"):
+        return body["coin"]
+    for status in body.get("order_statuses", []):
+        if status.get("order", {}).get("coin"):
+            return status["order"]["coin"]
+    for diff in body.get("book_diffs", []):
+        if diff.get("coin"):
+            return diff["coin"]
+    return None
+
 
 class RobustWSClient:
     """WebSocket client with automatic reconnection"""
 
-    def __init__(self, ws_url):
+    def __init__(self, ws_url, use_standby=False, heartbeat_interval=5, heartbeat_timeout=5, profiler=None,
+                 connect_kwargs=None):
         self.ws_url = ws_url
+        self.connect_kwargs = connect_kwargs or {}  # Extra websockets.connect options, e.g. max_size
         self.websocket = None
+        self.standby = None  # Warm spare connection, promoted on failure
+        self.use_standby = use_standby
         self.subscriptions = []  # Track active subscriptions
+        self.subscription_payloads = []  # Pre-serialized so resubscribing costs no JSON work
         self.is_running = False
-        self.reconnect_delay = 1  # Start with 1 second
+        self.base_reconnect_delay = 1  # Start with 1 second
+        self.reconnect_delay = self.base_reconnect_delay
+        self.standby_delay = self.base_reconnect_delay  # Separate backoff, so standby failures don't slow the primary
         self.max_reconnect_delay = 60  # Max 60 seconds
 
+        # Liveness: if nothing arrives for heartbeat_interval we ping,
+        # and if the pong doesn't come back within heartbeat_timeout the link is dead
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.last_message_time = 0.0
+
+        # Recovery measurement: time from detecting failure to first message after reconnect
+        self.disconnected_at = None
+        self.recovery_times = []
+
+        self._background_tasks = []
+
+        # Optional stage profiler (see example 17); None keeps the loop free of timing calls
+        self.profiler = profiler
+
+        # Channel -> handler; subclasses can add entries for more channels
+        self.handlers = {
+            "trades": self.handle_trade,
+            "l2Book": self.handle_l2_book,
+            "subscriptionResponse": lambda data: None,
+        }
+
     def add_subscription(self, sub_type, coin, **kwargs):
         """Add a subscription to track"""
         sub = {
@@ -36,30 +95,124 @@ class RobustWSClient:
             }
         }
         self.subscriptions.append(sub)
+        self.subscription_payloads.append(json.dumps(sub))
+
+    async def _open(self):
+        """Open a new WebSocket connection"""
+        return await websockets.connect(self.ws_url, **self.connect_kwargs)
+
+    async def _subscribe_all(self, websocket):
+        """Send every subscription at once instead of one round-trip each"""
+        await asyncio.gather(*(websocket.send(payload) for payload in self.subscription_payloads))
+        print(f"✅ Subscribed to {len(self.subscriptions)} feeds")
 
     async def connect(self):
         """Connect and subscribe to all tracked subscriptions"""
         try:
-            self.websocket = await websockets.connect(self.ws_url)
+            self.websocket = await self._open()
             print(f"✅ Connected to {self.ws_url}")
 
             # Resubscribe to all subscriptions
-            for sub in self.subscriptions:
-                await self.websocket.send(json.dumps(sub))
-                coin = sub["subscription"]["coin"]
-                sub_type = sub["subscription"]["type"]
-                print(f"✅ Subscribed to {coin} {sub_type}")
+            await self._subscribe_all(self.websocket)
 
             # Reset reconnect delay on successful connection
-            self.reconnect_delay = 1
+            self.reconnect_delay = self.base_reconnect_delay
 
         except Exception as e:
             print(f"❌ Connection failed: {e}")
+            self.websocket = None
             raise
 
+    def _backoff(self, previous):
+        """Decorrelated jitter backoff: random between base and 3x the previous delay"""
+        return min(self.max_reconnect_delay, random.uniform(self.base_reconnect_delay, previous * 3))
+
+    def next_reconnect_delay(self):
+        """Next delay before reconnecting the primary connection"""
+        self.reconnect_delay = self._backoff(self.reconnect_delay)
+        return self.reconnect_delay
+
+    async def _watchdog(self):
+        """Detect silent connection death with pings instead of waiting for ConnectionClosed"""
+        while self.is_running:
+            await asyncio.sleep(self.heartbeat_interval)
+            websocket = self.websocket
+            if not websocket:
+                continue
+            if time.monotonic() - self.last_message_time < self.heartbeat_interval:
+                continue  # Data is flowing, no need to ping
+
+            try:
+                pong_waiter = await websocket.ping()
+                await asyncio.wait_for(pong_waiter, timeout=self.heartbeat_timeout)
+            except Exception:
+                if websocket is self.websocket:
+                    print(f"💔 No pong within {self.heartbeat_timeout}s, dropping connection")
+                    self._abort(websocket)
+
+    async def _maintain_standby(self):
+        """Keep a connected (but unsubscribed) spare socket ready for promotion"""
+        while self.is_running:
+            if self.standby is None:
+                try:
+                    self.standby = await self._open()
+                    self.standby_delay = self.base_reconnect_delay
+                    print("🛟 Standby connection ready")
+                except Exception as e:
+                    print(f"⚠️  Standby connection failed: {e}")
+                    self.standby_delay = self._backoff(self.standby_delay)
+                    await asyncio.sleep(self.standby_delay)
+                    continue
+
+            await asyncio.sleep(self.heartbeat_interval)
+
+            standby = self.standby
+            if standby is None:
+                continue
+            try:
+                pong_waiter = await standby.ping()
+                await asyncio.wait_for(pong_waiter, timeout=self.heartbeat_timeout)
+            except Exception:
+                # Only if it's still the spare: it may have been promoted while the ping was pending
+                if standby is self.standby:
+                    self.standby = None
+                    self._abort(standby)
+
+    def _abort(self, websocket):
+        """Tear down a connection immediately without waiting for a close handshake"""
+        transport = getattr(websocket, "transport", None)
+        if transport:
+            transport.abort()
+
+    async def _failover(self):
+        """Promote the standby connection, or fall back to a fresh connect"""
+        if self.standby is not None:
+            self.websocket, self.standby = self.standby, None
+            try:
+                await self._subscribe_all(self.websocket)
+                self.reconnect_delay = self.base_reconnect_delay
+                print("🔀 Promoted standby connection")
+                return
+            except Exception as e:
+                print(f"⚠️  Standby promotion failed: {e}")
+                self.websocket = None
+
+        delay = self.next_reconnect_delay()
+        print(f"⚠️  Reconnecting in {delay:.2f}s...")
+        await asyncio.sleep(delay)
+
+    def force_disconnect(self):
+        """Kill the active connection to measure recovery time"""
+        if self.websocket:
+            print("🧪 Forcing disconnect")
+            self._abort(self.websocket)
+
     async def listen(self):
         """Listen for messages with automatic reconnection"""
         self.is_running = True
+        self._background_tasks.append(asyncio.create_task(self._watchdog()))
+        if self.use_standby:
+            self._background_tasks.append(asyncio.create_task(self._maintain_standby()))
 
         while self.is_running:
             try:
@@ -68,31 +221,73 @@ class RobustWSClient:
                     await self.connect()
 
                 # Listen for messages
+                self.last_message_time = time.monotonic()
                 async for message in self.websocket:
-                    data = json.loads(message)
-                    self.handle_message(data)
+                    self.last_message_time = time.monotonic()
+                    if self.disconnected_at is not None:
+                        self._record_recovery()
+                    self.process_message(message)
 
-            except websockets.exceptions.ConnectionClosed:
-                print(f"⚠️  Connection closed. Reconnecting in {self.reconnect_delay}s...")
-                await asyncio.sleep(self.reconnect_delay)
+                print("⚠️  Connection closed by server.")
 
-                # Exponential backoff
-                self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
-                self.websocket = None
+            except websockets.exceptions.ConnectionClosed:
+                print("⚠️  Connection closed.")
 
             except Exception as e:
                 print(f"❌ Error: {e}")
-                await asyncio.sleep(self.reconnect_delay)
-                self.websocket = None
+
+            if not self.is_running:
+                break
+
+            if self.disconnected_at is None:
+                self.disconnected_at = time.monotonic()
+            if self.websocket:
+                self._abort(self.websocket)
+            self.websocket = None
+            await self._failover()
+
+    def _record_recovery(self):
+        """Record time from failure detection to first message on the new connection"""
+        recovery = time.monotonic() - self.disconnected_at
+        self.disconnected_at = None
+        self.recovery_times.append(recovery)
+        print(f"⏱️  Recovered in {recovery * 1000:.0f}ms (time to first message)")
+
+    def process_message(self, message):
+        """Decode one raw frame and handle it"""
+        profiler = self.profiler
+        if profiler is None or not profiler.enabled:
+            self.handle_message(json.loads(message))
+        elif profiler.tick():
+            self._process_profiled(message, profiler)
+        else:
+            self.handle_message(json.loads(message))
+            if profiler.next_is_sampled():
+                profiler.mark_end()
+
+    def _process_profiled(self, message, profiler):
+        """process_message with wall and CPU time recorded per stage"""
+        wall, cpu = time.perf_counter_ns(), time.thread_time_ns()
+        profiler.record_receive(wall, cpu)
+
+        data = json.loads(message)
+        decoded_wall, decoded_cpu = time.perf_counter_ns(), time.thread_time_ns()
+        profiler.record(("decode",), decoded_wall - wall, decoded_cpu - cpu)
+
+        self.handle_message(data)
+        done_wall, done_cpu = time.perf_counter_ns(), time.thread_time_ns()
+        channel = data.get("channel")
+        profiler.record(("handler", channel, _frame_coin(data)), done_wall - decoded_wall, done_cpu - decoded_cpu)
+        if profiler.next_is_sampled():
+            profiler.mark_end(done_wall, done_cpu)
 
     def handle_message(self, data):
         """Process incoming messages"""
         channel = data.get("channel")
+        handler = self.handlers.get(channel)
 
-        if channel == "trades":
-            self.handle_trade(data)
-        elif channel == "l2Book":
-            self.handle_l2_book(data)
+        if handler:
+            handler(data)
         else:
             print(f"Unknown channel: {channel}")
 
@@ -119,11 +314,28 @@ class RobustWSClient:
     async def stop(self):
         """Stop the client gracefully"""
         self.is_running = False
+        for task in self._background_tasks:
+            task.cancel()
+        self._background_tasks = []
+        if self.standby:
+            await self.standby.close()
+            self.standby = None
         if self.websocket:
             await self.websocket.close()
         print("Disconnected")
 
 
+async def force_disconnects(client, interval):
+    """Periodically kill the connection and report recovery statistics"""
+    while True:
+        await asyncio.sleep(interval)
+        client.force_disconnect()
+        if client.recovery_times:
+            times = sorted(client.recovery_times)
+            median = times[len(times) // 2]
+            print(f"📏 Recovery over {len(times)} disconnects: median {median * 1000:.0f}ms, worst {times[-1] * 1000:.0f}ms")
+
+
 async def main():
     ws_url = os.getenv("WEBSOCKET_URL")
 
@@ -132,7 +344,7 @@ async def main():
         return
 
     # Create robust client
-    client = RobustWSClient(ws_url)
+    client = RobustWSClient(ws_url, use_standby=USE_STANDBY)
 
     # Add subscriptions
     client.add_subscription("trades", "BTC")
@@ -141,6 +353,9 @@ async def main():
     print("🚀 Starting robust WebSocket client...")
     print("💡 Try disconnecting your network to see reconnection in action!\n")
 
+    if FORCE_DISCONNECT_EVERY:
+        asyncio.create_task(force_disconnects(client, FORCE_DISCONNECT_EVERY))
+
     try:
         await client.listen()
     except KeyboardInterrupt:
@@ -149,4 +364,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
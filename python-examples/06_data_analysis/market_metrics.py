@@ -80,41 +80,50 @@ class MarketAnalyzer:
 
         return change, change_pct
 
+    def snapshot(self):
+        """Immutable copy of the current metrics, safe to hand to another thread"""
+        change, change_pct = self.get_price_change() if len(self.prices) >= 2 else (0, 0)
+        return {
+            "vwap": self.get_vwap(),
+            "total_volume": self.get_total_volume(),
+            "trade_count": len(self.trades),
+            "buy_sell_ratio": self.get_buy_sell_ratio(),
+            "avg_spread": self.get_avg_spread(),
+            "price_change": change,
+            "price_change_pct": change_pct,
+            "latest_price": self.prices[-1] if self.prices else None,
+        }
+
     def display_stats(self, coin):
         """Display current market statistics"""
         if not self.trades:
             return
 
-        print(f"\n{'='*60}")
-        print(f"📈 {coin} Market Analytics")
-        print(f"{'='*60}")
-
-        # VWAP
-        vwap = self.get_vwap()
-        print(f"💰 VWAP: ${vwap:.2f}")
-
-        # Volume
-        total_vol = self.get_total_volume()
-        print(f"📊 Volume: {total_vol:.2f} (last {len(self.trades)} trades)")
+        print(format_stats(coin, self.snapshot()))
 
-        # Buy/Sell Ratio
-        ratio = self.get_buy_sell_ratio()
-        print(f"⚖️  Buy/Sell Ratio: {ratio:.2f}")
 
-        # Average Spread
-        avg_spread = self.get_avg_spread()
-        print(f"📉 Avg Spread: ${avg_spread:.2f}")
+def format_stats(coin, stats):
+    """Build the market statistics block for a MarketAnalyzer snapshot as a single string"""
+    change = stats["price_change"]
+    change_icon = "📈" if change >= 0 else "📉"
 
-        # Price Change
-        change, change_pct = self.get_price_change()
-        change_icon = "📈" if change >= 0 else "📉"
-        print(f"{change_icon} Price Change: ${change:.2f} ({change_pct:+.2f}%)")
+    lines = [
+        f"\n{'='*60}",
+        f"📈 {coin} Market Analytics",
+        f"{'='*60}",
+        f"💰 VWAP: ${stats['vwap']:.2f}",
+        f"📊 Volume: {stats['total_volume']:.2f} (last {stats['trade_count']} trades)",
+        f"⚖️  Buy/Sell Ratio: {stats['buy_sell_ratio']:.2f}",
+        f"📉 Avg Spread: ${stats['avg_spread']:.2f}",
+        f"{change_icon} Price Change: ${change:.2f} ({stats['price_change_pct']:+.2f}%)",
+    ]
 
-        # Latest Price
-        if self.prices:
-            print(f"💵 Latest Price: ${self.prices[-1]:.2f}")
+    # Latest Price
+    if stats["latest_price"] is not None:
+        lines.append(f"💵 Latest Price: ${stats['latest_price']:.2f}")
 
-        print(f"{'='*60}\n")
+    lines.append(f"{'='*60}\n")
+    return "\n".join(lines)
 
 
 async def main():
@@ -7,21 +7,30 @@ Shows the most detailed market microstructure data with individual orders
 import asyncio
 import json
 import os
+import re
 import websockets
+from bisect import bisect_left, insort
 from dotenv import load_dotenv
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 
 # Load .env from parent directory
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(env_path)
 
+# Finds a frame's channel in the raw text, so frames that aren't l4Book are dropped without decoding
+CHANNEL_PATTERN = re.compile(r'"channel"\s*:\s*"([^"]*)"')
+
+# Immutable views handed to readers. Levels that didn't change are shared between snapshots.
+BookLevel = namedtuple("BookLevel", ["px", "sz", "n", "orders"])  # orders: ((oid, sz, user), ...)
+BookSnapshot = namedtuple("BookSnapshot", ["coin", "height", "version", "bids", "asks"])
+
 
 class L4OrderBook:
     """Maintains L4 orderbook state with individual orders"""
 
-    def __init__(self):
+    def __init__(self, publish_depth=0):
         # Store orders by order ID: {oid: {user, limitPx, sz, side}}
         self.orders = {}
         # Store bids and asks separately for quick access: {price: [oid1, oid2, ...]}
@@ -33,6 +42,17 @@ class L4OrderBook:
         # Track changes for display
         self.last_changes = {"added": [], "removed": [], "modified": []}
 
+        # Versioned snapshots for concurrent readers
+        self.version = 0  # Bumped on every snapshot/update
+        self.publish_depth = publish_depth  # If set, publish a snapshot of this many levels per update
+        self.latest = None  # Most recent published BookSnapshot; safe to read from any thread
+        # Price ladders kept sorted as (float price, price string) so top-N needs no sorting
+        self.bid_ladder = []
+        self.ask_ladder = []
+        # (side, price) -> BookLevel, dropped whenever that level changes
+        self._level_cache = {}
+        self._snapshot_cache = None  # ((version, depth), BookSnapshot)
+
     def process_snapshot(self, snapshot):
         """Process a full snapshot"""
         self.coin = snapshot["coin"]
@@ -75,13 +95,35 @@ class L4OrderBook:
                 }
                 self.asks[price].append(oid)
 
+        self.bid_ladder = sorted((float(price), price) for price in self.bids)
+        self.ask_ladder = sorted((float(price), price) for price in self.asks)
+        self._level_cache.clear()
+        self._bump_version()
+
+    def restore(self, coin, height, orders, bids, asks):
+        """Load state built elsewhere (e.g. from a checkpoint) instead of a snapshot.
+
+        orders: {oid: {user, limitPx, sz, side}}; bids/asks: {price: [oid, ...]} in queue order
+        """
+        self.coin = coin
+        self.height = height
+        self.last_update = datetime.now()
+        self.orders = orders
+        self.bids = defaultdict(list, bids)
+        self.asks = defaultdict(list, asks)
+        self.bid_ladder = sorted((float(price), price) for price in self.bids)
+        self.ask_ladder = sorted((float(price), price) for price in self.asks)
+        self._level_cache.clear()
+        self._bump_version()
+
     def process_update(self, update):
         """Process incremental updates from book_diffs"""
         self.height = update.get("height", self.height)
         self.last_update = datetime.now()
 
-        # Clear previous changes
-        self.last_changes = {"added": [], "removed": [], "modified": []}
+        # Collect changes in a fresh dict and swap it in at the end,
+        # so anyone holding the previous last_changes never sees it change
+        changes = {"added": [], "removed": [], "modified": []}
 
         # Build a map of oid -> order info from order_statuses to get the side
         order_info_map = {}
@@ -106,9 +148,26 @@ class L4OrderBook:
                 if oid in self.orders:
                     order_info = self.orders[oid].copy()
                     order_info["oid"] = oid
-                    self.last_changes["removed"].append(order_info)
+                    changes["removed"].append(order_info)
                     self._remove_order(oid)
 
+            # Handle size change of a resting order (partial fill)
+            elif isinstance(raw_diff, dict) and "update" in raw_diff:
+                if oid in self.orders:
+                    # origSz on the wire is the size when the order was placed, not the size held until now
+                    prev_sz = self.orders[oid]["sz"]
+                    # Replaced, not mutated: snapshots taken off the book may still share the old dict
+                    order = self.orders[oid] = {**self.orders[oid], "sz": raw_diff["update"]["newSz"]}
+                    self._level_cache.pop((order["side"], order["limitPx"]), None)
+                    changes["modified"].append({
+                        "oid": oid,
+                        "user": order["user"],
+                        "limitPx": order["limitPx"],
+                        "sz": order["sz"],
+                        "prevSz": prev_sz,
+                        "side": order["side"]
+                    })
+
             # Handle new order
             elif isinstance(raw_diff, dict) and "new" in raw_diff:
                 sz = raw_diff["new"]["sz"]
@@ -123,6 +182,13 @@ class L4OrderBook:
                     # Fallback: Can't determine side, skip this update
                     continue
 
+                # An oid placed again (possibly at another price) replaces the old order: it leaves its old level
+                if oid in self.orders:
+                    order_info = self.orders[oid].copy()
+                    order_info["oid"] = oid
+                    changes["removed"].append(order_info)
+                    self._remove_order(oid)
+
                 # Add order to orderbook
                 self.orders[oid] = {
                     "user": user,
@@ -133,14 +199,19 @@ class L4OrderBook:
 
                 # Add to appropriate price level
                 if side == "bid":
+                    if px not in self.bids:
+                        insort(self.bid_ladder, (float(px), px))
                     if oid not in self.bids[px]:
                         self.bids[px].append(oid)
                 else:  # ask
+                    if px not in self.asks:
+                        insort(self.ask_ladder, (float(px), px))
                     if oid not in self.asks[px]:
                         self.asks[px].append(oid)
+                self._level_cache.pop((side, px), None)
 
                 # Track change for display
-                self.last_changes["added"].append({
+                changes["added"].append({
                     "oid": oid,
                     "user": user,
                     "limitPx": px,
@@ -148,6 +219,9 @@ class L4OrderBook:
                     "side": side
                 })
 
+        self.last_changes = changes
+        self._bump_version()
+
     def _remove_order(self, oid):
         """Remove an order from the book"""
         if oid not in self.orders:
@@ -163,19 +237,67 @@ class L4OrderBook:
                 self.bids[price].remove(oid)
             if not self.bids[price]:
                 del self.bids[price]
+                self._drop_ladder_price(self.bid_ladder, price)
         elif side == "ask" and price in self.asks:
             if oid in self.asks[price]:
                 self.asks[price].remove(oid)
             if not self.asks[price]:
                 del self.asks[price]
+                self._drop_ladder_price(self.ask_ladder, price)
+        self._level_cache.pop((side, price), None)
 
         # Remove from orders
         del self.orders[oid]
 
+    def _drop_ladder_price(self, ladder, price):
+        """Remove an emptied price level from a sorted ladder"""
+        entry = (float(price), price)
+        i = bisect_left(ladder, entry)
+        if i < len(ladder) and ladder[i] == entry:
+            del ladder[i]
+
+    def _bump_version(self):
+        """Mark the book as changed and publish a snapshot if enabled"""
+        self.version += 1
+        if self.publish_depth:
+            self.latest = self.snapshot(self.publish_depth)
+
+    def _level(self, side, price):
+        """Immutable view of one price level, rebuilt only if it changed"""
+        key = (side, price)
+        level = self._level_cache.get(key)
+        if level is None:
+            book_side = self.bids if side == "bid" else self.asks
+            orders = tuple(
+                (oid, self.orders[oid]["sz"], self.orders[oid]["user"])
+                for oid in book_side.get(price, ()) if oid in self.orders
+            )
+            level = BookLevel(price, sum(float(sz) for _, sz, _ in orders), len(orders), orders)
+            self._level_cache[key] = level
+        return level
+
+    def snapshot(self, depth=20):
+        """Consistent, immutable view of the top `depth` levels on each side.
+
+        Unchanged levels are reused from the previous snapshot, so the cost is
+        proportional to the levels that changed, not to the size of the book.
+        """
+        if self._snapshot_cache and self._snapshot_cache[0] == (self.version, depth):
+            return self._snapshot_cache[1]  # Nothing changed since the last call
+
+        if depth > 0:
+            bids = tuple(self._level("bid", price) for _, price in reversed(self.bid_ladder[-depth:]))
+            asks = tuple(self._level("ask", price) for _, price in self.ask_ladder[:depth])
+        else:
+            bids = asks = ()  # bid_ladder[-0:] would be the whole side
+        snapshot = BookSnapshot(self.coin, self.height, self.version, bids, asks)
+        self._snapshot_cache = ((self.version, depth), snapshot)
+        return snapshot
+
     def get_sorted_levels(self, max_orders=100):
         """Get sorted bid/ask levels for display - returns up to max_orders on each side"""
         # Sort bids descending (highest first)
-        sorted_bid_prices = sorted(self.bids.keys(), key=float, reverse=True)
+        sorted_bid_prices = (price for _, price in reversed(self.bid_ladder))
         bid_levels = []
         for price in sorted_bid_prices:
             for oid in self.bids[price]:
@@ -193,7 +315,7 @@ class L4OrderBook:
                 break
 
         # Sort asks ascending (lowest first)
-        sorted_ask_prices = sorted(self.asks.keys(), key=float)
+        sorted_ask_prices = (price for _, price in self.ask_ladder)
         ask_levels = []
         for price in sorted_ask_prices:
             for oid in self.asks[price]:
@@ -213,57 +335,59 @@ class L4OrderBook:
         return bid_levels, ask_levels
 
 
-def display_changes(orderbook):
-    """Display only the changes that occurred in the last update"""
+def format_order_rows(title, orders):
+    """Build one table of changed orders"""
+    lines = [
+        f"\n{title} ({len(orders)})",
+        f"{'Side':<6} {'Price':<12} {'Size':<12} {'Order ID':<20} {'User':<20}",
+        "-" * 100,
+    ]
+    for order in orders[:20]:  # Show up to 20
+        side_emoji = "🔴" if order["side"] == "ask" else "🟢"
+        side_text = "ASK" if order["side"] == "ask" else "BID"
+        user_addr = order.get("user", "unknown")[:12] + "..."
+        order_id = str(order.get("oid", ""))[:18]
+        lines.append(f"{side_emoji} {side_text:<4} {order['limitPx']:<12} {order['sz']:<12} {order_id:<20} {user_addr:<20}")
+    return lines
+
+
+def format_changes(orderbook):
+    """Build the change report for the last update as a single string ("" if nothing changed)"""
     changes = orderbook.last_changes
 
     total_changes = len(changes["added"]) + len(changes["modified"]) + len(changes["removed"])
 
     if total_changes == 0:
-        return  # Don't print anything if no changes
+        return ""
 
-    print(f"\n{'='*100}")
-    print(f"📋 {orderbook.coin} L4 Updates (Height: {orderbook.height}) - {orderbook.last_update.strftime('%H:%M:%S.%f')[:-3]}")
-    print(f"📊 Total Orders: {len(orderbook.orders)} | Changes: ➕{len(changes['added'])} ✏️{len(changes['modified'])} ❌{len(changes['removed'])}")
-    print(f"{'='*100}")
+    lines = [
+        f"\n{'='*100}",
+        f"📋 {orderbook.coin} L4 Updates (Height: {orderbook.height}) - {orderbook.last_update.strftime('%H:%M:%S.%f')[:-3]}",
+        f"📊 Total Orders: {len(orderbook.orders)} | Changes: ➕{len(changes['added'])} ✏️{len(changes['modified'])} ❌{len(changes['removed'])}",
+        f"{'='*100}",
+    ]
 
     # Display added orders
     if changes["added"]:
-        print(f"\n➕ NEW ORDERS ({len(changes['added'])})")
-        print(f"{'Side':<6} {'Price':<12} {'Size':<12} {'Order ID':<20} {'User':<20}")
-        print("-" * 100)
-        for order in changes["added"][:20]:  # Show up to 20
-            side_emoji = "🔴" if order["side"] == "ask" else "🟢"
-            side_text = "ASK" if order["side"] == "ask" else "BID"
-            user_addr = order.get("user", "unknown")[:12] + "..."
-            order_id = str(order.get("oid", ""))[:18]
-            print(f"{side_emoji} {side_text:<4} {order['limitPx']:<12} {order['sz']:<12} {order_id:<20} {user_addr:<20}")
+        lines.extend(format_order_rows("➕ NEW ORDERS", changes["added"]))
 
     # Display modified orders
     if changes["modified"]:
-        print(f"\n✏️  MODIFIED ORDERS ({len(changes['modified'])})")
-        print(f"{'Side':<6} {'Price':<12} {'Size':<12} {'Order ID':<20} {'User':<20}")
-        print("-" * 100)
-        for order in changes["modified"][:20]:  # Show up to 20
-            side_emoji = "🔴" if order["side"] == "ask" else "🟢"
-            side_text = "ASK" if order["side"] == "ask" else "BID"
-            user_addr = order.get("user", "unknown")[:12] + "..."
-            order_id = str(order.get("oid", ""))[:18]
-            print(f"{side_emoji} {side_text:<4} {order['limitPx']:<12} {order['sz']:<12} {order_id:<20} {user_addr:<20}")
+        lines.extend(format_order_rows("✏️  MODIFIED ORDERS", changes["modified"]))
 
     # Display removed orders
     if changes["removed"]:
-        print(f"\n❌ REMOVED ORDERS ({len(changes['removed'])})")
-        print(f"{'Side':<6} {'Price':<12} {'Size':<12} {'Order ID':<20} {'User':<20}")
-        print("-" * 100)
-        for order in changes["removed"][:20]:  # Show up to 20
-            side_emoji = "🔴" if order["side"] == "ask" else "🟢"
-            side_text = "ASK" if order["side"] == "ask" else "BID"
-            user_addr = order.get("user", "unknown")[:12] + "..."
-            order_id = str(order.get("oid", ""))[:18]
-            print(f"{side_emoji} {side_text:<4} {order['limitPx']:<12} {order['sz']:<12} {order_id:<20} {user_addr:<20}")
+        lines.extend(format_order_rows("❌ REMOVED ORDERS", changes["removed"]))
 
-    print(f"\n{'='*100}\n")
+    lines.append(f"\n{'='*100}\n")
+    return "\n".join(lines)
+
+
+def display_changes(orderbook):
+    """Display only the changes that occurred in the last update"""
+    report = format_changes(orderbook)
+    if report:  # Don't print anything if no changes
+        print(report)
 
 
 async def main():
@@ -294,30 +418,28 @@ async def main():
 
     # Create orderbook instance
     orderbook = L4OrderBook()
-    update_count = 0
 
-    try:
-        async for message in websocket:
-            data = json.loads(message)
-
-            # Only process l4Book channel messages
-            if data.get("channel") != "l4Book":
-                continue
+    def handle_l4(data):
+        # Process snapshots
+        snapshot = data["data"].get("Snapshot")
+        if snapshot:
+            orderbook.process_snapshot(snapshot)
+            print(f"✅ Snapshot loaded: {len(orderbook.orders)} orders")
+            return
 
-            # Process snapshots
-            snapshot = data["data"].get("Snapshot")
-            if snapshot:
-                orderbook.process_snapshot(snapshot)
-                print(f"✅ Snapshot loaded: {len(orderbook.orders)} orders")
-                continue
+        # Process updates - Updates is a single dict with book_diffs
+        updates = data["data"].get("Updates")
+        if updates:
+            orderbook.process_update(updates)
+            # Display changes
+            display_changes(orderbook)
 
-            # Process updates - Updates is a single dict with book_diffs
-            updates = data["data"].get("Updates")
-            if updates:
-                orderbook.process_update(updates)
-                update_count += 1
-                # Display changes
-                display_changes(orderbook)
+    try:
+        async for message in websocket:
+            # Only l4Book frames are decoded; subscriptionResponse and anything else is dropped unparsed
+            match = CHANNEL_PATTERN.search(message)
+            if match and match.group(1) == "l4Book":
+                handle_l4(json.loads(message))
 
     except KeyboardInterrupt:
         print("\nStopping...")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Dual-Feed Arbitration Example
+Subscribe to the same feed over two connections and keep whichever copy arrives first
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the reconnecting client from example 05
+sys.path.insert(0, str(Path(__file__).parent.parent / "05_reconnection_handling"))
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+COINS = ["BTC", "ETH"]
+STATS_INTERVAL = 10  # Seconds between win-rate reports
+
+
+class FeedStats:
+    """Win/loss counters and latency deltas for one feed"""
+
+    def __init__(self, name, lag_history=1000):
+        self.name = name
+        self.wins = 0    # Copies this feed delivered first
+        self.losses = 0  # Copies that arrived after the other feed's
+        self.lags = deque(maxlen=lag_history)  # Seconds behind the winner when losing
+
+    def win_rate(self):
+        """Share of keys this feed delivered first"""
+        total = self.wins + self.losses
+        return self.wins / total if total else 0
+
+    def median_lag(self):
+        """Median time behind the winning feed"""
+        if not self.lags:
+            return 0
+        lags = sorted(self.lags)
+        return lags[len(lags) // 2]
+
+
+class FeedArbiter:
+    """Deduplicate frames from redundant feeds, forwarding only the first copy"""
+
+    def __init__(self, on_message, window=20000):
+        self.on_message = on_message  # Called with each deduplicated frame
+        self.stats = {}  # feed name -> FeedStats
+        self.window = window
+        self.seen = {}  # key -> (feed name, arrival time)
+        self.seen_order = deque()  # Insertion order, so old keys can be evicted
+        self.last_forwarded = {}  # (channel, coin) -> last book time/height forwarded
+
+    def add_feed(self, name):
+        """Register a feed so it shows up in the stats"""
+        self.stats[name] = FeedStats(name)
+
+    def _first_copy(self, key, feed, now):
+        """Return True if this is the first time key was seen, recording who won"""
+        first = self.seen.get(key)
+        if first is None:
+            self.seen[key] = (feed, now)
+            self.seen_order.append(key)
+            if len(self.seen_order) > self.window:
+                del self.seen[self.seen_order.popleft()]
+            self.stats[feed].wins += 1
+            return True
+
+        winner, arrived = first
+        if winner != feed:
+            stats = self.stats[feed]
+            stats.losses += 1
+            stats.lags.append(now - arrived)
+        return False
+
+    def on_frame(self, feed, data):
+        """Entry point for every frame received on any feed"""
+        channel = data.get("channel")
+        now = time.monotonic()
+
+        if channel == "trades":
+            # A frame can batch several trades, dedupe each one by trade id
+            fresh = [
+                trade for trade in data["data"]
+                if self._first_copy(("trades", trade.get("coin"), trade.get("tid", trade.get("hash"))), feed, now)
+            ]
+            if fresh:
+                self.on_message({"channel": "trades", "data": fresh})
+
+        elif channel in ("l2Book", "l4Book"):
+            key = self._book_key(channel, data["data"])
+            if key is None or key[1] is None or key[-1] is None:
+                # Nothing to dedupe on, pass it through; without a coin, frames of
+                # different coins at one height would collide and be dropped
+                self.on_message(data)
+                return
+            if not self._first_copy(key, feed, now):
+                return
+
+            # Never step backwards if a lagging feed delivers an older book late
+            stream, sequence = key[:-1], key[-1]
+            if sequence < self.last_forwarded.get(stream, sequence):
+                return
+            self.last_forwarded[stream] = sequence
+            self.on_message(data)
+
+        # subscriptionResponse, pong etc. arrive on both feeds and are dropped
+
+    def _book_key(self, channel, book):
+        """Dedup key for a book frame: (channel, coin, kind, time or height)"""
+        if channel == "l2Book":
+            return ("l2Book", book.get("coin"), "book", book.get("time"))
+
+        # l4Book frames are either a Snapshot or Updates, both carry the block height
+        if "Snapshot" in book:
+            snapshot = book["Snapshot"]
+            return ("l4Book", snapshot.get("coin"), "snapshot", snapshot.get("height"))
+        updates = book.get("Updates")
+        if not updates:
+            return None
+        coin = updates.get("coin")
+        if coin is None:
+            for status in updates.get("order_statuses", []):
+                coin = status.get("order", {}).get("coin")
+                if coin:
+                    break
+        if coin is None:
+            # Many update frames carry only book_diffs
+            for diff in updates.get("book_diffs", []):
+                coin = diff.get("coin")
+                if coin:
+                    break
+        return ("l4Book", coin, "updates", updates.get("height"))
+
+    def display_stats(self):
+        """Print per-feed win rates and latency deltas"""
+        print(f"\n{'='*60}")
+        print("🏁 Feed Arbitration Stats")
+        print(f"{'='*60}")
+        print(f"{'Feed':<10} {'Wins':<10} {'Losses':<10} {'Win %':<10} {'Median lag':<12}")
+        for stats in self.stats.values():
+            print(
+                f"{stats.name:<10} "
+                f"{stats.wins:<10} "
+                f"{stats.losses:<10} "
+                f"{stats.win_rate() * 100:<10.1f} "
+                f"{stats.median_lag() * 1000:.2f}ms"
+            )
+        print(f"{'='*60}\n")
+
+
+class ArbitratedClient(RobustWSClient):
+    """RobustWSClient that hands every frame to a shared FeedArbiter"""
+
+    def __init__(self, name, ws_url, arbiter, **kwargs):
+        super().__init__(ws_url, **kwargs)
+        self.name = name
+        self.arbiter = arbiter
+        arbiter.add_feed(name)
+
+    def handle_message(self, data):
+        """Forward to the arbiter instead of handling directly"""
+        self.arbiter.on_frame(self.name, data)
+
+
+def handle_arbitrated(data):
+    """Downstream handler - only ever sees the first copy of each frame"""
+    if data["channel"] == "trades":
+        for trade in data["data"]:
+            side_icon = "🟢" if trade["side"] == "B" else "🔴"
+            print(f"{side_icon} {trade['coin']}: {trade['side']} {trade['sz']} @ ${trade['px']}")
+
+
+async def report_stats(arbiter):
+    """Periodically print feed stats"""
+    while True:
+        await asyncio.sleep(STATS_INTERVAL)
+        arbiter.display_stats()
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+    # Optional second endpoint; defaults to a second connection to the same one
+    ws_url_b = os.getenv("WEBSOCKET_URL_B", ws_url)
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    arbiter = FeedArbiter(handle_arbitrated)
+    clients = [
+        ArbitratedClient("A", ws_url, arbiter),
+        ArbitratedClient("B", ws_url_b, arbiter),
+    ]
+
+    for client in clients:
+        for coin in COINS:
+            client.add_subscription("trades", coin)
+            client.add_subscription("l2Book", coin, nLevels=5, nSigFigs=5)
+
+    print(f"🔀 Arbitrating {', '.join(COINS)} across {len(clients)} feeds...\n")
+    stats_task = asyncio.create_task(report_stats(arbiter))
+
+    try:
+        await asyncio.gather(*(client.listen() for client in clients))
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        stats_task.cancel()
+        arbiter.display_stats()
+        for client in clients:
+            await client.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Router Benchmark
+Compare dispatch cost per frame at 200 coins x 3 channels
+"""
+
+import random
+import time
+
+from message_router import MessageRouter
+
+N_COINS = 200
+CHANNELS = ["trades", "l2Book", "l4Book"]
+N_FRAMES = 200_000
+
+
+def make_frames(coins):
+    """Synthetic, already-decoded frames spread evenly over coins and channels"""
+    frames = []
+    for _ in range(N_FRAMES):
+        coin = random.choice(coins)
+        channel = random.choice(CHANNELS)
+        if channel == "trades":
+            payload = [{"coin": coin, "side": "B", "px": "100.0", "sz": "1.0", "time": 0, "tid": 1}]
+        elif channel == "l2Book":
+            payload = {"coin": coin, "time": 0, "levels": [[], []]}
+        else:
+            payload = {"Updates": {"coin": coin, "height": 1, "book_diffs": [], "order_statuses": []}}
+        frames.append({"channel": channel, "data": payload})
+    return frames
+
+
+def linear_dispatcher(registrations):
+    """Naive approach: scan every registration for every frame"""
+    def dispatch(data):
+        channel = data.get("channel")
+        payload = data["data"]
+        if channel == "trades":
+            coin = payload[0]["coin"]
+        elif channel == "l2Book":
+            coin = payload["coin"]
+        elif channel == "l4Book":
+            coin = payload["Updates"]["coin"]
+        else:
+            return
+        for reg_channel, reg_coin, handler in registrations:
+            if reg_channel == channel and reg_coin == coin:
+                handler(data)
+    return dispatch
+
+
+def if_elif_dispatcher(registrations):
+    """if/elif on channel, then a per-channel coin dict (the pattern in examples 03/05)"""
+    trades, l2, l4 = {}, {}, {}
+    tables = {"trades": trades, "l2Book": l2, "l4Book": l4}
+    for channel, coin, handler in registrations:
+        tables[channel].setdefault(coin, []).append(handler)
+
+    def dispatch(data):
+        channel = data.get("channel")
+        payload = data["data"]
+        if channel == "trades":
+            handlers = trades.get(payload[0]["coin"], ())
+        elif channel == "l2Book":
+            handlers = l2.get(payload["coin"], ())
+        elif channel == "l4Book":
+            handlers = l4.get(payload["Updates"]["coin"], ())
+        else:
+            return
+        for handler in handlers:
+            handler(data)
+    return dispatch
+
+
+def router_dispatcher(registrations):
+    """MessageRouter with (channel, coin) keys"""
+    router = MessageRouter()
+    for channel, coin, handler in registrations:
+        router.subscribe(channel, handler, coin)
+    return router.dispatch
+
+
+def run(name, dispatch, frames):
+    """Time dispatching every frame once"""
+    start = time.perf_counter()
+    for frame in frames:
+        dispatch(frame)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed / len(frames) * 1e9:>8.0f} ns/frame  {len(frames) / elapsed:>12,.0f} frames/s")
+
+
+def main():
+    coins = [f"COIN{i}" for i in range(N_COINS)]
+    frames = make_frames(coins)
+
+    calls = [0]
+
+    def handler(data):
+        calls[0] += 1
+
+    # One handler per (channel, coin): 600 registrations
+    registrations = [(channel, coin, handler) for coin in coins for channel in CHANNELS]
+
+    print(f"📏 Dispatching {N_FRAMES:,} frames over {N_COINS} coins x {len(CHANNELS)} channels\n")
+    run("Linear scan", linear_dispatcher(registrations), frames)
+    run("if/elif + coin dict", if_elif_dispatcher(registrations), frames)
+    run("MessageRouter", router_dispatcher(registrations), frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Lazy Decoding Benchmark
+Compare full json.loads on every frame with peeking channel/coin first
+"""
+
+import json
+import random
+import time
+
+from message_router import MessageRouter
+
+N_COINS = 50
+N_FRAMES = 20_000
+WANTED = {("trades", "BTC"), ("l2Book", "BTC"), ("trades", "ETH")}
+
+
+def l2_frame(coin):
+    """A 20-level l2Book frame"""
+    side = [{"px": f"{100 + i:.1f}", "sz": "1.25", "n": 3} for i in range(20)]
+    return {"channel": "l2Book", "data": {"coin": coin, "time": 1700000000000, "levels": [side, side]}}
+
+
+def trades_frame(coin):
+    """A small batch of trades"""
+    trade = {"coin": coin, "side": "B", "px": "100.0", "sz": "0.5", "time": 1700000000000,
+             "hash": "0x" + "ab" * 32, "tid": 123456789, "users": ["0x" + "cd" * 20, "0x" + "ef" * 20]}
+    return {"channel": "trades", "data": [trade] * 3}
+
+
+def l4_frame(coin):
+    """An l4Book Updates frame with 30 diffs"""
+    diffs = [{"user": "0x" + "12" * 20, "oid": 1000 + i, "px": "100.0", "coin": coin,
+              "raw_book_diff": {"new": {"sz": "1.0"}}} for i in range(30)]
+    statuses = [{"time": "2024-01-01T00:00:00", "user": "0x" + "12" * 20, "status": "open",
+                 "order": {"coin": coin, "side": "B", "limitPx": "100.0", "sz": "1.0", "oid": 1000 + i}}
+                for i in range(30)]
+    return {"channel": "l4Book", "data": {"Updates": {"time": 1700000000000, "height": 1,
+                                                      "order_statuses": statuses, "book_diffs": diffs}}}
+
+
+def make_frames():
+    """Mixed traffic: most frames are for coins/channels nobody handles"""
+    coins = ["BTC", "ETH"] + [f"COIN{i}" for i in range(N_COINS - 2)]
+    builders = [l2_frame, trades_frame, l4_frame]
+    return [json.dumps(random.choice(builders)(random.choice(coins))) for _ in range(N_FRAMES)]
+
+
+def make_router():
+    """Router with handlers only for the WANTED keys; everything else is ignored"""
+    handled = [0]
+
+    def handler(data):
+        handled[0] += 1
+
+    router = MessageRouter()
+    for channel, coin in WANTED:
+        router.subscribe(channel, handler, coin)
+    router.ignore("l4Book")
+    router.ignore("subscriptionResponse")
+    return router, handled
+
+
+def run(name, dispatch, frames):
+    """Time dispatching every raw frame once"""
+    start = time.perf_counter()
+    for frame in frames:
+        dispatch(frame)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed / len(frames) * 1e6:>8.2f} µs/frame  {len(frames) / elapsed:>10,.0f} frames/s")
+    return elapsed
+
+
+def main():
+    frames = make_frames()
+    megabytes = sum(len(frame) for frame in frames) / 1e6
+    print(f"📏 {N_FRAMES:,} mixed frames ({megabytes:.1f} MB), handlers for {len(WANTED)} of {N_COINS * 3} (channel, coin) pairs\n")
+
+    router, handled_eager = make_router()
+    eager = run("json.loads + dispatch", lambda frame: router.dispatch(json.loads(frame)), frames)
+
+    router, handled_lazy = make_router()
+    lazy = run("dispatch_raw (peek first)", router.dispatch_raw, frames)
+
+    router, handled_bytes = make_router()
+    raw_bytes = [frame.encode() for frame in frames]
+    run("dispatch_raw on bytes", router.dispatch_raw, raw_bytes)
+
+    assert handled_eager[0] == handled_lazy[0] == handled_bytes[0], "lazy decoding changed results"
+    print(f"\n✅ Same {handled_lazy[0]:,} frames handled, {eager / lazy:.1f}x faster with lazy decoding")
+
+
+if __name__ == "__main__":
+    main()
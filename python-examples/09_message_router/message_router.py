@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Message Router Example
+Register handlers per (channel, coin) and dispatch each frame with a single dict lookup
+"""
+
+import asyncio
+import json
+import os
+import re
+import websockets
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+COINS = ["BTC", "ETH", "SOL"]
+
+
+def _trades_coin(payload):
+    """trades data is a list of trades, all for the subscribed coin"""
+    return payload[0]["coin"] if payload else None
+
+
+def _l2_coin(payload):
+    """l2Book data carries the coin at the top level"""
+    return payload.get("coin")
+
+
+def _l4_coin(payload):
+    """l4Book data is either a Snapshot or Updates; Updates only carry the coin per status / diff"""
+    body = payload.get("Snapshot") or payload.get("Updates") or {}
+    coin = body.get("coin")
+    if coin is None:
+        for status in body.get("order_statuses", []):
+            coin = status.get("order", {}).get("coin")
+            if coin:
+                break
+    if coin is None:
+        for diff in body.get("book_diffs", []):
+            coin = diff.get("coin")
+            if coin:
+                break
+    return coin
+
+
+# Pull channel and coin straight out of the raw frame text, without building any dicts.
+# The coin is only looked for in trades, l2Book and l4Book frames, where every "coin"
+# in the frame is the subscribed coin, so it doesn't matter which one is found first.
+CHANNEL_PATTERN = re.compile(r'"channel"\s*:\s*"([^"]*)"')
+COIN_PATTERN = re.compile(r'"coin"\s*:\s*"([^"]*)"')
+CHANNEL_PATTERN_BYTES = re.compile(rb'"channel"\s*:\s*"([^"]*)"')
+COIN_PATTERN_BYTES = re.compile(rb'"coin"\s*:\s*"([^"]*)"')
+
+
+def peek_channel(message):
+    """Cheaply find the channel of a raw str or bytes frame; None if not found"""
+    if isinstance(message, str):
+        match = CHANNEL_PATTERN.search(message)
+        return match.group(1) if match else None
+    match = CHANNEL_PATTERN_BYTES.search(message)
+    return match.group(1).decode() if match else None
+
+
+def peek_coin(message):
+    """The first "coin" in a raw str or bytes frame; only meaningful for the channels in COIN_EXTRACTORS"""
+    if isinstance(message, str):
+        match = COIN_PATTERN.search(message)
+        return match.group(1) if match else None
+    match = COIN_PATTERN_BYTES.search(message)
+    return match.group(1).decode() if match else None
+
+
+def peek_route(message):
+    """Cheaply find (channel, coin) in a raw str or bytes frame; None where not found.
+
+    Frames of other channels (or none) get coin None without searching for one.
+    """
+    channel = peek_channel(message)
+    if channel not in COIN_EXTRACTORS:
+        return channel, None
+    return channel, peek_coin(message)
+
+
+# How to find the coin inside each channel's payload
+COIN_EXTRACTORS = {
+    "trades": _trades_coin,
+    "l2Book": _l2_coin,
+    "l4Book": _l4_coin,
+}
+
+
+def frame_coin(data):
+    """Coin of a decoded trades / l2Book / l4Book frame; None for other channels"""
+    extract = COIN_EXTRACTORS.get(data.get("channel"))
+    payload = data.get("data")
+    return extract(payload) if extract and payload else None
+
+
+class MessageRouter:
+    """Route frames to handlers registered by (channel, coin)"""
+
+    def __init__(self, on_unhandled=None):
+        # (channel, coin) -> list of handlers; coin None means "every coin"
+        self.routes = {}
+        # channel -> (coin extractor, {coin: handlers}, wildcard handlers), rebuilt on registration
+        self.dispatch_table = {}
+        self.on_unhandled = on_unhandled
+        self._pending = set()  # Keep references to running async handler tasks
+
+    def subscribe(self, channel, handler, coin=None):
+        """Register a handler for a channel, optionally only for one coin"""
+        if asyncio.iscoroutinefunction(handler):
+            handler = self._scheduler(handler)
+        self.routes.setdefault((channel, coin), []).append(handler)
+        self._rebuild(channel)
+
+    def ignore(self, channel):
+        """Drop a channel silently (e.g. subscriptionResponse)"""
+        self.routes.setdefault((channel, None), [])
+        self._rebuild(channel)
+
+    def _scheduler(self, handler):
+        """Wrap an async handler so dispatch can call it like a sync one"""
+        def schedule(data):
+            task = asyncio.get_running_loop().create_task(handler(data))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        return schedule
+
+    def _rebuild(self, channel):
+        """Precompute the handler tuple for every coin of a channel"""
+        wildcard = tuple(self.routes.get((channel, None), ()))
+        by_coin = {
+            coin: wildcard + tuple(handlers)
+            for (route_channel, coin), handlers in self.routes.items()
+            if route_channel == channel and coin is not None
+        }
+        extract = COIN_EXTRACTORS.get(channel, lambda payload: None)
+        self.dispatch_table[channel] = (extract, by_coin, wildcard)
+
+    def dispatch(self, data):
+        """Call every handler registered for this frame's (channel, coin)"""
+        entry = self.dispatch_table.get(data.get("channel"))
+        if entry is None:
+            if self.on_unhandled:
+                self.on_unhandled(data)
+            return
+
+        extract, by_coin, wildcard = entry
+        if by_coin:
+            handlers = by_coin.get(extract(data.get("data")), wildcard)
+        else:
+            handlers = wildcard  # No per-coin handlers, skip finding the coin
+        for handler in handlers:
+            handler(data)
+
+    def dispatch_raw(self, message):
+        """Like dispatch, but only decodes JSON for frames that have a handler"""
+        channel = peek_channel(message)
+        entry = self.dispatch_table.get(channel)
+        if entry is None:
+            if channel is None or self.on_unhandled:
+                self.dispatch(json.loads(message))  # Unrecognized shape, take the slow path
+            return
+
+        extract, by_coin, wildcard = entry
+        if by_coin and channel in COIN_EXTRACTORS:
+            handlers = by_coin.get(peek_coin(message), wildcard)
+        else:
+            handlers = wildcard  # No per-coin handlers, or no coin to find: skip the coin search
+        if not handlers:
+            return  # Ignored channel or coin: never parsed
+
+        data = json.loads(message)
+        for handler in handlers:
+            handler(data)
+
+
+def print_trade(data):
+    """Print every trade"""
+    for trade in data["data"]:
+        side_icon = "🟢" if trade["side"] == "B" else "🔴"
+        print(f"{side_icon} {trade['coin']} Trade: {trade['side']} {trade['sz']} @ ${trade['px']}")
+
+
+def print_btc_book(data):
+    """Only registered for BTC, so never sees ETH or SOL books"""
+    levels = data["data"]["levels"]
+    if levels[0] and levels[1]:
+        print(f"📊 BTC Book: Bid ${levels[0][0]['px']} | Ask ${levels[1][0]['px']}")
+
+
+async def store_trade(data):
+    """Async handlers run as tasks and never block the receive loop"""
+    await asyncio.sleep(0)  # e.g. write to a database
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    router = MessageRouter(on_unhandled=lambda data: print(f"Unknown channel: {data.get('channel')}"))
+    router.ignore("subscriptionResponse")
+    router.subscribe("trades", print_trade)             # All coins
+    router.subscribe("trades", store_trade)             # Second subscriber, async
+    router.subscribe("l2Book", print_btc_book, "BTC")   # One coin only
+    router.ignore("l2Book")                             # Other coins' books are dropped
+
+    print(f"Connecting to {ws_url}...")
+    websocket = await websockets.connect(ws_url)
+    print("Connected!\n")
+
+    for coin in COINS:
+        for subscription in (
+            {"type": "trades", "coin": coin},
+            {"type": "l2Book", "coin": coin, "nLevels": 5, "nSigFigs": 5},
+        ):
+            await websocket.send(json.dumps({"method": "subscribe", "subscription": subscription}))
+        print(f"✓ Subscribed to {coin} trades and L2 book")
+    print()
+
+    try:
+        async for message in websocket:
+            router.dispatch_raw(message)
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
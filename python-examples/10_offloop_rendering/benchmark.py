@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Rendering Benchmark
+Measure ingestion throughput with no rendering, inline rendering and off-loop rendering
+"""
+
+import json
+import os
+import random
+import time
+
+from renderer import CLEAR_SCREEN, Renderer, render_dashboard
+from l2_orderbook import format_orderbook
+from multi_coin_tracker import MultiCoinTracker, format_summary
+
+N_FRAMES = 50_000
+COINS = ["BTC", "ETH", "SOL", "ARB", "DOGE"]
+
+
+def make_frames():
+    """Raw frames: 50% 20-level L2 books, 50% trades"""
+    frames = []
+    for i in range(N_FRAMES):
+        if i % 2:
+            bids = [{"px": f"{3000 - j * 0.5:.1f}", "sz": f"{random.random() * 10:.4f}", "n": random.randint(1, 9)} for j in range(20)]
+            asks = [{"px": f"{3000.5 + j * 0.5:.1f}", "sz": f"{random.random() * 10:.4f}", "n": random.randint(1, 9)} for j in range(20)]
+            frames.append(json.dumps({"channel": "l2Book", "data": {"coin": "ETH", "time": i, "levels": [bids, asks]}}))
+        else:
+            trade = {"coin": random.choice(COINS), "side": random.choice("AB"), "px": f"{random.uniform(1, 100):.2f}",
+                     "sz": f"{random.random():.4f}", "time": i, "tid": i}
+            frames.append(json.dumps({"channel": "trades", "data": [trade]}))
+    return frames
+
+
+def ingest(frames, on_book, on_trades, after_frame=None):
+    """The receive loop body: decode, update state, optionally render"""
+    start = time.perf_counter()
+    for message in frames:
+        data = json.loads(message)
+        channel = data.get("channel")
+        if channel == "l2Book":
+            on_book(data)
+        elif channel == "trades":
+            on_trades(data)
+        if after_frame:
+            after_frame()
+    return time.perf_counter() - start
+
+
+def report(name, elapsed, frames_drawn):
+    print(f"{name:<26} {N_FRAMES / elapsed:>10,.0f} frames/s  {frames_drawn:>7,} screens drawn")
+    return elapsed
+
+
+def main():
+    frames = make_frames()
+    out = open(os.devnull, "w")  # Terminal output is even slower; this isolates the formatting cost
+    print(f"📏 Ingesting {N_FRAMES:,} frames (L2 books + trades)\n")
+
+    # 1. No rendering at all
+    tracker = MultiCoinTracker(display_interval=0)
+    baseline = report("No rendering", ingest(frames, lambda data: None, tracker.handle_trade), 0)
+
+    # 2. Inline: redraw the book on every frame and the dashboard every 10 trades (examples 02/04)
+    tracker = MultiCoinTracker(display_interval=0)
+    drawn = [0]
+
+    def draw_book(data):
+        out.write(CLEAR_SCREEN + format_orderbook(data) + "\n")
+        drawn[0] += 1
+
+    def trades_and_draw(data):
+        tracker.handle_trade(data)
+        if tracker.total_trades % 10 == 0:
+            out.write(format_summary(tracker.snapshot()) + "\n")
+            drawn[0] += 1
+
+    inline = report("Inline rendering", ingest(frames, draw_book, trades_and_draw), drawn[0])
+
+    # 3. Off-loop: ingestion only publishes snapshots, a thread draws at 10 fps
+    tracker = MultiCoinTracker(display_interval=0)
+    latest = {"book": None}
+    renderer = Renderer(render_dashboard, fps=10, stream=out)
+    renderer.start()
+
+    def keep_book(data):
+        latest["book"] = data
+
+    def maybe_publish():
+        if renderer.wants_snapshot():
+            renderer.publish((latest["book"], tracker.snapshot()))
+
+    offloop = ingest(frames, keep_book, tracker.handle_trade, maybe_publish)
+    renderer.stop()
+    report("Off-loop renderer @10fps", offloop, renderer.frames_rendered)
+
+    print(f"\n✅ Off-loop rendering keeps {baseline / offloop * 100:.0f}% of baseline throughput "
+          f"(inline keeps {baseline / inline * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
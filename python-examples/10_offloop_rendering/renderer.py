@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Off-Loop Rendering Example
+Draw terminal dashboards from a separate thread at a fixed frame rate
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import websockets
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the formatters and trackers from earlier examples
+examples_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(examples_dir / "02_l2_orderbook_basics"))
+sys.path.insert(0, str(examples_dir / "04_multi_coin_tracker"))
+from l2_orderbook import format_orderbook  # noqa: E402
+from multi_coin_tracker import MultiCoinTracker, format_summary  # noqa: E402
+
+# Load .env from parent directory
+load_dotenv(examples_dir / '.env')
+
+CLEAR_SCREEN = "\033[2J\033[H"
+
+# Demo configuration
+BOOK_COIN = "ETH"
+TRADE_COINS = ["BTC", "ETH", "SOL"]
+FPS = 10
+
+
+class Renderer:
+    """Render the latest published snapshot on a background thread"""
+
+    def __init__(self, render_fn, fps=FPS, stream=None, clear=True):
+        self.render_fn = render_fn  # snapshot -> screen text
+        self.interval = 1 / fps
+        self.stream = stream or sys.stdout
+        self.clear = clear
+        self.frames_rendered = 0
+
+        # The only state shared with the receive loop is one reference.
+        # Publishing replaces it, so the render thread always sees a whole snapshot.
+        self._snapshot = None
+        self._rendered = None
+        self._next_publish = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="renderer", daemon=True)
+
+    def wants_snapshot(self):
+        """True when a new snapshot would actually be drawn (so don't build one otherwise)"""
+        return time.monotonic() >= self._next_publish
+
+    def publish(self, snapshot):
+        """Hand over an immutable snapshot; never blocks"""
+        self._snapshot = snapshot
+        self._next_publish = time.monotonic() + self.interval
+
+    def start(self):
+        """Start the render thread"""
+        self._thread.start()
+
+    def stop(self):
+        """Stop the render thread, drawing the last snapshot first"""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        """Draw at most once per interval, and only if something new was published"""
+        while not self._stop.wait(self.interval):
+            self._draw()
+        self._draw()
+
+    def _draw(self):
+        snapshot = self._snapshot
+        if snapshot is None or snapshot is self._rendered:
+            return
+        screen = self.render_fn(snapshot)
+        # One write per frame: no flicker from many small prints
+        self.stream.write((CLEAR_SCREEN if self.clear else "") + screen + "\n")
+        self.stream.flush()
+        self._rendered = snapshot
+        self.frames_rendered += 1
+
+
+def render_dashboard(snapshot):
+    """Combine the L2 book and the trade dashboard into one screen"""
+    book, summary = snapshot
+    parts = []
+    if book:
+        parts.append(format_orderbook(book))
+    if summary and summary["rows"]:
+        parts.append(format_summary(summary))
+    return "\n".join(parts)
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    print(f"Connecting to {ws_url}...")
+    websocket = await websockets.connect(ws_url)
+    print("Connected!\n")
+
+    await websocket.send(json.dumps({
+        "method": "subscribe",
+        "subscription": {"type": "l2Book", "coin": BOOK_COIN, "nLevels": 20, "nSigFigs": 5}
+    }))
+    for coin in TRADE_COINS:
+        await websocket.send(json.dumps({
+            "method": "subscribe",
+            "subscription": {"type": "trades", "coin": coin}
+        }))
+
+    tracker = MultiCoinTracker(display_interval=0)  # The renderer does the drawing
+    latest_book = None
+    renderer = Renderer(render_dashboard, fps=FPS)
+    renderer.start()
+
+    try:
+        async for message in websocket:
+            data = json.loads(message)
+            channel = data.get("channel")
+
+            # Ingestion: update state only, no printing
+            if channel == "l2Book":
+                latest_book = data  # Decoded frames are never mutated, so this is a snapshot already
+            elif channel == "trades":
+                tracker.handle_trade(data)
+
+            # Build a snapshot only when the renderer will use it
+            if renderer.wants_snapshot():
+                renderer.publish((latest_book, tracker.snapshot()))
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        renderer.stop()
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Benchmark
+Measure publish cost, read cost and consistency with readers in separate processes
+"""
+
+import multiprocessing
+import time
+
+from shm_book import BookPublisher, BookReader
+
+NAME = "hl_BENCH_l2"
+DEPTH = 20
+DURATION = 2.0
+N_READERS = 2
+
+
+def reader_process(results):
+    """Hammer the book with reads while the publisher writes, checking every read is consistent"""
+    reader = BookReader(NAME)
+    reads = torn = 0
+    deadline = time.time() + DURATION
+
+    while time.time() < deadline:
+        version, _, _, bids, asks = reader.read()
+        reads += 1
+        # Every level of a publication carries its version: mixed values mean a torn read
+        if any(level[0] != version for level in bids) or any(level[0] != version + 1 for level in asks):
+            torn += 1
+
+    # Cost of individual operations
+    start = time.perf_counter()
+    for _ in range(100_000):
+        reader.latest_seq()
+    seq_ns = (time.perf_counter() - start) / 100_000 * 1e9
+
+    start = time.perf_counter()
+    for _ in range(100_000):
+        reader.best_bid_ask()
+    top_ns = (time.perf_counter() - start) / 100_000 * 1e9
+
+    start = time.perf_counter()
+    for _ in range(20_000):
+        reader.read()
+    read_us = (time.perf_counter() - start) / 20_000 * 1e6
+
+    reader.close()
+    results.put((reads, torn, seq_ns, top_ns, read_us))
+
+
+def main():
+    publisher = BookPublisher(NAME, depth=DEPTH)
+    publisher.publish([(0, 0, 0)], [(1, 0, 0)], 0)
+
+    results = multiprocessing.Queue()
+    readers = [multiprocessing.Process(target=reader_process, args=(results,)) for _ in range(N_READERS)]
+    for process in readers:
+        process.start()
+
+    # Publish as fast as possible while the readers run
+    published = 0
+    start = time.perf_counter()
+    deadline = time.time() + DURATION
+    while time.time() < deadline:
+        published += 1
+        publisher.publish([(published, 1.0, 1)] * DEPTH, [(published + 1, 1.0, 1)] * DEPTH, published)
+    publish_us = (time.perf_counter() - start) / published * 1e6
+
+    stats = [results.get() for _ in readers]
+    for process in readers:
+        process.join()
+    publisher.close()
+
+    print(f"📏 {DEPTH} levels per side, {N_READERS} reader processes, {DURATION:.0f}s\n")
+    print(f"Publisher: {published:,} publications, {publish_us:.2f} µs each")
+    for i, (reads, torn, seq_ns, top_ns, read_us) in enumerate(stats):
+        print(f"Reader {i}: {reads:,} reads during publishing, {torn} torn")
+        print(f"   latest_seq()   {seq_ns:>7.0f} ns   (staleness check)")
+        print(f"   best_bid_ask() {top_ns:>7.0f} ns   (zero-copy)")
+        print(f"   read()         {read_us * 1000:>7.0f} ns   (full consistent copy)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Order Book Reader
+Consume books published by shm_book.py from any number of local processes
+"""
+
+import time
+
+from shm_book import L2_COINS, L4_COIN, BookReader, segment_name
+
+POLL_INTERVAL = 1.0  # Seconds between status lines
+
+
+def main():
+    names = [segment_name(L4_COIN, "l4")] + [segment_name(coin, "l2") for coin in L2_COINS]
+    try:
+        readers = {name: BookReader(name) for name in names}
+    except FileNotFoundError as e:
+        print(f"Error: {e}. Start shm_book.py first.")
+        return
+
+    print(f"📖 Reading {', '.join(names)} from shared memory\n")
+    last_seen = {name: reader.latest_seq() for name, reader in readers.items()}
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            for name, reader in readers.items():
+                # Cheap staleness check: one 8-byte read, no copying
+                seq = reader.latest_seq()
+                updates = seq - last_seen[name]
+                last_seen[name] = seq
+                if not seq:
+                    print(f"⏳ {name}: nothing published yet")
+                    continue
+
+                version, height, published_at, bids, asks = reader.read()
+                age_ms = (time.time() - published_at) * 1000
+                if bids and asks:
+                    spread = asks[0][0] - bids[0][0]
+                    print(f"📊 {name:<12} Bid ${bids[0][0]:<12,.2f} Ask ${asks[0][0]:<12,.2f} "
+                          f"Spread ${spread:<8.2f} | {updates:>4} updates/s | age {age_ms:.1f}ms")
+            print()
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        for reader in readers.values():
+            reader.close()
+
+
+if __name__ == "__main__":
+    main()
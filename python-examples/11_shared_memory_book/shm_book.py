@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Order Book Publisher
+Publish top-N book levels into shared memory so local processes can read them without their own subscription
+"""
+
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+import websockets
+from dotenv import load_dotenv
+from multiprocessing import parent_process, resource_tracker, shared_memory
+from pathlib import Path
+
+# Reuse the L4 book from example 07
+sys.path.insert(0, str(Path(__file__).parent.parent / "07_l4_orderbook"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+DEPTH = 20
+L4_COIN = "BTC"
+L2_COINS = ["ETH", "SOL"]
+
+# Layout of one segment:
+#   header: latest_seq (Q), depth (I), slot count (I)
+#   slots:  [slot header | bids (depth x px, sz, n) | asks (depth x px, sz, n)] x SLOTS
+# Each slot has its own seqlock counter: odd while being written, even when stable.
+HEADER = struct.Struct("<QII")
+SLOT_HEADER = struct.Struct("<QQqdII")  # seq, book version, height (-1 = unknown), publish time, n_bids, n_asks
+LEVEL_FIELDS = 3  # px, sz, n as float64
+SLOTS = 4
+
+# Segments created by publishers in this process
+_published_names = set()
+
+
+def segment_name(coin, kind):
+    """Shared memory name for a book, e.g. hl_BTC_l4"""
+    return f"hl_{coin}_{kind}"
+
+
+def _slot_size(depth):
+    return SLOT_HEADER.size + 2 * depth * LEVEL_FIELDS * 8
+
+
+class BookPublisher:
+    """Single writer of one book's top-N levels into a shared memory ring"""
+
+    def __init__(self, name, depth=DEPTH, slots=SLOTS):
+        self.name = name
+        self.depth = depth
+        self.slots = slots
+        self.slot_size = _slot_size(depth)
+        size = HEADER.size + slots * self.slot_size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left over from a crashed publisher: take it over
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _published_names.add(name)
+        self.buf = self.shm.buf
+        self.levels_format = struct.Struct(f"<{2 * depth * LEVEL_FIELDS}d")
+        self.seq = 0
+        self.last_version = None
+        HEADER.pack_into(self.buf, 0, 0, depth, slots)
+
+    def publish(self, bids, asks, version=0, height=None):
+        """Write (px, sz, n) levels best-first for each side"""
+        bids = list(bids)[:self.depth]
+        asks = list(asks)[:self.depth]
+        self.seq += 1
+        slot_offset = HEADER.size + (self.seq % self.slots) * self.slot_size
+
+        # Seqlock: mark the slot as being written (odd), write, then mark stable (even)
+        write_seq = self.seq * 2
+        struct.pack_into("<Q", self.buf, slot_offset, write_seq - 1)
+
+        values = [0.0] * (2 * self.depth * LEVEL_FIELDS)
+        for side_index, levels in enumerate((bids, asks)):
+            base = side_index * self.depth * LEVEL_FIELDS
+            for i, (px, sz, n) in enumerate(levels):
+                j = base + i * LEVEL_FIELDS
+                values[j] = float(px)
+                values[j + 1] = float(sz)
+                values[j + 2] = float(n)
+        self.levels_format.pack_into(self.buf, slot_offset + SLOT_HEADER.size, *values)
+
+        SLOT_HEADER.pack_into(
+            self.buf, slot_offset, write_seq - 1, version,
+            height if isinstance(height, int) else -1, time.time(), len(bids), len(asks)
+        )
+        struct.pack_into("<Q", self.buf, slot_offset, write_seq)
+        # Readers find the newest slot through the header
+        struct.pack_into("<Q", self.buf, 0, self.seq)
+
+    def publish_l4(self, orderbook):
+        """Publish an L4OrderBook's top levels (skipped if nothing changed)"""
+        snapshot = orderbook.snapshot(self.depth)
+        if snapshot.version == self.last_version:
+            return
+        self.last_version = snapshot.version
+        self.publish(
+            ((level.px, level.sz, level.n) for level in snapshot.bids),
+            ((level.px, level.sz, level.n) for level in snapshot.asks),
+            snapshot.version,
+            snapshot.height,
+        )
+
+    def publish_l2(self, data):
+        """Publish an l2Book frame's levels"""
+        book = data["data"]
+        bids, asks = book["levels"]
+        self.publish(
+            ((level["px"], level["sz"], level["n"]) for level in bids),
+            ((level["px"], level["sz"], level["n"]) for level in asks),
+            book.get("time", 0),
+        )
+
+    def close(self):
+        """Release and remove the segment"""
+        self.buf = None
+        self.shm.close()
+        self.shm.unlink()
+        _published_names.discard(self.name)
+
+
+class BookReader:
+    """Lock-free reader of a book published by BookPublisher"""
+
+    def __init__(self, name):
+        if sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Before 3.13 attaching registers the segment for cleanup, so a standalone
+            # reader would remove the publisher's segment when it exits. Processes started
+            # by multiprocessing share the parent's tracker and must leave it alone.
+            if parent_process() is None and name not in _published_names:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.buf = self.shm.buf
+        _, self.depth, self.slots = HEADER.unpack_from(self.buf, 0)
+        self.slot_size = _slot_size(self.depth)
+        self.levels_format = struct.Struct(f"<{2 * self.depth * LEVEL_FIELDS}d")
+        # Zero-copy float64 view over the whole segment (every field is 8-byte aligned)
+        self.values = self.buf.cast("d")
+
+    def latest_seq(self):
+        """Sequence number of the newest publication: compare to a cached value to check staleness"""
+        return struct.unpack_from("<Q", self.buf, 0)[0]
+
+    def read(self, retries=100):
+        """Consistent copy of the newest book: (version, height, published_at, bids, asks)
+
+        bids/asks are tuples of (px, sz, n). Retries if the writer lapped the slot mid-read.
+        """
+        for _ in range(retries):
+            seq = self.latest_seq()
+            slot_offset = HEADER.size + (seq % self.slots) * self.slot_size
+            slot_seq, version, height, published_at, n_bids, n_asks = SLOT_HEADER.unpack_from(self.buf, slot_offset)
+            if slot_seq != seq * 2:
+                continue  # Being written, or already reused for a newer publication
+            values = self.levels_format.unpack_from(self.buf, slot_offset + SLOT_HEADER.size)
+            if struct.unpack_from("<Q", self.buf, slot_offset)[0] != slot_seq:
+                continue  # Torn read: try again
+
+            half = self.depth * LEVEL_FIELDS
+            bids = tuple(tuple(values[i:i + LEVEL_FIELDS]) for i in range(0, n_bids * LEVEL_FIELDS, LEVEL_FIELDS))
+            asks = tuple(tuple(values[half + i:half + i + LEVEL_FIELDS]) for i in range(0, n_asks * LEVEL_FIELDS, LEVEL_FIELDS))
+            return version, (height if height >= 0 else None), published_at, bids, asks
+        raise RuntimeError("Could not get a consistent read (publisher too fast?)")
+
+    def best_bid_ask(self, retries=100):
+        """Best bid and ask prices without copying the whole book"""
+        for _ in range(retries):
+            seq = self.latest_seq()
+            slot_offset = HEADER.size + (seq % self.slots) * self.slot_size
+            slot_seq, _, _, _, n_bids, n_asks = SLOT_HEADER.unpack_from(self.buf, slot_offset)
+            if slot_seq != seq * 2:
+                continue
+            first = (slot_offset + SLOT_HEADER.size) // 8
+            bid = self.values[first] if n_bids else None
+            ask = self.values[first + self.depth * LEVEL_FIELDS] if n_asks else None
+            if struct.unpack_from("<Q", self.buf, slot_offset)[0] == slot_seq:
+                return bid, ask
+        raise RuntimeError("Could not get a consistent read (publisher too fast?)")
+
+    def close(self):
+        """Detach from the segment (the publisher owns it)"""
+        self.values.release()
+        self.buf = None
+        self.shm.close()
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    print(f"Connecting to {ws_url}...")
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    websocket = await websockets.connect(ws_url, max_size=10 * 1024 * 1024)
+    print("Connected!\n")
+
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "l4Book", "coin": L4_COIN}}))
+    for coin in L2_COINS:
+        await websocket.send(json.dumps({
+            "method": "subscribe",
+            "subscription": {"type": "l2Book", "coin": coin, "nLevels": DEPTH, "nSigFigs": 5}
+        }))
+
+    orderbook = L4OrderBook()
+    publishers = {(L4_COIN, "l4"): BookPublisher(segment_name(L4_COIN, "l4"))}
+    for coin in L2_COINS:
+        publishers[(coin, "l2")] = BookPublisher(segment_name(coin, "l2"))
+
+    print("📡 Publishing to shared memory:")
+    for publisher in publishers.values():
+        print(f"   /dev/shm/{publisher.name}")
+    print("💡 Run reader.py in other terminals to consume the books\n")
+
+    try:
+        async for message in websocket:
+            data = json.loads(message)
+            channel = data.get("channel")
+
+            if channel == "l2Book":
+                publisher = publishers.get((data["data"]["coin"], "l2"))
+                if publisher:
+                    publisher.publish_l2(data)
+
+            elif channel == "l4Book":
+                snapshot = data["data"].get("Snapshot")
+                if snapshot:
+                    orderbook.process_snapshot(snapshot)
+                updates = data["data"].get("Updates")
+                if updates:
+                    orderbook.process_update(updates)
+                publishers[(L4_COIN, "l4")].publish_l4(orderbook)
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        for publisher in publishers.values():
+            publisher.close()
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
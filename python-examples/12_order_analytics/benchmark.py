@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Order Analytics Benchmark
+Replay an hour of BTC-like L4 updates through L4OrderBook with and without OrderAnalytics
+"""
+
+import json
+import random
+import sys
+import time
+from collections import deque
+
+from order_analytics import L4OrderBook, OrderAnalytics
+
+# Roughly an hour of BTC: ~10 blocks/s, a dozen book changes per block
+UPDATES = 36_000
+DIFFS_PER_UPDATE = 12
+START_ORDERS = 4_000
+MID = 97_000.0
+
+
+def synthetic_hour(seed=7):
+    """Yield (snapshot, updates...) shaped like the l4Book feed"""
+    rng = random.Random(seed)
+    users = [f"0x{rng.getrandbits(160):040x}" for _ in range(300)]
+    live = {}  # oid -> side
+    next_oid = 1
+
+    def new_order(side):
+        nonlocal next_oid
+        oid = next_oid
+        next_oid += 1
+        # Most orders sit close to the mid, a few far away
+        distance = int(rng.expovariate(1 / 15)) + 1
+        px = MID - distance if side == "B" else MID + distance
+        return oid, {"oid": oid, "user": rng.choice(users), "limitPx": f"{px:.0f}", "sz": f"{rng.uniform(0.001, 2):.4f}"}
+
+    bids, asks = [], []
+    for _ in range(START_ORDERS):
+        side = rng.choice("BA")
+        oid, order = new_order(side)
+        live[oid] = side
+        (bids if side == "B" else asks).append(order)
+    yield {"coin": "BTC", "height": 0, "levels": [bids, asks]}
+
+    now = 1_700_000_000_000
+    recent_oids = deque(maxlen=50)
+    for height in range(1, UPDATES + 1):
+        now += 100
+        diffs, statuses = [], []
+        for _ in range(DIFFS_PER_UPDATE):
+            if live and rng.random() < 0.5:
+                # Mostly quick cancels of recent orders, sometimes the oldest order goes
+                recent = [oid for oid in recent_oids if oid in live]
+                oid = rng.choice(recent) if recent and rng.random() < 0.7 else next(iter(live))
+                del live[oid]
+                diffs.append({"oid": oid, "raw_book_diff": "remove"})
+                statuses.append({"status": "filled" if rng.random() < 0.2 else "canceled", "order": {"oid": oid}})
+            else:
+                side = rng.choice("BA")
+                oid, order = new_order(side)
+                live[oid] = side
+                recent_oids.append(oid)
+                diffs.append({"oid": oid, "px": order["limitPx"], "user": order["user"],
+                              "raw_book_diff": {"new": {"sz": order["sz"]}}})
+                statuses.append({"status": "open", "order": {"oid": oid, "side": side}})
+        yield {"time": now, "height": height, "book_diffs": diffs, "order_statuses": statuses}
+
+
+def load_recording(path):
+    """Yield Snapshot / Updates bodies from a JSONL file of raw l4Book frames"""
+    with open(path) as f:
+        for line in f:
+            data = json.loads(line)
+            if data.get("channel") == "l4Book":
+                body = data["data"]
+                yield body.get("Snapshot") or body.get("Updates")
+
+
+def run(frames, with_analytics):
+    """Process every frame, returning (seconds, events, analytics)"""
+    book = L4OrderBook()
+    analytics = OrderAnalytics() if with_analytics else None
+    events = 0
+    start = time.perf_counter()
+    for frame in frames:
+        if "levels" in frame:
+            book.process_snapshot(frame)
+            if analytics:
+                analytics.on_snapshot(book)
+            continue
+        book.process_update(frame)
+        events += len(frame.get("book_diffs", []))
+        if analytics:
+            analytics.on_update(book, frame)
+    return time.perf_counter() - start, events, analytics
+
+
+def main():
+    # Pass a JSONL recording of l4Book frames to replay real data instead
+    if len(sys.argv) > 1:
+        frames = list(load_recording(sys.argv[1]))
+        source = sys.argv[1]
+    else:
+        frames = list(synthetic_hour())
+        source = f"synthetic hour ({UPDATES:,} updates)"
+
+    print(f"📏 Replaying {source}\n")
+    book_only, events, _ = run(frames, with_analytics=False)
+    with_analytics, _, analytics = run(frames, with_analytics=True)
+
+    extra = (with_analytics - book_only) / events * 1e6
+    print(f"L4OrderBook only          {book_only:6.2f}s  {events / book_only:>10,.0f} events/s")
+    print(f"L4OrderBook + analytics   {with_analytics:6.2f}s  {events / with_analytics:>10,.0f} events/s")
+    print(f"\n✅ Analytics cost {extra:.2f} µs per book event; an hour of data took {with_analytics:.1f}s")
+    analytics.display_report(top_users=5)
+
+
+if __name__ == "__main__":
+    main()
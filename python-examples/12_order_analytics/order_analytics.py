@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+L4 Order Analytics Example
+Track queue positions, order lifetimes and cancel-to-add ratios incrementally from the L4 feed
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import websockets
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the L4 book from example 07
+sys.path.insert(0, str(Path(__file__).parent.parent / "07_l4_orderbook"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+COIN = "BTC"
+REPORT_INTERVAL = 10  # Seconds between reports
+
+# Price distance from mid at the time an order was added, in basis points
+DISTANCE_BUCKETS_BPS = [1, 5, 10, 25, 50, 100]
+DISTANCE_LABELS = ["<1", "1-5", "5-10", "10-25", "25-50", "50-100", "100+"]
+
+
+def distance_bucket(bps):
+    """Index into DISTANCE_LABELS for a distance in bps"""
+    for i, limit in enumerate(DISTANCE_BUCKETS_BPS):
+        if bps < limit:
+            return i
+    return len(DISTANCE_BUCKETS_BPS)
+
+
+class LevelQueue:
+    """FIFO queue at one price level with O(log n) queue-position queries.
+
+    Orders get increasing slots in arrival order. Two Fenwick trees over the slots
+    hold live order counts and sizes, so "how much is ahead of this order" is a
+    prefix sum and removing an order is a point update - no shifting of the
+    orders behind it.
+    """
+
+    def __init__(self):
+        self.slots = {}  # oid -> (slot, size)
+        self.counts = [0]  # Fenwick tree, 1-indexed
+        self.sizes = [0.0]
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _prefix(self, tree, i):
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _add(self, i, count, size):
+        n = len(self.counts)
+        while i < n:
+            self.counts[i] += count
+            self.sizes[i] += size
+            i += i & -i
+
+    def append(self, oid, size):
+        """Add an order at the back of the queue"""
+        if len(self.counts) > 2 * len(self.slots) + 64:
+            self._compact()
+        i = len(self.counts)
+        # A new Fenwick node covers (i - lowbit(i), i]: itself plus the live orders already in that range
+        low = i - (i & -i)
+        self.counts.append(1 + self._prefix(self.counts, i - 1) - self._prefix(self.counts, low))
+        self.sizes.append(size + self._prefix(self.sizes, i - 1) - self._prefix(self.sizes, low))
+        self.slots[oid] = (i, size)
+
+    def remove(self, oid):
+        """Remove an order, returning (orders ahead, size ahead) at the moment it left"""
+        slot, size = self.slots.pop(oid)
+        ahead = (self._prefix(self.counts, slot - 1), self._prefix(self.sizes, slot - 1))
+        self._add(slot, -1, -size)
+        return ahead
+
+    def resize(self, oid, size):
+        """Change an order's size in place (partial fills keep their queue priority)"""
+        slot, old_size = self.slots[oid]
+        self.slots[oid] = (slot, size)
+        self._add(slot, 0, size - old_size)
+
+    def position(self, oid):
+        """(orders ahead, size ahead) of a resting order"""
+        slot, _ = self.slots[oid]
+        return self._prefix(self.counts, slot - 1), self._prefix(self.sizes, slot - 1)
+
+    def _compact(self):
+        """Drop the slots of removed orders so the trees don't grow forever"""
+        live = sorted(self.slots.items(), key=lambda item: item[1][0])
+        self.slots = {}
+        self.counts = [0]
+        self.sizes = [0.0]
+        for oid, (_, size) in live:
+            self.append(oid, size)
+
+
+class LogHistogram:
+    """Constant-time histogram with power-of-two millisecond buckets"""
+
+    def __init__(self, buckets=32):
+        self.counts = [0] * buckets
+        self.total = 0
+
+    def add(self, value_ms):
+        bucket = min(int(value_ms).bit_length(), len(self.counts) - 1) if value_ms > 0 else 0
+        self.counts[bucket] += 1
+        self.total += 1
+
+    def percentile(self, pct):
+        """Upper bound (ms) of the bucket containing the given percentile"""
+        if not self.total:
+            return 0
+        target = self.total * pct / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return (1 << bucket) if bucket else 1
+        return 1 << (len(self.counts) - 1)
+
+
+class FlowCounts:
+    """Add / cancel / fill / amend counters"""
+
+    __slots__ = ("adds", "cancels", "fills", "amends")
+
+    def __init__(self):
+        self.adds = 0
+        self.cancels = 0
+        self.fills = 0
+        self.amends = 0  # Removed and placed again under the same oid within one update
+
+    def cancel_to_add(self):
+        return self.cancels / self.adds if self.adds else 0
+
+
+class OrderAnalytics:
+    """Per-order queue and lifetime analytics, fed by L4OrderBook's change sets"""
+
+    def __init__(self):
+        self.queues = {}  # (side, price) -> LevelQueue
+        self.orders = {}  # oid -> (added_ms or None, user, distance bucket or None, (side, price))
+        self.time_to_cancel = LogHistogram()
+        self.time_to_fill = LogHistogram()
+        self.size_ahead_at_fill = 0.0  # Running sum, to report the average
+        self.by_user = {}  # user -> FlowCounts
+        self.by_distance = [FlowCounts() for _ in DISTANCE_LABELS]
+        self.events = 0
+
+    def on_snapshot(self, book):
+        """Seed queues from a freshly loaded book (ages of these orders are unknown)"""
+        self.queues.clear()
+        self.orders.clear()
+        for side, levels in (("bid", book.bids), ("ask", book.asks)):
+            for price, oids in levels.items():
+                queue = self.queues.setdefault((side, price), LevelQueue())
+                for oid in oids:
+                    order = book.orders[oid]
+                    queue.append(oid, float(order["sz"]))
+                    self.orders[oid] = (None, order["user"], None, (side, price))
+
+    def on_update(self, book, update):
+        """Apply book.last_changes after book.process_update(update)"""
+        now_ms = update.get("time") or time.time() * 1000
+        statuses = {}
+        for order_status in update.get("order_statuses", []):
+            oid = order_status.get("order", {}).get("oid")
+            if oid:
+                statuses[oid] = order_status.get("status", "")
+
+        # Skip orders that were added and removed again within the same update
+        added = [order for order in book.last_changes["added"] if order["oid"] in book.orders]
+        readded = {order["oid"] for order in added}
+        for order in book.last_changes["removed"]:
+            status = statuses.get(order["oid"], "")
+            # Removed and placed again in one update is an amend, not a cancel; _on_add moves its queue entry
+            if order["oid"] in readded and status != "filled":
+                continue
+            self._on_remove(order, status, now_ms)
+
+        mid = self._mid(book)
+        for order in added:
+            self._on_add(order, now_ms, mid)
+
+        # After the adds, so an order added and resized in one update is resized in its new queue.
+        # The book's current size is used: an oid can be modified several times per update
+        for order in book.last_changes["modified"]:
+            oid = order["oid"]
+            tracked = self.orders.get(oid)
+            if tracked is not None and oid in book.orders:
+                self.queues[tracked[3]].resize(oid, float(book.orders[oid]["sz"]))
+
+    def _mid(self, book):
+        if book.bid_ladder and book.ask_ladder:
+            return (book.bid_ladder[-1][0] + book.ask_ladder[0][0]) / 2
+        return None
+
+    def _on_add(self, order, now_ms, mid):
+        self.events += 1
+        oid = order["oid"]
+        price = order["limitPx"]
+        key = (order["side"], price)
+
+        previous = self.orders.get(oid)
+        if previous is not None:
+            # Amended (re-added under the same oid): it goes to the back of its (possibly new) queue,
+            # keeping its age and distance bucket, so a later cancel or fill matches the original add
+            added_ms, user, bucket, old_key = previous
+            self._dequeue(oid, old_key)
+            self.queues.setdefault(key, LevelQueue()).append(oid, float(order["sz"]))
+            self.orders[oid] = (added_ms, user, bucket, key)
+            self._user(user).amends += 1
+            if bucket is not None:
+                self.by_distance[bucket].amends += 1
+            return
+
+        bucket = distance_bucket(abs(float(price) - mid) / mid * 10_000) if mid else None
+        self.queues.setdefault(key, LevelQueue()).append(oid, float(order["sz"]))
+        self.orders[oid] = (now_ms, order["user"], bucket, key)
+
+        self._user(order["user"]).adds += 1
+        if bucket is not None:
+            self.by_distance[bucket].adds += 1
+
+    def _on_remove(self, order, status, now_ms):
+        self.events += 1
+        oid = order["oid"]
+        tracked = self.orders.pop(oid, None)
+        if tracked is None:
+            return
+        added_ms, user, bucket, key = tracked
+        _, size_ahead = self._dequeue(oid, key)
+        filled = status == "filled"
+        counts = self._user(user)
+        if filled:
+            counts.fills += 1
+            self.size_ahead_at_fill += size_ahead
+        else:
+            counts.cancels += 1
+        if bucket is not None:
+            if filled:
+                self.by_distance[bucket].fills += 1
+            else:
+                self.by_distance[bucket].cancels += 1
+
+        if added_ms is not None:
+            histogram = self.time_to_fill if filled else self.time_to_cancel
+            histogram.add(now_ms - added_ms)
+
+    def _dequeue(self, oid, key):
+        """Take an order out of its level queue, returning (orders ahead, size ahead)"""
+        queue = self.queues[key]
+        ahead = queue.remove(oid)
+        if not queue:
+            del self.queues[key]
+        return ahead
+
+    def _user(self, user):
+        counts = self.by_user.get(user)
+        if counts is None:
+            counts = self.by_user[user] = FlowCounts()
+        return counts
+
+    def queue_position(self, oid, side, price):
+        """(orders ahead, size ahead) for a resting order"""
+        return self.queues[(side, price)].position(oid)
+
+    def display_report(self, top_users=10):
+        """Print lifetime distributions and cancel-to-add ratios"""
+        print(f"\n{'='*80}")
+        print(f"🔬 L4 Order Analytics - {self.events:,} events, {len(self.orders):,} resting orders")
+        print(f"{'='*80}")
+
+        for name, histogram in (("Time to cancel", self.time_to_cancel), ("Time to fill", self.time_to_fill)):
+            print(f"⏱️  {name:<15} n={histogram.total:<8,} "
+                  f"p50≤{histogram.percentile(50):,}ms  p90≤{histogram.percentile(90):,}ms  p99≤{histogram.percentile(99):,}ms")
+        fills = self.time_to_fill.total
+        if fills:
+            print(f"📏 Avg size ahead when filled: {self.size_ahead_at_fill / fills:.4f}")
+
+        print(f"\n{'Distance (bps)':<16} {'Adds':<10} {'Cancels':<10} {'Fills':<10} {'Amends':<10} {'Cancel/Add':<10}")
+        print("-" * 80)
+        for label, counts in zip(DISTANCE_LABELS, self.by_distance):
+            print(f"{label:<16} {counts.adds:<10} {counts.cancels:<10} {counts.fills:<10} {counts.amends:<10} "
+                  f"{counts.cancel_to_add():<10.2f}")
+
+        print(f"\n{'User':<18} {'Adds':<10} {'Cancels':<10} {'Fills':<10} {'Amends':<10} {'Cancel/Add':<10}")
+        print("-" * 80)
+        busiest = sorted(self.by_user.items(), key=lambda item: item[1].adds, reverse=True)[:top_users]
+        for user, counts in busiest:
+            user_addr = (user or "unknown")[:12] + "..."
+            print(f"{user_addr:<18} {counts.adds:<10} {counts.cancels:<10} {counts.fills:<10} {counts.amends:<10} "
+                  f"{counts.cancel_to_add():<10.2f}")
+        print(f"{'='*80}\n")
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    print(f"Connecting to {ws_url}...")
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    websocket = await websockets.connect(ws_url, max_size=10 * 1024 * 1024)
+    print("Connected!\n")
+
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "l4Book", "coin": COIN}}))
+    print(f"🔬 Analyzing {COIN} L4 order flow, report every {REPORT_INTERVAL}s...\n")
+
+    orderbook = L4OrderBook()
+    analytics = OrderAnalytics()
+    next_report = time.monotonic() + REPORT_INTERVAL
+
+    try:
+        async for message in websocket:
+            data = json.loads(message)
+            if data.get("channel") != "l4Book":
+                continue
+
+            snapshot = data["data"].get("Snapshot")
+            if snapshot:
+                orderbook.process_snapshot(snapshot)
+                analytics.on_snapshot(orderbook)
+                print(f"✅ Snapshot loaded: {len(orderbook.orders)} orders")
+                continue
+
+            updates = data["data"].get("Updates")
+            if updates:
+                orderbook.process_update(updates)
+                analytics.on_update(orderbook, updates)
+
+            if time.monotonic() >= next_report:
+                analytics.display_report()
+                next_report = time.monotonic() + REPORT_INTERVAL
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+        analytics.display_report()
+    finally:
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Depth Metrics Benchmark
+Compare incremental depth metrics with recomputing them from the full levels on every update
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from depth_metrics import DEPTH_BANDS_BPS, IMBALANCE_LEVELS, DepthMetricsEngine
+
+# Reuse the synthetic L4 hour from example 12
+sys.path.insert(0, str(Path(__file__).parent.parent / "12_order_analytics"))
+from benchmark import synthetic_hour  # noqa: E402
+from order_analytics import L4OrderBook  # noqa: E402
+
+N_COINS = 100
+N_LEVELS = 50
+L2_FRAMES = 50_000
+CHANGES_PER_FRAME = 3
+L4_UPDATES = 10_000
+
+
+def metrics_from_scratch(bids, asks):
+    """What you'd do without incremental state: sum everything again. bids/asks are best-first (px, sz)."""
+    best_bid, best_ask = bids[0], asks[0]
+    mid = (best_bid[0] + best_ask[0]) / 2
+    result = {"microprice": (best_bid[0] * best_ask[1] + best_ask[0] * best_bid[1]) / (best_bid[1] + best_ask[1])}
+    for n in IMBALANCE_LEVELS:
+        bid_qty = sum(sz for _, sz in bids[:n])
+        ask_qty = sum(sz for _, sz in asks[:n])
+        bid_vwap = sum(px * sz for px, sz in bids[:n]) / bid_qty
+        ask_vwap = sum(px * sz for px, sz in asks[:n]) / ask_qty
+        result[n] = ((bid_qty - ask_qty) / (bid_qty + ask_qty),
+                     (bid_vwap * ask_qty + ask_vwap * bid_qty) / (bid_qty + ask_qty))
+    for bps in DEPTH_BANDS_BPS:
+        result[bps] = (sum(sz for px, sz in bids if (mid - px) / mid * 10_000 <= bps),
+                       sum(sz for px, sz in asks if (px - mid) / mid * 10_000 <= bps))
+    return result
+
+
+def make_l2_frames(rng):
+    """l2Book frames where each frame changes a few sizes of the previous one for that coin"""
+    books = {}
+    for i in range(N_COINS):
+        mid = rng.uniform(1, 100_000)
+        tick = mid / 10_000
+        books[f"COIN{i}"] = (
+            [[f"{mid - tick * (j + 1):.6f}", f"{rng.uniform(0.1, 10):.4f}"] for j in range(N_LEVELS)],
+            [[f"{mid + tick * (j + 1):.6f}", f"{rng.uniform(0.1, 10):.4f}"] for j in range(N_LEVELS)],
+        )
+
+    frames = []
+    coins = list(books)
+    for t in range(L2_FRAMES):
+        coin = rng.choice(coins)
+        bids, asks = books[coin]
+        for _ in range(CHANGES_PER_FRAME):
+            side = rng.choice((bids, asks))
+            side[rng.randrange(N_LEVELS)][1] = f"{rng.uniform(0.1, 10):.4f}"
+        frames.append({"channel": "l2Book", "data": {"coin": coin, "time": t, "levels": [
+            [{"px": px, "sz": sz, "n": 1} for px, sz in bids],
+            [{"px": px, "sz": sz, "n": 1} for px, sz in asks],
+        ]}})
+    return frames
+
+
+def bench_l2(frames):
+    print(f"📏 L2: {L2_FRAMES:,} frames, {N_COINS} coins x {N_LEVELS} levels, {CHANGES_PER_FRAME} changed levels per frame")
+
+    start = time.perf_counter()
+    for data in frames:
+        bids, asks = data["data"]["levels"]
+        metrics_from_scratch([(float(l["px"]), float(l["sz"])) for l in bids],
+                             [(float(l["px"]), float(l["sz"])) for l in asks])
+    scratch = time.perf_counter() - start
+
+    engine = DepthMetricsEngine()
+    start = time.perf_counter()
+    for data in frames:
+        engine.handle_l2_book(data)
+    incremental = time.perf_counter() - start
+
+    print(f"   From scratch     {scratch / len(frames) * 1e6:>8.1f} µs/frame")
+    print(f"   Incremental      {incremental / len(frames) * 1e6:>8.1f} µs/frame\n")
+
+
+def bench_l4():
+    frames = list(synthetic_hour())[:L4_UPDATES + 1]
+    print(f"📏 L4: {L4_UPDATES:,} updates on a {len(frames[0]['levels'][0]) + len(frames[0]['levels'][1]):,}-order book")
+
+    def aggregate(book):
+        bids = [(float(px), sum(float(book.orders[o]["sz"]) for o in book.bids[px])) for _, px in reversed(book.bid_ladder)]
+        asks = [(float(px), sum(float(book.orders[o]["sz"]) for o in book.asks[px])) for _, px in book.ask_ladder]
+        return bids, asks
+
+    book = L4OrderBook()
+    book.process_snapshot(frames[0])
+    start = time.perf_counter()
+    for update in frames[1:]:
+        book.process_update(update)
+        metrics_from_scratch(*aggregate(book))
+    scratch = time.perf_counter() - start
+
+    book = L4OrderBook()
+    engine = DepthMetricsEngine()
+    book.process_snapshot(frames[0])
+    engine.handle_l4_snapshot(book)
+    start = time.perf_counter()
+    for update in frames[1:]:
+        book.process_update(update)
+        engine.handle_l4_update(book)
+    incremental = time.perf_counter() - start
+
+    print(f"   From scratch     {scratch / L4_UPDATES * 1e6:>8.1f} µs/update (incl. book)")
+    print(f"   Incremental      {incremental / L4_UPDATES * 1e6:>8.1f} µs/update (incl. book)")
+
+    # Moving the bands when the mid shifts by a tick: only levels crossing a band edge, vs rescanning the bands
+    side = engine.get(book.coin).bids
+    mid, tick = side.band_mid, side.band_mid / 100_000
+    shifts = [mid + tick * (i % 3 - 1) for i in range(10_000)]
+    start = time.perf_counter()
+    for shifted in shifts:
+        side.recenter(shifted)
+    shifted_us = (time.perf_counter() - start) / len(shifts) * 1e6
+    start = time.perf_counter()
+    for shifted in shifts:
+        side.band_edges = {}
+        side.recenter(shifted)
+    rescan_us = (time.perf_counter() - start) / len(shifts) * 1e6
+    print(f"   Mid moves a tick: {shifted_us:.2f} µs per side adjusting band edges, {rescan_us:.2f} µs rescanning the bands")
+
+
+def main():
+    rng = random.Random(11)
+    bench_l2(make_l2_frames(rng))
+    bench_l4()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Depth Metrics Example
+Maintain book imbalance, microprice and depth-within-bps incrementally for many coins
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import websockets
+from bisect import bisect_left, bisect_right
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the router from example 09 and the L4 book from example 07
+examples_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(examples_dir / "07_l4_orderbook"))
+sys.path.insert(0, str(examples_dir / "09_message_router"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from message_router import MessageRouter  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+COINS = ["BTC", "ETH", "SOL", "HYPE", "ARB"]
+L4_COIN = "BTC"  # Also tracked from its L4 book, in a second table
+DISPLAY_INTERVAL = 2  # Seconds between tables
+
+IMBALANCE_LEVELS = (1, 5, 10, 25)  # Imbalance / depth over the top N levels
+DEPTH_BANDS_BPS = (5, 10, 25)  # Cumulative depth within X bps of mid
+RESYNC_EVERY = 10_000  # Recompute sums from scratch this often to stop float drift
+
+
+class DepthSide:
+    """One side of a book with running sums over the top N levels and within bps bands"""
+
+    def __init__(self, is_bid):
+        self.is_bid = is_bid
+        self.keys = []  # Sorted best-first: -price for bids, price for asks
+        self.sizes = {}  # price -> size
+        # Running quantity and notional over the top N levels
+        self.qty = {n: 0.0 for n in IMBALANCE_LEVELS}
+        self.notional = {n: 0.0 for n in IMBALANCE_LEVELS}
+        # Running quantity within X bps of band_mid: every level whose key is <= band_edges[bps]
+        self.band_mid = None
+        self.band_edges = {}  # bps -> key of the farthest price inside the band
+        self.band_qty = {bps: 0.0 for bps in DEPTH_BANDS_BPS}
+
+    def _price(self, rank):
+        key = self.keys[rank]
+        return -key if self.is_bid else key
+
+    def best(self):
+        """(price, size) of the best level, or None"""
+        if not self.keys:
+            return None
+        price = self._price(0)
+        return price, self.sizes[price]
+
+    def _adjust_top(self, rank, price, size):
+        """Add size at price (which is at rank) to every top-N sum it falls into"""
+        for n in IMBALANCE_LEVELS:
+            if rank < n:
+                self.qty[n] += size
+                self.notional[n] += price * size
+
+    def _adjust_band(self, key, size):
+        for bps, edge in self.band_edges.items():
+            if key <= edge:
+                self.band_qty[bps] += size
+
+    def _band_edge(self, mid, bps):
+        return -mid * (1 - bps / 10_000) if self.is_bid else mid * (1 + bps / 10_000)
+
+    def _size_between(self, low, high):
+        """Total size of the levels with low < key <= high"""
+        keys, sizes = self.keys, self.sizes
+        span = keys[bisect_right(keys, low):bisect_right(keys, high)]
+        if self.is_bid:
+            return sum(sizes[-key] for key in span)
+        return sum(sizes[key] for key in span)
+
+    def set_level(self, price, size):
+        """Set the total size at a price (0 removes the level)"""
+        old = self.sizes.get(price)
+        key = -price if self.is_bid else price
+
+        if old is None:
+            if size <= 0:
+                return
+            rank = bisect_left(self.keys, key)
+            self.keys.insert(rank, key)
+            self.sizes[price] = size
+            self._adjust_top(rank, price, size)
+            # The level that was at rank n-1 is pushed out of the top n
+            for n in IMBALANCE_LEVELS:
+                if rank < n < len(self.keys):
+                    pushed = self._price(n)
+                    self.qty[n] -= self.sizes[pushed]
+                    self.notional[n] -= pushed * self.sizes[pushed]
+            self._adjust_band(key, size)
+
+        elif size <= 0:
+            rank = bisect_left(self.keys, key)
+            del self.keys[rank]
+            del self.sizes[price]
+            self._adjust_top(rank, price, -old)
+            # The level that was at rank n moves up into the top n
+            for n in IMBALANCE_LEVELS:
+                if rank < n <= len(self.keys):
+                    pulled = self._price(n - 1)
+                    self.qty[n] += self.sizes[pulled]
+                    self.notional[n] += pulled * self.sizes[pulled]
+            self._adjust_band(key, -old)
+
+        else:
+            delta = size - old
+            self.sizes[price] = size
+            rank = bisect_left(self.keys, key)
+            self._adjust_top(rank, price, delta)
+            self._adjust_band(key, delta)
+
+    def recenter(self, mid):
+        """Move the bands to a new mid, adjusting only for the levels that crossed a band edge"""
+        self.band_mid = mid
+        for bps in DEPTH_BANDS_BPS:
+            edge = self._band_edge(mid, bps)
+            old = self.band_edges.get(bps)
+            if old is None:
+                self.band_qty[bps] = self._size_between(float("-inf"), edge)
+            elif edge > old:
+                self.band_qty[bps] += self._size_between(old, edge)
+            elif edge < old:
+                self.band_qty[bps] -= self._size_between(edge, old)
+            self.band_edges[bps] = edge
+
+    def resync(self):
+        """Recompute the top-N sums from scratch"""
+        for n in IMBALANCE_LEVELS:
+            prices = [self._price(rank) for rank in range(min(n, len(self.keys)))]
+            self.qty[n] = sum(self.sizes[p] for p in prices)
+            self.notional[n] = sum(p * self.sizes[p] for p in prices)
+        if self.band_mid is not None:
+            self.band_edges = {}
+            self.recenter(self.band_mid)
+
+
+class DepthMetrics:
+    """Incremental depth metrics for one coin"""
+
+    def __init__(self, coin):
+        self.coin = coin
+        self.bids = DepthSide(is_bid=True)
+        self.asks = DepthSide(is_bid=False)
+        self.l2_view = {}  # (side, price string) -> size string from the last l2Book frame
+        self.changes = 0
+        self.updates = 0
+
+    def set_level(self, side, price, size):
+        """Apply one level change ('bid' or 'ask')"""
+        (self.bids if side == "bid" else self.asks).set_level(price, size)
+        self.changes += 1
+
+    def _after_changes(self):
+        """Shift the bps bands if the mid moved, and periodically resync"""
+        self.updates += 1
+        mid = self.mid()
+        if mid is not None and mid != self.bids.band_mid:
+            self.bids.recenter(mid)
+            self.asks.recenter(mid)
+        if self.changes >= RESYNC_EVERY:
+            self.bids.resync()
+            self.asks.resync()
+            self.changes = 0
+
+    def apply_l2(self, book):
+        """Apply an l2Book payload, touching only the levels that differ from the last one"""
+        # Compare raw strings; only changed levels pay for float conversion
+        bids, asks = book["levels"]
+        view = {("bid", level["px"]): level["sz"] for level in bids}
+        view.update({("ask", level["px"]): level["sz"] for level in asks})
+
+        previous = self.l2_view
+        for key, size in view.items():
+            if previous.get(key) != size:
+                self.set_level(key[0], float(key[1]), float(size))
+        for key in previous.keys() - view.keys():
+            self.set_level(key[0], float(key[1]), 0)
+        self.l2_view = view
+        self._after_changes()
+
+    def load_l4(self, orderbook):
+        """Rebuild from an L4OrderBook after a snapshot"""
+        self.bids = DepthSide(is_bid=True)
+        self.asks = DepthSide(is_bid=False)
+        for side, levels in (("bid", orderbook.bids), ("ask", orderbook.asks)):
+            for price, oids in levels.items():
+                size = sum(float(orderbook.orders[oid]["sz"]) for oid in oids if oid in orderbook.orders)
+                self.set_level(side, float(price), size)
+        self._after_changes()
+
+    def apply_l4_changes(self, changes):
+        """Apply L4OrderBook.last_changes: each added/removed/resized order moves its level's size"""
+        for sign, orders in ((1, changes["added"]), (-1, changes["removed"])):
+            for order in orders:
+                side = self.bids if order["side"] == "bid" else self.asks
+                price = float(order["limitPx"])
+                size = side.sizes.get(price, 0.0) + sign * float(order["sz"])
+                self.set_level(order["side"], price, size if size > 1e-12 else 0)
+        for order in changes["modified"]:
+            side = self.bids if order["side"] == "bid" else self.asks
+            price = float(order["limitPx"])
+            size = side.sizes.get(price, 0.0) + float(order["sz"]) - float(order["prevSz"])
+            self.set_level(order["side"], price, size if size > 1e-12 else 0)
+        self._after_changes()
+
+    def mid(self):
+        best_bid, best_ask = self.bids.best(), self.asks.best()
+        if not best_bid or not best_ask:
+            return None
+        return (best_bid[0] + best_ask[0]) / 2
+
+    def microprice(self):
+        """Top-of-book price weighted towards the side with less size"""
+        best_bid, best_ask = self.bids.best(), self.asks.best()
+        if not best_bid or not best_ask:
+            return None
+        (bid_px, bid_sz), (ask_px, ask_sz) = best_bid, best_ask
+        return (bid_px * ask_sz + ask_px * bid_sz) / (bid_sz + ask_sz)
+
+    def imbalance(self, n):
+        """(bid qty - ask qty) / (bid qty + ask qty) over the top n levels, in [-1, 1]"""
+        bid_qty, ask_qty = self.bids.qty[n], self.asks.qty[n]
+        total = bid_qty + ask_qty
+        return (bid_qty - ask_qty) / total if total > 0 else 0
+
+    def depth_weighted_mid(self, n):
+        """Mid from each side's VWAP over n levels, weighted by the opposite side's depth"""
+        bid_qty, ask_qty = self.bids.qty[n], self.asks.qty[n]
+        if bid_qty <= 0 or ask_qty <= 0:
+            return None
+        bid_vwap = self.bids.notional[n] / bid_qty
+        ask_vwap = self.asks.notional[n] / ask_qty
+        return (bid_vwap * ask_qty + ask_vwap * bid_qty) / (bid_qty + ask_qty)
+
+    def depth_within(self, bps):
+        """(bid qty, ask qty) within bps of mid"""
+        return self.bids.band_qty[bps], self.asks.band_qty[bps]
+
+    def snapshot(self):
+        """All metrics as a dict"""
+        return {
+            "coin": self.coin,
+            "mid": self.mid(),
+            "microprice": self.microprice(),
+            "depth_weighted_mid": {n: self.depth_weighted_mid(n) for n in IMBALANCE_LEVELS},
+            "imbalance": {n: self.imbalance(n) for n in IMBALANCE_LEVELS},
+            "depth_within_bps": {bps: self.depth_within(bps) for bps in DEPTH_BANDS_BPS},
+        }
+
+
+class DepthMetricsEngine:
+    """DepthMetrics for every coin, with handlers shaped like the other examples'"""
+
+    def __init__(self):
+        self.coins = {}  # coin -> DepthMetrics
+
+    def get(self, coin):
+        metrics = self.coins.get(coin)
+        if metrics is None:
+            metrics = self.coins[coin] = DepthMetrics(coin)
+        return metrics
+
+    def handle_l2_book(self, data):
+        """Handler for l2Book frames"""
+        book = data["data"]
+        self.get(book["coin"]).apply_l2(book)
+
+    def handle_l4_snapshot(self, orderbook):
+        """Call after L4OrderBook.process_snapshot"""
+        self.get(orderbook.coin).load_l4(orderbook)
+
+    def handle_l4_update(self, orderbook):
+        """Call after L4OrderBook.process_update"""
+        self.get(orderbook.coin).apply_l4_changes(orderbook.last_changes)
+
+    def display(self, title="Depth Metrics"):
+        """Print one row per coin"""
+        print(f"\n{'='*100}")
+        print(f"⚖️  {title}")
+        print(f"{'='*100}")
+        print(f"{'Coin':<8} {'Mid':<12} {'Microprice':<12} {'DW Mid(10)':<12} "
+              f"{'Imb 1':>7} {'Imb 5':>7} {'Imb 10':>7} {'Imb 25':>7}  {'Bid/Ask within 10bps':<24}")
+        print("-" * 100)
+        for coin, metrics in sorted(self.coins.items()):
+            mid = metrics.mid()
+            if mid is None:
+                continue
+            dw_mid = metrics.depth_weighted_mid(10) or 0
+            bid_depth, ask_depth = metrics.depth_within(10)
+            imbalances = " ".join(f"{metrics.imbalance(n):>+7.2f}" for n in IMBALANCE_LEVELS)
+            print(f"{coin:<8} {mid:<12,.4f} {metrics.microprice():<12,.4f} {dw_mid:<12,.4f} "
+                  f"{imbalances}  {bid_depth:>10,.2f} / {ask_depth:<10,.2f}")
+        print(f"{'='*100}\n")
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    engine = DepthMetricsEngine()
+    l4_engine = DepthMetricsEngine()  # Same metrics from every resting order, not just 50 aggregated levels
+    orderbook = L4OrderBook()
+
+    def handle_l4(data):
+        snapshot = data["data"].get("Snapshot")
+        if snapshot:
+            orderbook.process_snapshot(snapshot)
+            l4_engine.handle_l4_snapshot(orderbook)
+        updates = data["data"].get("Updates")
+        if updates:
+            orderbook.process_update(updates)
+            l4_engine.handle_l4_update(orderbook)
+
+    router = MessageRouter()
+    router.subscribe("l2Book", engine.handle_l2_book)
+    router.subscribe("l4Book", handle_l4, coin=L4_COIN)
+    router.ignore("subscriptionResponse")
+
+    print(f"Connecting to {ws_url}...")
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    websocket = await websockets.connect(ws_url, max_size=10 * 1024 * 1024)
+    print("Connected!\n")
+
+    for coin in COINS:
+        await websocket.send(json.dumps({
+            "method": "subscribe",
+            "subscription": {"type": "l2Book", "coin": coin, "nLevels": 50, "nSigFigs": 5}
+        }))
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "l4Book", "coin": L4_COIN}}))
+    print(f"⚖️  Tracking depth metrics for {', '.join(COINS)}, and {L4_COIN} from its L4 book\n")
+
+    next_display = time.monotonic() + DISPLAY_INTERVAL
+    try:
+        async for message in websocket:
+            router.dispatch_raw(message)
+            if time.monotonic() >= next_display:
+                engine.display()
+                l4_engine.display(f"Depth Metrics from the {L4_COIN} L4 book")
+                next_display = time.monotonic() + DISPLAY_INTERVAL
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
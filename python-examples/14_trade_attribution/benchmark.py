@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Trade Attribution Benchmark
+Check attribution accuracy and per-event cost on a synthetic BTC-like stream of trades and L4 updates
+"""
+
+import random
+import time
+from collections import deque
+
+from trade_attribution import FillCorrelator, L4OrderBook
+
+BLOCKS = 36_000  # An hour at ~10 blocks/s
+ADDS_PER_BLOCK = 8
+CANCELS_PER_BLOCK = 6
+TRADES_PER_BLOCK = 4
+START_ORDERS = 4_000
+MID = 97_000
+MAX_SKEW_MS = 300  # Trades arrive up to this much before or after the block's book diffs
+
+
+def synthetic_stream(seed=3):
+    """(snapshot, events, truth): events are ("trades" | "l4", payload) in arrival order,
+    truth maps tid -> the maker oid it filled"""
+    rng = random.Random(seed)
+    users = [f"0x{rng.getrandbits(160):040x}" for _ in range(300)]
+    orders = {}  # oid -> [side, px, size, user, placed size]
+    levels = {"B": {}, "A": {}}  # side -> px -> deque of oids
+    next_oid = 1
+
+    def add(side, px, size):
+        nonlocal next_oid
+        oid = next_oid
+        next_oid += 1
+        orders[oid] = [side, px, size, rng.choice(users), size]
+        levels[side].setdefault(px, deque()).append(oid)
+        return oid
+
+    def drop(oid):
+        side, px = orders.pop(oid)[:2]
+        queue = levels[side][px]
+        queue.remove(oid)
+        if not queue:
+            del levels[side][px]
+
+    def random_px(side):
+        distance = int(rng.expovariate(1 / 5)) + 1
+        return MID - distance if side == "B" else MID + distance
+
+    for _ in range(START_ORDERS):
+        side = rng.choice("BA")
+        add(side, random_px(side), round(rng.uniform(0.01, 2), 4))
+    snapshot = {"coin": "BTC", "height": 0, "levels": [
+        [{"oid": oid, "user": o[3], "limitPx": str(o[1]), "sz": f"{o[2]:.4f}"} for oid, o in orders.items() if o[0] == "B"],
+        [{"oid": oid, "user": o[3], "limitPx": str(o[1]), "sz": f"{o[2]:.4f}"} for oid, o in orders.items() if o[0] == "A"],
+    ]}
+
+    timed = []  # (arrival ms, order, event)
+    truth = {}
+    now = 1_700_000_000_000
+    tid = 0
+    recent = []  # Orders added during the stream, cancel candidates
+    for height in range(1, BLOCKS + 1):
+        now += 100
+        diffs, statuses, trades = [], [], []
+
+        for _ in range(ADDS_PER_BLOCK):
+            side = rng.choice("BA")
+            oid = add(side, random_px(side), round(rng.uniform(0.01, 2), 4))
+            recent.append(oid)
+            o = orders[oid]
+            diffs.append({"oid": oid, "px": str(o[1]), "user": o[3], "raw_book_diff": {"new": {"sz": f"{o[2]:.4f}"}}})
+            statuses.append({"status": "open", "order": {"oid": oid, "side": side}})
+
+        for _ in range(CANCELS_PER_BLOCK):
+            # Swap-remove a random cancel candidate, skipping orders that have since been filled
+            oid = None
+            while recent and oid not in orders:
+                i = rng.randrange(len(recent))
+                recent[i], recent[-1] = recent[-1], recent[i]
+                oid = recent.pop()
+            if oid not in orders:
+                continue
+            side = orders[oid][0]
+            drop(oid)
+            diffs.append({"oid": oid, "raw_book_diff": "remove"})
+            statuses.append({"status": "canceled", "order": {"oid": oid, "side": side}})
+
+        for _ in range(TRADES_PER_BLOCK):
+            # A taker hits the front of the best level on one side
+            aggressor = rng.choice("BA")
+            resting = "A" if aggressor == "B" else "B"
+            if not levels[resting]:
+                continue
+            px = min(levels[resting]) if resting == "A" else max(levels[resting])
+            oid = levels[resting][px][0]
+            o = orders[oid]
+            taker = rng.choice(users)
+            if rng.random() < 0.5:
+                size = o[2]
+                drop(oid)
+                diffs.append({"oid": oid, "raw_book_diff": "remove"})
+                statuses.append({"status": "filled", "order": {"oid": oid, "side": resting}})
+            else:
+                size = round(o[2] * rng.uniform(0.1, 0.9), 4) or 0.0001
+                diffs.append({"oid": oid, "raw_book_diff": {"update": {"origSz": f"{o[4]:.4f}", "newSz": f"{o[2] - size:.4f}"}}})
+                o[2] = round(o[2] - size, 4)
+            tid += 1
+            truth[tid] = oid
+            buyer, seller = (taker, o[3]) if aggressor == "B" else (o[3], taker)
+            trades.append({"coin": "BTC", "side": aggressor, "px": str(px), "sz": f"{size:.4f}",
+                           "time": now, "tid": tid, "users": [buyer, seller]})
+
+        timed.append((now, 1, ("l4", {"time": now, "height": height, "book_diffs": diffs, "order_statuses": statuses})))
+        if trades:
+            timed.append((now + rng.randint(-MAX_SKEW_MS, MAX_SKEW_MS), 0, ("trades", {"channel": "trades", "data": trades})))
+
+    timed.sort(key=lambda item: (item[0], item[1]))
+    return snapshot, [event for _, _, event in timed], truth
+
+
+def run(snapshot, events, correlator=None):
+    """Feed the stream through L4OrderBook (and the correlator), returning seconds"""
+    book = L4OrderBook()
+    book.process_snapshot(snapshot)
+    start = time.perf_counter()
+    for kind, payload in events:
+        if kind == "l4":
+            book.process_update(payload)
+            if correlator:
+                correlator.on_l4_update(book, payload)
+        elif correlator:
+            correlator.handle_trades(payload)
+    return time.perf_counter() - start
+
+
+def main():
+    snapshot, events, truth = synthetic_stream()
+    n_events = sum(len(p["book_diffs"]) if kind == "l4" else len(p["data"]) for kind, p in events)
+    print(f"📏 {BLOCKS:,} blocks, {len(truth):,} trades, {n_events:,} events, trades skewed ±{MAX_SKEW_MS}ms\n")
+
+    book_only = run(snapshot, events)
+    print(f"{'Window':<10} {'µs/event':>10} {'Matched':>10} {'Correct':>10} {'Buffered':>10}")
+    print("-" * 60)
+    costs = []
+    windows = (500, 2000, 10000)
+    for window_ms in windows:
+        fills = []
+        correlator = FillCorrelator(window_ms=window_ms, on_fill=fills.append)
+        elapsed = run(snapshot, events, correlator)
+        correct = sum(1 for fill in fills if truth.get(fill.tid) == fill.maker_oid)
+        extra = (elapsed - book_only) / n_events * 1e6
+        costs.append(extra)
+        print(f"{window_ms:>6,} ms {extra:>10.2f} {len(fills) / len(truth) * 100:>9.1f}% "
+              f"{correct / max(len(fills), 1) * 100:>9.1f}% {len(correlator.expiry):>10,}")
+
+    print(f"\n📈 A {windows[-1] // windows[0]}x longer window costs {costs[-1] / costs[0]:.1f}x per event: "
+          f"unmatched entries stay buffered longer, and lookups scan every entry waiting at the price")
+    correlator.display_report(top_users=5)
+
+
+if __name__ == "__main__":
+    main()
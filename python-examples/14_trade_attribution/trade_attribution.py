@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Trade Attribution Example
+Join trades to the resting L4 orders they filled: aggressor/maker attribution and per-user fill flow
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import websockets
+from collections import deque, namedtuple
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the L4 book from example 07 and the router from example 09
+sys.path.insert(0, str(Path(__file__).parent.parent / "07_l4_orderbook"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "09_message_router"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from message_router import MessageRouter  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+COIN = "BTC"
+REPORT_INTERVAL = 10  # Seconds between reports
+
+MATCH_WINDOW_MS = 2000  # How long a trade or a book fill waits for its other half
+TIME_TOLERANCE_MS = 50  # A trade and its book diff carry the same block time; allow a little slack
+SIZE_TOLERANCE = 1e-9
+
+# One trade joined to the resting order it filled
+Fill = namedtuple("Fill", "coin tid px sz aggressor taker maker maker_oid height lag_ms")
+
+
+class _Pending:
+    """A trade or a book-side fill waiting to be matched"""
+
+    __slots__ = ("time_ms", "user", "remaining", "item")
+
+    def __init__(self, time_ms, user, remaining, item):
+        self.time_ms = time_ms
+        self.user = user
+        self.remaining = remaining
+        self.item = item  # The trade dict, or (oid, height) for a book fill
+
+
+class UserFlow:
+    """Maker / taker volume for one user"""
+
+    __slots__ = ("maker_fills", "maker_volume", "maker_notional",
+                 "taker_fills", "taker_volume", "taker_notional", "net_position")
+
+    def __init__(self):
+        self.maker_fills = 0
+        self.maker_volume = 0.0
+        self.maker_notional = 0.0
+        self.taker_fills = 0
+        self.taker_volume = 0.0
+        self.taker_notional = 0.0
+        self.net_position = 0.0  # Bought minus sold
+
+    def maker_share(self):
+        total = self.maker_volume + self.taker_volume
+        return self.maker_volume / total if total else 0
+
+
+class FillCorrelator:
+    """Match trades to L4 fills using short per-price buffers.
+
+    Trades and the book diffs for the same fill arrive on different channels in
+    either order. Whichever half arrives first waits in a buffer keyed by
+    (coin, resting side, price); the other half looks it up there, matching on
+    maker address, block time and size. Entries older
+    than the match window are dropped in arrival order, so every event costs a
+    dict lookup plus a scan of the few entries waiting at one price.
+    """
+
+    def __init__(self, window_ms=MATCH_WINDOW_MS, time_tolerance_ms=TIME_TOLERANCE_MS, on_fill=None):
+        self.window_ms = window_ms
+        self.time_tolerance_ms = time_tolerance_ms
+        self.on_fill = on_fill
+        self.waiting_trades = {}  # (coin, resting side, px) -> deque of _Pending trades
+        self.waiting_fills = {}  # (coin, resting side, px) -> deque of _Pending book fills
+        self.expiry = deque()  # (time_ms, buffer, key, _Pending) in arrival order
+        self.clock = 0  # Latest exchange time seen on either channel
+        self.flow = {}  # user -> UserFlow
+        self.matched = 0
+        self.unmatched_trades = 0
+        self.unmatched_fills = 0
+        self.lag_total_ms = 0
+
+    # --- Trades -------------------------------------------------------------
+
+    def handle_trades(self, data):
+        """Handler for trades frames"""
+        for trade in data["data"]:
+            self.on_trade(trade)
+
+    def on_trade(self, trade):
+        # "B" means the buyer was the aggressor, so the resting order was an ask
+        resting_side = "ask" if trade["side"] == "B" else "bid"
+        users = trade.get("users")
+        maker = (users[1] if resting_side == "ask" else users[0]) if users else None
+        key = (trade["coin"], resting_side, float(trade["px"]))
+        size = float(trade["sz"])
+        self._advance(trade["time"])
+
+        waiting = self.waiting_fills.get(key)
+        if waiting:
+            # Prefer a fill of exactly this size, else the oldest one big enough
+            candidate = None
+            for fill in waiting:
+                if (maker is not None and fill.user != maker) or \
+                        abs(fill.time_ms - trade["time"]) > self.time_tolerance_ms:
+                    continue
+                if abs(fill.remaining - size) <= SIZE_TOLERANCE:
+                    candidate = fill
+                    break
+                if candidate is None and fill.remaining > size:
+                    candidate = fill
+            if candidate is not None:
+                self._match(trade, size, candidate, key)
+                if candidate.remaining <= SIZE_TOLERANCE:
+                    waiting.remove(candidate)
+                    if not waiting:
+                        del self.waiting_fills[key]
+                return
+
+        self._wait(self.waiting_trades, key, _Pending(trade["time"], maker, size, trade))
+
+    # --- Book side ----------------------------------------------------------
+
+    def on_l4_update(self, orderbook, update):
+        """Call after L4OrderBook.process_update(update)"""
+        time_ms = update.get("time") or self.clock
+        statuses = {}
+        for order_status in update.get("order_statuses", []):
+            oid = order_status.get("order", {}).get("oid")
+            if oid:
+                statuses[oid] = order_status.get("status", "")
+
+        changes = orderbook.last_changes
+        for order in changes["modified"]:
+            consumed = float(order["prevSz"]) - float(order["sz"])
+            if consumed > SIZE_TOLERANCE:
+                self.on_book_fill(orderbook.coin, order, consumed, time_ms, orderbook.height)
+        for order in changes["removed"]:
+            # Only "filled" means the order traded (not canceled, marginCanceled, expired, rejected, ...);
+            # a removal without a status may still be a fill
+            status = statuses.get(order["oid"])
+            if status is None or status == "filled":
+                self.on_book_fill(orderbook.coin, order, float(order["sz"]), time_ms, orderbook.height)
+
+    def on_book_fill(self, coin, order, size, time_ms, height=None):
+        """A resting order lost `size`; attribute it to waiting trades"""
+        key = (coin, order["side"], float(order["limitPx"]))
+        user = order["user"]
+        self._advance(time_ms)
+        fill = _Pending(time_ms, user, size, (order["oid"], height))
+
+        waiting = self.waiting_trades.get(key)
+        if waiting:
+            # A single trade of exactly this size first, else fill up with the oldest trades that fit
+            candidates = [trade for trade in waiting if trade.user in (None, user)
+                          and abs(trade.time_ms - time_ms) <= self.time_tolerance_ms]
+            exact = [trade for trade in candidates if abs(trade.remaining - size) <= SIZE_TOLERANCE]
+            for trade in exact[:1] or candidates:
+                if trade.remaining <= fill.remaining + SIZE_TOLERANCE:
+                    self._match(trade.item, trade.remaining, fill, key)
+                    waiting.remove(trade)
+                    trade.remaining = 0
+                    if fill.remaining <= SIZE_TOLERANCE:
+                        break
+            if not waiting:
+                del self.waiting_trades[key]
+            if fill.remaining <= SIZE_TOLERANCE:
+                return
+
+        self._wait(self.waiting_fills, key, fill)
+
+    # --- Matching -----------------------------------------------------------
+
+    def _match(self, trade, size, fill, key):
+        fill.remaining -= size
+        oid, height = fill.item
+        users = trade.get("users") or (None, None)
+        taker = users[0] if trade["side"] == "B" else users[1]
+        px = key[2]
+        lag_ms = fill.time_ms - trade["time"]
+        self.matched += 1
+        self.lag_total_ms += lag_ms
+
+        maker_flow = self._user(fill.user)
+        maker_flow.maker_fills += 1
+        maker_flow.maker_volume += size
+        maker_flow.maker_notional += size * px
+        maker_flow.net_position += size if key[1] == "bid" else -size
+        if taker is not None:
+            taker_flow = self._user(taker)
+            taker_flow.taker_fills += 1
+            taker_flow.taker_volume += size
+            taker_flow.taker_notional += size * px
+            taker_flow.net_position += size if trade["side"] == "B" else -size
+
+        if self.on_fill:
+            self.on_fill(Fill(key[0], trade.get("tid"), px, size, trade["side"], taker, fill.user, oid, height, lag_ms))
+
+    def _wait(self, buffer, key, pending):
+        waiting = buffer.get(key)
+        if waiting is None:
+            waiting = buffer[key] = deque()
+        waiting.append(pending)
+        self.expiry.append((pending.time_ms, buffer, key, pending))
+
+    def _advance(self, time_ms):
+        """Move the clock forward and drop entries that fell out of the match window"""
+        if time_ms > self.clock:
+            self.clock = time_ms
+        cutoff = self.clock - self.window_ms
+        expiry = self.expiry
+        while expiry and expiry[0][0] < cutoff:
+            _, buffer, key, pending = expiry.popleft()
+            if pending.remaining <= SIZE_TOLERANCE:
+                continue  # Already matched
+            if buffer is self.waiting_trades:
+                self.unmatched_trades += 1
+            else:
+                self.unmatched_fills += 1
+            pending.remaining = 0
+            waiting = buffer[key]
+            waiting.remove(pending)
+            if not waiting:
+                del buffer[key]
+
+    def _user(self, user):
+        flow = self.flow.get(user)
+        if flow is None:
+            flow = self.flow[user] = UserFlow()
+        return flow
+
+    def display_report(self, top_users=10):
+        """Print match rates and the users with the most filled volume"""
+        attempts = self.matched + self.unmatched_trades
+        match_rate = self.matched / attempts * 100 if attempts else 0
+        avg_lag = self.lag_total_ms / self.matched if self.matched else 0
+
+        print(f"\n{'='*100}")
+        print(f"🔗 Trade Attribution - {self.matched:,} fills matched ({match_rate:.1f}% of trades)")
+        print(f"{'='*100}")
+        print(f"⏳ Unmatched: {self.unmatched_trades:,} trades, {self.unmatched_fills:,} book fills | "
+              f"Avg book lag behind trade: {avg_lag:+.0f}ms")
+
+        print(f"\n{'User':<18} {'Maker Vol':>12} {'Taker Vol':>12} {'Maker %':>8} {'Fills':>8} {'Net Pos':>12}")
+        print("-" * 100)
+        busiest = sorted(self.flow.items(), key=lambda item: item[1].maker_notional + item[1].taker_notional,
+                         reverse=True)[:top_users]
+        for user, flow in busiest:
+            user_addr = (user or "unknown")[:12] + "..."
+            print(f"{user_addr:<18} {flow.maker_volume:>12,.4f} {flow.taker_volume:>12,.4f} "
+                  f"{flow.maker_share() * 100:>7.1f}% {flow.maker_fills + flow.taker_fills:>8,} {flow.net_position:>+12,.4f}")
+        print(f"{'='*100}\n")
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    orderbook = L4OrderBook()
+    correlator = FillCorrelator()
+
+    def handle_l4(data):
+        snapshot = data["data"].get("Snapshot")
+        if snapshot:
+            orderbook.process_snapshot(snapshot)
+            print(f"✅ Snapshot loaded: {len(orderbook.orders)} orders")
+        updates = data["data"].get("Updates")
+        if updates:
+            orderbook.process_update(updates)
+            correlator.on_l4_update(orderbook, updates)
+
+    router = MessageRouter()
+    router.subscribe("trades", correlator.handle_trades, coin=COIN)
+    router.subscribe("l4Book", handle_l4, coin=COIN)
+    router.ignore("subscriptionResponse")
+
+    print(f"Connecting to {ws_url}...")
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    websocket = await websockets.connect(ws_url, max_size=10 * 1024 * 1024)
+    print("Connected!\n")
+
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "l4Book", "coin": COIN}}))
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "trades", "coin": COIN}}))
+    print(f"🔗 Attributing {COIN} trades to L4 orders, report every {REPORT_INTERVAL}s...\n")
+
+    next_report = time.monotonic() + REPORT_INTERVAL
+    try:
+        async for message in websocket:
+            router.dispatch_raw(message)
+            if time.monotonic() >= next_report:
+                correlator.display_report()
+                next_report = time.monotonic() + REPORT_INTERVAL
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+        correlator.display_report()
+    finally:
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Frame Recorder
+Write every frame from the live feed to hourly JSONL files for offline replay
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the reconnecting client from example 05
+sys.path.insert(0, str(Path(__file__).parent.parent / "05_reconnection_handling"))
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+TRADE_COINS = ["BTC", "ETH", "SOL"]
+L2_COINS = ["BTC", "ETH"]
+L4_COINS = ["BTC"]
+OUTPUT_DIR = Path(__file__).parent / "recordings"
+COMPRESS = True  # gzip the hourly files (about 10x smaller)
+
+# Subscription acks are recognised in the raw text, so recorded frames are never decoded
+ACK_PATTERN = re.compile(r'"channel"\s*:\s*"subscriptionResponse"')
+
+
+class FrameRecorder(RobustWSClient):
+    """Reconnecting client that appends each frame, exactly as received, as one line"""
+
+    def __init__(self, ws_url, output_dir=OUTPUT_DIR, compress=COMPRESS):
+        # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+        super().__init__(ws_url, connect_kwargs={"max_size": 10 * 1024 * 1024})
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.file = None
+        self.file_hour = None
+        self.frames_written = 0
+
+    def _rotate(self, hour):
+        """Start a new file for each UTC hour, e.g. recordings/2025-01-31T14.jsonl.gz"""
+        if self.file:
+            self.file.close()
+        name = time.strftime("%Y-%m-%dT%H", time.gmtime(hour * 3600)) + ".jsonl"
+        path = self.output_dir / (name + ".gz" if self.compress else name)
+        self.file = gzip.open(path, "at") if self.compress else open(path, "a")
+        self.file_hour = hour
+        print(f"📝 Recording to {path}")
+
+    def process_message(self, message):
+        """Write the raw frame text; subscription acks are skipped"""
+        if isinstance(message, bytes):
+            message = message.decode()
+        if ACK_PATTERN.search(message):
+            return
+        if "\n" in message:
+            # One frame per line: only a frame with raw newlines is re-serialized
+            message = json.dumps(json.loads(message), separators=(",", ":"))
+        hour = int(time.time() // 3600)
+        if hour != self.file_hour:
+            self._rotate(hour)
+        self.file.write(message + "\n")
+        self.frames_written += 1
+
+    async def stop(self):
+        await super().stop()
+        if self.file:
+            self.file.close()
+            self.file = None
+        print(f"💾 {self.frames_written:,} frames written")
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    recorder = FrameRecorder(ws_url)
+    for coin in TRADE_COINS:
+        recorder.add_subscription("trades", coin)
+    for coin in L2_COINS:
+        recorder.add_subscription("l2Book", coin, nLevels=20, nSigFigs=5)
+    for coin in L4_COINS:
+        recorder.add_subscription("l4Book", coin)
+
+    print("🎙️  Recording frames, press Ctrl+C to stop\n")
+    try:
+        await recorder.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        await recorder.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
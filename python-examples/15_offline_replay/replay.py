@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Offline Replay Driver
+Feed recorded frames through the example handlers at full speed, with no sockets
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Reuse the handlers from examples 04, 06, 07 and the router from example 09
+EXAMPLES = Path(__file__).parent.parent
+for example in ("04_multi_coin_tracker", "06_data_analysis", "07_l4_orderbook", "09_message_router"):
+    sys.path.insert(0, str(EXAMPLES / example))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from market_metrics import MarketAnalyzer  # noqa: E402
+from message_router import COIN_EXTRACTORS, MessageRouter  # noqa: E402
+from multi_coin_tracker import MultiCoinTracker, format_summary  # noqa: E402
+
+# Demo configuration
+RECORDINGS_DIR = Path(__file__).parent / "recordings"
+
+
+def iter_frames(path):
+    """Yield raw frames (one JSON document per line) from a .jsonl or .jsonl.gz file"""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+class ReplayPipeline:
+    """The same handler classes the live examples use, wired to a router"""
+
+    def __init__(self, coins=None):
+        self.tracker = MultiCoinTracker(display_interval=0)
+        self.analyzers = {}  # coin -> MarketAnalyzer
+        self.books = {}  # coin -> L4OrderBook
+        self.counts = {}  # channel -> frames handled
+
+        self.router = MessageRouter()
+        self.router.ignore("subscriptionResponse")
+        for coin in coins or [None]:  # None subscribes to every coin
+            self.router.subscribe("trades", self.tracker.handle_trade, coin=coin)
+            self.router.subscribe("trades", self.handle_trades, coin=coin)
+            self.router.subscribe("l2Book", self.handle_l2_book, coin=coin)
+            self.router.subscribe("l4Book", self.handle_l4_book, coin=coin)
+
+    def _count(self, channel):
+        self.counts[channel] = self.counts.get(channel, 0) + 1
+
+    def _analyzer(self, coin):
+        analyzer = self.analyzers.get(coin)
+        if analyzer is None:
+            analyzer = self.analyzers[coin] = MarketAnalyzer(history_size=100)
+        return analyzer
+
+    def handle_trades(self, data):
+        self._count("trades")
+        for trade in data["data"]:
+            self._analyzer(trade["coin"]).add_trade(trade["px"], trade["sz"], trade["side"])
+
+    def handle_l2_book(self, data):
+        self._count("l2Book")
+        book = data["data"]
+        bids, asks = book["levels"]
+        if bids and asks:
+            self._analyzer(book["coin"]).add_spread(float(asks[0]["px"]) - float(bids[0]["px"]))
+
+    def handle_l4_book(self, data):
+        self._count("l4Book")
+        coin = COIN_EXTRACTORS["l4Book"](data["data"])
+        snapshot = data["data"].get("Snapshot")
+        if snapshot:
+            book = self.books.get(coin)
+            if book is None:
+                book = self.books[coin] = L4OrderBook()
+            book.process_snapshot(snapshot)
+        updates = data["data"].get("Updates")
+        if updates:
+            # Updates recorded before the first snapshot have no book to apply to
+            book = self.books.get(coin)
+            if book is not None:
+                book.process_update(updates)
+
+    def summary(self):
+        """Plain, picklable results so worker processes can send them back"""
+        return {
+            "counts": dict(self.counts),
+            "tracker": self.tracker.snapshot(),
+            "analyzers": {coin: analyzer.snapshot() for coin, analyzer in self.analyzers.items()},
+            "books": {coin: len(book.orders) for coin, book in self.books.items()},
+        }
+
+
+def replay(path, coins=None, mode="stream"):
+    """Replay one file and return its summary with timings.
+
+    mode "stream" reads, decodes and handles frame by frame. "preload" reads the
+    file first, so only decoding and handling are timed. "decoded" also decodes
+    first, so only the handlers are timed.
+    """
+    pipeline = ReplayPipeline(coins)
+    load_start = time.perf_counter()
+    if mode == "stream":
+        frames = iter_frames(path)
+    elif mode == "preload":
+        frames = list(iter_frames(path))
+    else:
+        frames = [json.loads(line) for line in iter_frames(path)]
+    load_seconds = time.perf_counter() - load_start
+
+    n_frames = 0
+    start = time.perf_counter()
+    if mode == "decoded":
+        for data in frames:
+            pipeline.router.dispatch(data)
+            n_frames += 1
+    else:
+        for message in frames:
+            pipeline.router.dispatch_raw(message)
+            n_frames += 1
+    seconds = time.perf_counter() - start
+
+    result = pipeline.summary()
+    result.update(path=str(path), coins=coins, frames=n_frames, seconds=seconds, load_seconds=load_seconds)
+    return result
+
+
+def _replay_job(job):
+    path, coins, mode = job
+    return replay(path, coins, mode)
+
+
+def replay_parallel(paths, coin_groups=None, mode="stream", workers=None):
+    """Replay every (file, coin group) pair in its own process; yields results in job order.
+
+    Splitting by coin lets several processes share one big file: frames for
+    other coins are skipped by the router without being decoded.
+    """
+    jobs = [(path, coins, mode) for path in paths for coins in (coin_groups or [None])]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_replay_job, jobs)
+
+
+def display_result(result):
+    """Print one replay's throughput and final handler state"""
+    rate = result["frames"] / result["seconds"] if result["seconds"] else 0
+    coins = ",".join(result["coins"]) if result["coins"] else "all coins"
+    counts = " ".join(f"{channel}={count:,}" for channel, count in sorted(result["counts"].items()))
+    print(f"▶️  {Path(result['path']).name} [{coins}]: {result['frames']:,} frames in {result['seconds']:.2f}s "
+          f"({rate:,.0f} frames/s) | {counts}")
+    for coin, stats in sorted(result["analyzers"].items()):
+        print(f"   📊 {coin}: VWAP ${stats['vwap']:,.2f} | Volume {stats['total_volume']:,.2f} | "
+              f"Avg spread ${stats['avg_spread']:,.4f}")
+    for coin, orders in result["books"].items():
+        print(f"   📖 {coin} L4 book: {orders:,} resting orders")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded frames through the example handlers")
+    parser.add_argument("paths", nargs="*", help=f"Recorded .jsonl / .jsonl.gz files (default: all in {RECORDINGS_DIR.name}/)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to spread files / coin groups over")
+    parser.add_argument("--coins", help="Only replay these coins, e.g. BTC,ETH")
+    parser.add_argument("--split-coins", action="store_true", help="Give each coin its own process")
+    parser.add_argument("--mode", choices=("stream", "preload", "decoded"), default="stream",
+                        help="What to exclude from the timing: nothing, file reading, or reading and JSON decoding")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or sorted(RECORDINGS_DIR.glob("*.jsonl*"))
+    if not paths:
+        print(f"Error: no recordings given and none found in {RECORDINGS_DIR}")
+        print("💡 Run recorder.py first to capture some frames")
+        return
+
+    coins = args.coins.split(",") if args.coins else None
+    coin_groups = [[coin] for coin in coins] if coins and args.split_coins else [coins]
+
+    print(f"⏩ Replaying {len(paths)} file(s), mode={args.mode}, workers={args.workers}\n")
+    start = time.perf_counter()
+    total_frames = 0
+    finished = []
+    if args.workers > 1:
+        results = replay_parallel(paths, coin_groups, args.mode, args.workers)
+    else:
+        results = (replay(path, group, args.mode) for path in paths for group in coin_groups)
+    for result in results:
+        display_result(result)
+        total_frames += result["frames"]
+        finished.append(result)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ {total_frames:,} frames in {elapsed:.2f}s wall clock ({total_frames / elapsed:,.0f} frames/s overall)")
+    if len(finished) == 1 and finished[0]["tracker"]["rows"]:
+        print(format_summary(finished[0]["tracker"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Parquet Export Example
+Buffer trades and periodic book snapshots in columns and write Parquet files partitioned by coin and hour
+"""
+
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import websockets
+from dotenv import load_dotenv
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, see requirements.txt
+    pa = pq = None
+
+# Reuse the L4 book from example 07 and the router from example 09
+sys.path.insert(0, str(Path(__file__).parent.parent / "07_l4_orderbook"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "09_message_router"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from message_router import MessageRouter  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+TRADE_COINS = ["BTC", "ETH", "SOL"]
+L2_COINS = ["BTC", "ETH"]
+L4_COIN = "BTC"
+OUTPUT_DIR = Path(__file__).parent / "exports"
+BATCH_ROWS = 50_000  # Hand a partition's buffer to the writer once it holds this many rows
+FLUSH_INTERVAL = 30  # ...or at least this often (seconds)
+L2_SNAPSHOT_INTERVAL = 1  # Seconds between stored L2 snapshots per coin
+L4_SNAPSHOT_INTERVAL = 60  # Seconds between stored L4 snapshots
+COMPRESSION = "zstd"
+
+# Column name -> Arrow type. Prices and sizes stay strings in the buffers and
+# are cast to float64 by Arrow in the writer thread, in one vectorized pass.
+TRADE_COLUMNS = {
+    "time": "timestamp", "coin": "string", "side": "string", "px": "float64", "sz": "float64",
+    "tid": "int64", "hash": "string", "buyer": "string", "seller": "string",
+}
+L2_COLUMNS = {
+    "time": "timestamp", "coin": "string", "side": "string", "level": "int16",
+    "px": "float64", "sz": "float64", "n": "int32",
+}
+L4_COLUMNS = {
+    "time": "timestamp", "coin": "string", "height": "int64", "side": "string", "queue_pos": "int32",
+    "px": "float64", "sz": "float64", "oid": "int64", "user": "string",
+}
+
+
+def arrow_schema(columns):
+    types = {
+        "timestamp": pa.timestamp("ms", tz="UTC"), "string": pa.string(), "float64": pa.float64(),
+        "int64": pa.int64(), "int32": pa.int32(), "int16": pa.int16(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+
+HOUR_MS = 3_600_000
+
+
+def l4_columns(time_ms, snapshot):
+    """L4_COLUMNS lists for every resting order of a BookSnapshot, in queue order"""
+    columns = {name: [] for name in L4_COLUMNS}
+    height = snapshot.height if isinstance(snapshot.height, int) else None
+    px, sz, side, position, oid, user = (columns[name] for name in ("px", "sz", "side", "queue_pos", "oid", "user"))
+    for name, levels in (("bid", snapshot.bids), ("ask", snapshot.asks)):
+        for level in levels:
+            for i, (order_id, size, owner) in enumerate(level.orders):
+                px.append(level.px)
+                sz.append(size)
+                side.append(name)
+                position.append(i)
+                oid.append(order_id)
+                user.append(owner)
+    rows = len(oid)
+    columns["time"] = [time_ms] * rows
+    columns["coin"] = [snapshot.coin] * rows
+    columns["height"] = [height] * rows
+    return columns
+
+
+def hour_label(hour):
+    """Partition value for an hour number (ms // HOUR_MS), e.g. 2025-01-31T14"""
+    return time.strftime("%Y-%m-%dT%H", time.gmtime(hour * 3600))
+
+
+class ColumnBuffer:
+    """Rows for one (kind, coin, hour) partition, kept as one Python list per column"""
+
+    __slots__ = ("columns", "appenders", "rows", "started")
+
+    def __init__(self, names):
+        self.columns = {name: [] for name in names}
+        self.appenders = [column.append for column in self.columns.values()]
+        self.rows = 0
+        self.started = time.monotonic()
+
+    def append(self, values):
+        for append, value in zip(self.appenders, values):
+            append(value)
+        self.rows += 1
+
+
+class ParquetExporter:
+    """Columnar buffers on the receive loop, Arrow conversion and Parquet writes on a thread.
+
+    The receive loop only appends the raw values from each frame to Python
+    lists. Full buffers are swapped out and queued; the writer thread turns them
+    into Arrow record batches and appends them as row groups to one Parquet file
+    per partition: <root>/<kind>/coin=<coin>/hour=<hour>/part-<run>-<n>.parquet
+    L4 snapshots are queued as immutable BookSnapshots and expanded to rows on
+    the writer thread. A batch that fails to write is logged and counted, and
+    the thread carries on with the next one.
+    """
+
+    def __init__(self, root=OUTPUT_DIR, batch_rows=BATCH_ROWS, flush_interval=FLUSH_INTERVAL,
+                 compression=COMPRESSION):
+        self.root = Path(root)
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.run_id = time.strftime("%Y%m%dT%H%M%S")
+        self.columns = {"trades": TRADE_COLUMNS, "l2": L2_COLUMNS, "l4": L4_COLUMNS}
+        self.schemas = {kind: arrow_schema(columns) for kind, columns in self.columns.items()}
+        self.buffers = {}  # (kind, coin, hour) -> ColumnBuffer
+        self.last_snapshot = {}  # (kind, coin) -> monotonic time of the last stored snapshot
+
+        self.queue = queue.Queue()
+        self.writers = {}  # (kind, coin, hour) -> pq.ParquetWriter, only touched by the writer thread
+        self.parts = {}  # (kind, coin, hour) -> files opened so far (late rows after a close start a new file)
+        self.rows_buffered = 0
+        self.rows_written = 0
+        self.batches_written = 0
+        self.batches_failed = 0
+        self.rows_failed = 0
+        self.write_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name="parquet-writer", daemon=True)
+        self.thread.start()
+
+    # --- Receive loop side --------------------------------------------------
+
+    def _buffer(self, kind, coin, hour):
+        key = (kind, coin, hour)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = ColumnBuffer(self.columns[kind])
+        return buffer
+
+    def _check_full(self, key, buffer):
+        if buffer.rows >= self.batch_rows:
+            self._hand_off(key)
+
+    def handle_trades(self, data):
+        """Handler for trades frames"""
+        for trade in data["data"]:
+            key = ("trades", trade["coin"], trade["time"] // HOUR_MS)
+            buffer = self._buffer(*key)
+            users = trade.get("users") or (None, None)
+            buffer.append((trade["time"], trade["coin"], trade["side"], trade["px"], trade["sz"],
+                           trade.get("tid"), trade.get("hash"), users[0], users[1]))
+            self.rows_buffered += 1
+            self._check_full(key, buffer)
+
+    def _due(self, kind, coin, interval):
+        """Rate-limit snapshots per coin"""
+        now = time.monotonic()
+        if now - self.last_snapshot.get((kind, coin), -interval) < interval:
+            return False
+        self.last_snapshot[(kind, coin)] = now
+        return True
+
+    def handle_l2_book(self, data, interval=L2_SNAPSHOT_INTERVAL):
+        """Handler for l2Book frames: stores at most one snapshot per coin per interval"""
+        book = data["data"]
+        coin = book["coin"]
+        if not self._due("l2", coin, interval):
+            return
+        time_ms = book.get("time") or int(time.time() * 1000)
+        key = ("l2", coin, time_ms // HOUR_MS)
+        buffer = self._buffer(*key)
+        for side, levels in zip(("bid", "ask"), book["levels"]):
+            for i, level in enumerate(levels):
+                buffer.append((time_ms, coin, side, i, level["px"], level["sz"], level["n"]))
+        self.rows_buffered += len(book["levels"][0]) + len(book["levels"][1])
+        self._check_full(key, buffer)
+
+    def add_l4_snapshot(self, orderbook, interval=L4_SNAPSHOT_INTERVAL):
+        """Store every resting order of an L4OrderBook (at most once per interval)"""
+        if not orderbook.coin or not self._due("l4", orderbook.coin, interval):
+            return
+        time_ms = int(time.time() * 1000)
+        # Immutable, and levels unchanged since the last snapshot are reused, so only the
+        # levels that changed are copied here; the writer thread expands it into rows
+        snapshot = orderbook.snapshot(max(len(orderbook.bid_ladder), len(orderbook.ask_ladder)))
+        self.rows_buffered += sum(level.n for level in snapshot.bids) + sum(level.n for level in snapshot.asks)
+        self.queue.put(("l4_snapshot", ("l4", orderbook.coin, time_ms // HOUR_MS), time_ms, snapshot))
+
+    def _hand_off(self, key):
+        """Swap the partition's buffer for a fresh one and queue the full one for writing"""
+        buffer = self.buffers.pop(key)
+        self.queue.put((key, buffer.columns))
+
+    def tick(self):
+        """Call regularly from the receive loop: hands off old buffers and closes finished hours"""
+        now = time.monotonic()
+        current_hour = int(time.time() * 1000) // HOUR_MS
+        for key, buffer in list(self.buffers.items()):
+            if now - buffer.started >= self.flush_interval or key[2] < current_hour:
+                self._hand_off(key)
+        self.queue.put(("close_before", current_hour))
+
+    def close(self):
+        """Write everything still buffered and finish all files"""
+        for key in list(self.buffers):
+            self._hand_off(key)
+        self.queue.put(None)
+        self.thread.join()
+
+    # --- Writer thread ------------------------------------------------------
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if item[0] == "close_before":
+                self._close_writers(lambda key: key[2] < item[1])
+                continue
+            if item[0] == "l4_snapshot":
+                _, key, time_ms, snapshot = item
+                columns = l4_columns(time_ms, snapshot)
+            else:
+                key, columns = item
+            start = time.perf_counter()
+            try:
+                self._write(key, columns)
+            except Exception as e:
+                # Keep the thread alive for later batches; a half-written file is not appended to again
+                self.batches_failed += 1
+                self.rows_failed += len(next(iter(columns.values())))
+                print(f"⚠️  Parquet write for {key[0]}/{key[1]} failed, {self.batches_failed} batches lost so far: {e}")
+                self._close_writers(lambda other: other == key)
+            self.write_seconds += time.perf_counter() - start
+        self._close_writers(lambda key: True)
+
+    def _write(self, key, columns):
+        kind = key[0]
+        schema = self.schemas[kind]
+        arrays = []
+        for field in schema:
+            values = columns[field.name]
+            if pa.types.is_floating(field.type):
+                # Decimal strings from the feed: let Arrow parse them all at once
+                arrays.append(pa.array(values, pa.string()).cast(field.type))
+            else:
+                arrays.append(pa.array(values, field.type))
+        batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+        writer = self.writers.get(key)
+        if writer is None:
+            kind, coin, hour = key
+            directory = self.root / kind / f"coin={coin}" / f"hour={hour_label(hour)}"
+            directory.mkdir(parents=True, exist_ok=True)
+            part = self.parts[key] = self.parts.get(key, -1) + 1
+            writer = self.writers[key] = pq.ParquetWriter(
+                directory / f"part-{self.run_id}-{part}.parquet", schema, compression=self.compression
+            )
+        writer.write_batch(batch)
+        self.rows_written += batch.num_rows
+        self.batches_written += 1
+
+    def _close_writers(self, should_close):
+        for key in [key for key in self.writers if should_close(key)]:
+            try:
+                self.writers.pop(key).close()
+            except Exception as e:
+                print(f"⚠️  Closing the Parquet file for {key[0]}/{key[1]} failed: {e}")
+
+    def display_stats(self):
+        """Print export progress"""
+        rate = self.rows_written / self.write_seconds if self.write_seconds else 0
+        print(f"💾 Buffered {self.rows_buffered:,} rows | Written {self.rows_written:,} rows in "
+              f"{self.batches_written:,} batches ({rate:,.0f} rows/s on the writer thread) | "
+              f"Queue: {self.queue.qsize()} | Open files: {len(self.writers)}"
+              + (f" | ⚠️  {self.rows_failed:,} rows in {self.batches_failed:,} failed batches" if self.batches_failed else ""))
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    if pa is None:
+        print("Error: pyarrow is not installed (pip install pyarrow)")
+        return
+
+    exporter = ParquetExporter()
+    orderbook = L4OrderBook()
+
+    def handle_l4(data):
+        snapshot = data["data"].get("Snapshot")
+        if snapshot:
+            orderbook.process_snapshot(snapshot)
+        updates = data["data"].get("Updates")
+        if updates:
+            orderbook.process_update(updates)
+        exporter.add_l4_snapshot(orderbook)
+
+    router = MessageRouter()
+    router.subscribe("trades", exporter.handle_trades)
+    router.subscribe("l2Book", exporter.handle_l2_book)
+    router.subscribe("l4Book", handle_l4)
+    router.ignore("subscriptionResponse")
+
+    print(f"Connecting to {ws_url}...")
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    websocket = await websockets.connect(ws_url, max_size=10 * 1024 * 1024)
+    print("Connected!\n")
+
+    for coin in TRADE_COINS:
+        await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "trades", "coin": coin}}))
+    for coin in L2_COINS:
+        await websocket.send(json.dumps({
+            "method": "subscribe",
+            "subscription": {"type": "l2Book", "coin": coin, "nLevels": 20, "nSigFigs": 5}
+        }))
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "l4Book", "coin": L4_COIN}}))
+    print(f"💾 Exporting to {exporter.root}/, press Ctrl+C to stop\n")
+
+    next_tick = time.monotonic() + 1
+    next_stats = time.monotonic() + 10
+    try:
+        async for message in websocket:
+            router.dispatch_raw(message)
+            now = time.monotonic()
+            if now >= next_tick:
+                exporter.tick()
+                next_tick = now + 1
+            if now >= next_stats:
+                exporter.display_stats()
+                next_stats = now + 10
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        await websocket.close()
+        exporter.close()
+        exporter.display_stats()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Profiler Overhead Benchmark
+Cost of RobustWSClient.process_message with profiling off, sampled, on every message and with stacks
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from profiler import LoopProfiler
+
+EXAMPLES = Path(__file__).parent.parent
+for path in ("benchmarks", "05_reconnection_handling", "04_multi_coin_tracker", "07_l4_orderbook"):
+    sys.path.insert(0, str(EXAMPLES / path))
+import fixtures  # noqa: E402
+from l4_orderbook import L4OrderBook  # noqa: E402
+from multi_coin_tracker import MultiCoinTracker  # noqa: E402
+from robust_client import RobustWSClient  # noqa: E402
+
+REPEATS = 5
+
+
+class Pipeline(RobustWSClient):
+    """Same handlers as profiled_client.py, without the connection"""
+
+    def __init__(self, profiler):
+        super().__init__("ws://unused", profiler=profiler)
+        self.tracker = MultiCoinTracker(display_interval=0)
+        self.book = L4OrderBook()
+        self.handlers["trades"] = self.tracker.handle_trade
+        self.handlers["l2Book"] = lambda data: None
+        self.handlers["l4Book"] = self.handle_l4_book
+
+    def handle_l4_book(self, data):
+        payload = data["data"]
+        if "Snapshot" in payload:
+            self.book.process_snapshot(payload["Snapshot"])
+        else:
+            self.book.process_update(payload["Updates"])
+
+
+def run(frames, make_profiler):
+    """Best ns per frame over REPEATS fresh pipelines"""
+    best = None
+    profiler = None
+    for _ in range(REPEATS):
+        profiler = make_profiler()
+        client = Pipeline(profiler)
+        start = time.perf_counter_ns()
+        for message in frames:
+            client.process_message(message)
+        elapsed = (time.perf_counter_ns() - start) / len(frames)
+        if profiler:
+            profiler.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, profiler
+
+
+def main():
+    frames = fixtures.synthetic().all_frames()
+    output_dir = tempfile.mkdtemp()
+    print(f"⏱️  {len(frames):,} synthetic frames (trades, l2Book, l4Book), best of {REPEATS}\n")
+
+    configs = [
+        ("no profiler", lambda: None),
+        ("disabled", lambda: LoopProfiler(enabled=False, output_dir=output_dir)),
+        ("1 in 100, no stacks", lambda: LoopProfiler(sample_every=100, stacks=False, output_dir=output_dir)),
+        ("1 in 100 + stacks", lambda: LoopProfiler(sample_every=100, output_dir=output_dir)),
+        ("every message, no stacks", lambda: LoopProfiler(sample_every=1, stacks=False, output_dir=output_dir)),
+        ("every message + stacks", lambda: LoopProfiler(sample_every=1, output_dir=output_dir)),
+    ]
+
+    print(f"{'Configuration':<28} {'µs/frame':>10} {'Overhead':>10}")
+    print("-" * 50)
+    run(frames, lambda: None)  # Warm up caches and the allocator before the first timed configuration
+    baseline = None
+    last = None
+    for name, make_profiler in configs:
+        ns, profiler = run(frames, make_profiler)
+        baseline = baseline or ns
+        print(f"{name:<28} {ns / 1e3:>10.2f} {ns / baseline - 1:>+10.1%}")
+        last = profiler or last
+
+    print()
+    print(last.report(limit=8))
+    print(f"\n🔥 {last.sampler.samples} stack samples, hottest:")
+    for line in last.sampler.folded()[:3]:
+        stack, count = line.rsplit(" ", 1)
+        print(f"   {count:>5}  {' ; '.join(stack.split(';')[-3:])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Profiled Client
+Run the reconnecting client with per-stage timing; dump a flamegraph profile with kill -USR1
+"""
+
+import asyncio
+import os
+import sys
+from dotenv import load_dotenv
+from pathlib import Path
+
+from profiler import LoopProfiler
+
+# Reuse the reconnecting client, the tracker, the L4 book and the router's coin lookup from examples 05, 04, 07 and 09
+EXAMPLES = Path(__file__).parent.parent
+for example in ("05_reconnection_handling", "04_multi_coin_tracker", "07_l4_orderbook", "09_message_router"):
+    sys.path.insert(0, str(EXAMPLES / example))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from message_router import frame_coin  # noqa: E402
+from multi_coin_tracker import MultiCoinTracker, format_summary  # noqa: E402
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+TRADE_COINS = ["BTC", "ETH", "SOL"]
+L4_COINS = ["BTC"]
+SAMPLE_EVERY = 100      # Time 1 message in 100
+RENDER_INTERVAL = 2     # Seconds between dashboard renders
+REPORT_INTERVAL = 30    # Seconds between stage reports (0 = only on SIGUSR1)
+
+
+class ProfiledClient(RobustWSClient):
+    """Trades dashboard plus an L4 book, with the client loop profiled"""
+
+    def __init__(self, ws_url, profiler):
+        # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+        super().__init__(ws_url, profiler=profiler, connect_kwargs={"max_size": 10 * 1024 * 1024})
+        self.tracker = MultiCoinTracker(display_interval=0)
+        self.books = {}  # coin -> L4OrderBook
+        self.handlers["trades"] = self.tracker.handle_trade
+        self.handlers["l4Book"] = self.handle_l4_book
+
+    def handle_l4_book(self, data):
+        payload = data["data"]
+        snapshot = payload.get("Snapshot")
+        if snapshot:
+            book = self.books.setdefault(snapshot["coin"], L4OrderBook())
+            book.process_snapshot(snapshot)
+            return
+        updates = payload.get("Updates")
+        if updates:
+            book = self.books.get(frame_coin(data))
+            if book is not None:
+                book.process_update(updates)
+
+    def render(self):
+        with self.profiler.stage("render"):
+            print(format_summary(self.tracker.snapshot()))
+            for coin, book in self.books.items():
+                bids, asks = book.get_sorted_levels(max_orders=5)
+                if bids and asks:
+                    print(f"📖 {coin} L4: best bid ${bids[0]['limitPx']} | best ask ${asks[0]['limitPx']} | "
+                          f"{len(book.orders):,} orders")
+
+
+async def render_loop(client):
+    while True:
+        await asyncio.sleep(RENDER_INTERVAL)
+        client.render()
+
+
+async def report_loop(profiler):
+    while True:
+        await asyncio.sleep(REPORT_INTERVAL)
+        print(profiler.report())
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    profiler = LoopProfiler(sample_every=SAMPLE_EVERY)
+    client = ProfiledClient(ws_url, profiler)
+    for coin in TRADE_COINS:
+        client.add_subscription("trades", coin)
+    for coin in L4_COINS:
+        client.add_subscription("l4Book", coin)
+
+    if profiler.install_signal_handlers(asyncio.get_running_loop()):
+        print(f"🔬 Profiling 1 in {SAMPLE_EVERY} messages (PID {os.getpid()})")
+        print(f"💡 kill -USR1 {os.getpid()}  -> write profiles/*.folded and print the stage report")
+        print(f"💡 kill -USR2 {os.getpid()}  -> turn profiling off / on\n")
+
+    tasks = [asyncio.create_task(render_loop(client))]
+    if REPORT_INTERVAL:
+        tasks.append(asyncio.create_task(report_loop(profiler)))
+    try:
+        await client.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await client.stop()
+        profiler.close()
+        print(profiler.report())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,266 @@
+"""
+Loop Profiler
+Sampled per-stage wall/CPU timing for RobustWSClient, plus a stack sampler that
+writes flamegraph-compatible (folded) profiles on a signal
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+SAMPLE_EVERY = 100        # Time one message in this many; the rest only pay a counter decrement
+STACK_INTERVAL = 0.005    # Seconds between stack samples (200 Hz)
+MAX_STACK_DEPTH = 64
+PROFILE_DIR = Path(__file__).parent / "profiles"
+
+
+class StageStats:
+    """Totals for one stage key"""
+
+    __slots__ = ("count", "wall_ns", "cpu_ns", "max_wall_ns")
+
+    def __init__(self):
+        self.count = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.max_wall_ns = 0
+
+
+def stage_name(key):
+    """('handler', 'trades', 'BTC') -> 'handler trades/BTC'"""
+    if len(key) == 1:
+        return key[0]
+    return f"{key[0]} " + "/".join(str(part) for part in key[1:] if part is not None)
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread.
+
+    Stacks are counted in Brendan Gregg's folded format ("outer;inner;leaf count"),
+    which flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, thread_id=None, interval=STACK_INTERVAL):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None and len(names) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def folded(self):
+        """Folded stack lines, most frequent first"""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+    def clear(self):
+        self.stacks.clear()
+        self.samples = 0
+
+
+class LoopProfiler:
+    """Per-stage timing for the client loop.
+
+    RobustWSClient.process_message asks tick() for every message; one in
+    `sample_every` is timed stage by stage (receive gap, decode, handler per
+    channel/coin) and the totals are scaled back up in the report. stage() times
+    code outside the message path (e.g. rendering) on every call.
+    """
+
+    def __init__(self, sample_every=SAMPLE_EVERY, stack_interval=STACK_INTERVAL, output_dir=PROFILE_DIR,
+                 enabled=True, stacks=True):
+        self.sample_every = sample_every
+        self.output_dir = Path(output_dir)
+        self.enabled = enabled
+        self.sampler = StackSampler(interval=stack_interval) if stacks else None
+
+        self.sampled = {}   # key -> StageStats, recorded on sampled messages
+        self.exact = {}     # name -> StageStats, recorded by stage() on every call
+        self.messages = 0
+        self._countdown = sample_every
+        self._mark = None   # (wall_ns, cpu_ns) at the end of the message before a sampled one
+        self._started_wall = time.perf_counter_ns()
+        self._started_cpu = time.thread_time_ns()
+
+        if enabled and self.sampler:
+            self.sampler.start()
+
+    # --- Hot path ---------------------------------------------------------------
+
+    def tick(self):
+        """Count a message; True if this one should be timed"""
+        self.messages += 1
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.sample_every
+        return True
+
+    def next_is_sampled(self):
+        return self._countdown == 1
+
+    def mark_end(self, wall_ns=None, cpu_ns=None):
+        """Remember when the previous message finished, so the receive gap can be timed"""
+        if wall_ns is None:
+            wall_ns, cpu_ns = time.perf_counter_ns(), time.thread_time_ns()
+        self._mark = (wall_ns, cpu_ns)
+
+    def record_receive(self, wall_ns, cpu_ns):
+        """Time between the previous message finishing and this one arriving"""
+        if self._mark is not None:
+            self.record(("receive",), wall_ns - self._mark[0], cpu_ns - self._mark[1])
+            self._mark = None
+
+    def record(self, key, wall_ns, cpu_ns):
+        stats = self.sampled.get(key)
+        if stats is None:
+            stats = self.sampled[key] = StageStats()
+        stats.count += 1
+        stats.wall_ns += wall_ns
+        stats.cpu_ns += cpu_ns
+        if wall_ns > stats.max_wall_ns:
+            stats.max_wall_ns = wall_ns
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block on every call, e.g. `with profiler.stage("render"):`"""
+        if not self.enabled:
+            yield
+            return
+        wall, cpu = time.perf_counter_ns(), time.thread_time_ns()
+        try:
+            yield
+        finally:
+            wall_ns = time.perf_counter_ns() - wall
+            stats = self.exact.get(name)
+            if stats is None:
+                stats = self.exact[name] = StageStats()
+            stats.count += 1
+            stats.wall_ns += wall_ns
+            stats.cpu_ns += time.thread_time_ns() - cpu
+            if wall_ns > stats.max_wall_ns:
+                stats.max_wall_ns = wall_ns
+
+    # --- Control ----------------------------------------------------------------
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._mark = None
+        if self.sampler:
+            if enabled:
+                self.sampler.start()
+            else:
+                self.sampler.stop()
+
+    def reset(self):
+        self.sampled.clear()
+        self.exact.clear()
+        self.messages = 0
+        self._countdown = self.sample_every
+        self._mark = None
+        self._started_wall = time.perf_counter_ns()
+        self._started_cpu = time.thread_time_ns()
+        if self.sampler:
+            self.sampler.clear()
+
+    def close(self):
+        if self.sampler:
+            self.sampler.stop()
+
+    # --- Output -----------------------------------------------------------------
+
+    def rows(self):
+        """(name, estimated calls, wall_ns, cpu_ns, max_wall_ns) per stage, largest wall time first"""
+        rows = []
+        for key, stats in self.sampled.items():
+            rows.append((stage_name(key), stats.count * self.sample_every, stats.wall_ns * self.sample_every,
+                         stats.cpu_ns * self.sample_every, stats.max_wall_ns))
+        for name, stats in self.exact.items():
+            rows.append((name, stats.count, stats.wall_ns, stats.cpu_ns, stats.max_wall_ns))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def report(self, limit=None):
+        """Stage table as text; sampled stages are estimates (count x sample_every)"""
+        elapsed_ns = max(time.perf_counter_ns() - self._started_wall, 1)
+        cpu_ns = time.thread_time_ns() - self._started_cpu
+        lines = [
+            f"⏱️  {self.messages:,} messages in {elapsed_ns / 1e9:.1f}s, sampling 1 in {self.sample_every}, "
+            f"loop thread CPU {cpu_ns / elapsed_ns:.0%}",
+            f"{'Stage':<32} {'Calls':>10} {'Wall ms':>10} {'CPU ms':>10} {'Avg µs':>9} {'Max µs':>9} {'% wall':>7}",
+            "-" * 93,
+        ]
+        for name, calls, wall_ns, stage_cpu_ns, max_wall_ns in self.rows()[:limit]:
+            if calls == 0:
+                continue
+            lines.append(f"{name:<32} {calls:>10,} {wall_ns / 1e6:>10.1f} {stage_cpu_ns / 1e6:>10.1f} "
+                         f"{wall_ns / calls / 1e3:>9.1f} {max_wall_ns / 1e3:>9.1f} {wall_ns / elapsed_ns:>7.1%}")
+        lines.append("💡 'receive' is time spent waiting in the event loop between messages; "
+                     "wall far above CPU elsewhere means blocking I/O or GIL contention")
+        return "\n".join(lines)
+
+    def dump(self):
+        """Write the folded stacks and the stage report; returns the paths written"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}"
+        paths = []
+        if self.sampler and self.sampler.samples:
+            folded = base.with_suffix(".folded")
+            folded.write_text("\n".join(self.sampler.folded()) + "\n")
+            paths.append(folded)
+        report = base.with_suffix(".txt")
+        report.write_text(self.report() + "\n")
+        paths.append(report)
+        return paths
+
+    def install_signal_handlers(self, loop):
+        """SIGUSR1 dumps a profile, SIGUSR2 toggles profiling; no restart needed"""
+        if not hasattr(signal, "SIGUSR1"):
+            print("⚠️  Signals not available on this platform; call dump() yourself")
+            return False
+
+        def on_dump():
+            paths = self.dump()
+            print(f"📸 Profile written: {', '.join(str(path) for path in paths)}")
+            print(self.report())
+
+        def on_toggle():
+            self.set_enabled(not self.enabled)
+            print(f"🔬 Profiling {'enabled' if self.enabled else 'disabled'}")
+
+        loop.add_signal_handler(signal.SIGUSR1, on_dump)
+        loop.add_signal_handler(signal.SIGUSR2, on_toggle)
+        return True
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Transport Benchmark
+Throughput and client CPU for each event loop / compression / queue / buffer combination on L4 traffic
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import transport
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+import fixtures  # noqa: E402
+from replay_server import HOST, run_server  # noqa: E402
+
+PORT = 8798
+REPEATS = 3
+REPEAT_FRAMES = 3  # Send the L4 stream this many times per run
+
+LOOPS = ["asyncio", "uvloop"]
+COMPRESSION = [None, "deflate"]
+MAX_QUEUE = [16, 256]
+RECV_BUFFER = [None, 4 * transport.MB]
+
+
+async def consume(config):
+    """Receive and decode every frame; returns (frames, bytes, wall s, cpu s)"""
+    frames = received = 0
+    async with await config.connect(f"ws://{HOST}:{PORT}") as websocket:
+        wall, cpu = time.perf_counter(), time.process_time()
+        await websocket.send(json.dumps({"method": "replay"}))
+        async for message in websocket:
+            json.loads(message)
+            frames += 1
+            received += len(message)
+    return frames, received, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def measure(loop, config):
+    """Best of REPEATS runs by wall time"""
+    best = None
+    for _ in range(REPEATS):
+        result = transport.run(consume(config), use_uvloop=loop == "uvloop")
+        if best is None or result[2] < best[2]:
+            best = result
+    return best
+
+
+def l4_frames(recording):
+    data = fixtures.recorded(recording) if recording else fixtures.synthetic()
+    return data.raw["l4Book_snapshot"] + data.raw["l4Book_updates"], data.source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transport settings on L4 traffic")
+    parser.add_argument("--recording", help="Take L4 frames from a recording (default: synthetic)")
+    args = parser.parse_args()
+
+    frames, source = l4_frames(args.recording)
+    frames = frames * REPEAT_FRAMES
+    size = sum(len(frame) for frame in frames)
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_server, args=(frames, HOST, PORT, ready), daemon=True)
+    server.start()
+    if not ready.wait(30):
+        server.terminate()
+        raise RuntimeError("Replay server did not start")
+
+    loops = [loop for loop in LOOPS if loop == "asyncio" or transport.uvloop is not None]
+    if len(loops) < len(LOOPS):
+        print("💡 uvloop is not installed (pip install uvloop); only the asyncio loop is measured")
+    print(f"⏱️  {len(frames):,} L4 frames ({size / transport.MB:.1f} MB) from {source}, best of {REPEATS}\n")
+    print(f"{'Loop':<8} {'Deflate':<8} {'Queue':>6} {'Rcvbuf':>7} {'Frames/s':>10} {'MB/s':>8} "
+          f"{'CPU µs/frame':>13} {'CPU %':>6}")
+    print("-" * 72)
+
+    results = []
+    try:
+        for loop, compression, max_queue, recv_buffer in itertools.product(loops, COMPRESSION, MAX_QUEUE, RECV_BUFFER):
+            config = transport.TransportConfig(compression=compression, max_size=None, max_queue=max_queue,
+                                               recv_buffer=recv_buffer)
+            count, received, wall, cpu = measure(loop, config)
+            results.append((count / wall, loop, config))
+            rcvbuf = f"{recv_buffer // transport.MB}MB" if recv_buffer else "default"
+            print(f"{loop:<8} {'on' if compression else 'off':<8} {max_queue:>6} {rcvbuf:>7} {count / wall:>10,.0f} "
+                  f"{received / wall / transport.MB:>8.1f} {cpu / count * 1e6:>13.1f} {cpu / wall:>6.0%}")
+    finally:
+        server.terminate()
+        server.join()
+
+    rate, loop, config = max(results, key=lambda result: result[0])
+    print(f"\n🏆 Fastest: {loop}, {config.describe()} ({rate:,.0f} frames/s)")
+    print("💡 The server runs on the same machine; over a real network deflate trades client CPU for bandwidth")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Transport Configuration
+Event loop choice and per-subscription WebSocket settings for RobustWSClient
+"""
+
+import asyncio
+import socket
+import websockets
+from urllib.parse import urlparse
+
+try:
+    import uvloop
+except ImportError:  # Optional: the stock asyncio loop is used instead
+    uvloop = None
+
+MB = 1024 * 1024
+
+
+class TransportConfig:
+    """Settings for one connection: websockets.connect options plus the socket receive buffer.
+
+    compression:   "deflate" to offer permessage-deflate, None to turn it off
+    max_size:      Largest frame accepted, in bytes (None = unlimited)
+    max_queue:     Frames buffered before the library stops reading the socket
+    write_limit:   Outgoing bytes buffered before send() waits
+    ping_interval: Seconds between library keepalive pings (None = off)
+    ping_timeout:  Seconds to wait for the pong before closing
+    recv_buffer:   SO_RCVBUF in bytes, set before the TCP handshake (None = OS default)
+    """
+
+    def __init__(self, compression="deflate", max_size=MB, max_queue=16, write_limit=32 * 1024,
+                 ping_interval=20, ping_timeout=20, recv_buffer=None):
+        self.compression = compression
+        self.max_size = max_size
+        self.max_queue = max_queue
+        self.write_limit = write_limit
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.recv_buffer = recv_buffer
+
+    def connect_kwargs(self):
+        """Keyword arguments for websockets.connect"""
+        return {
+            "compression": self.compression,
+            "max_size": self.max_size,
+            "max_queue": self.max_queue,
+            "write_limit": self.write_limit,
+            "ping_interval": self.ping_interval,
+            "ping_timeout": self.ping_timeout,
+        }
+
+    async def open_socket(self, url):
+        """A TCP socket connected to url's host with the receive buffer already set, or None to let websockets connect.
+
+        SO_RCVBUF has to be set before connect(): the TCP window scale is agreed in the
+        handshake, so a buffer raised on an open connection can't be advertised in full.
+        """
+        if not self.recv_buffer:
+            return None
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == "wss" else 80)
+        loop = asyncio.get_running_loop()
+        error = OSError(f"No address found for {parsed.hostname}")
+        for family, sock_type, proto, _, address in await loop.getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM):
+            sock = socket.socket(family, sock_type, proto)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer)
+                sock.setblocking(False)
+                await loop.sock_connect(sock, address)
+                return sock
+            except OSError as e:
+                sock.close()
+                error = e
+        raise error
+
+    async def connect(self, url):
+        """websockets.connect with these settings; a preconnected socket carries the receive buffer"""
+        kwargs = self.connect_kwargs()
+        sock = await self.open_socket(url)
+        if sock is not None:
+            kwargs["sock"] = sock  # websockets still does TLS (server_hostname from url) on top of it
+        return await websockets.connect(url, **kwargs)
+
+    def replace(self, **changes):
+        """Copy with some settings changed"""
+        settings = dict(vars(self))
+        settings.update(changes)
+        return TransportConfig(**settings)
+
+    def describe(self):
+        max_size = f"{self.max_size / MB:g}MB" if self.max_size else "unlimited"
+        recv_buffer = f"{self.recv_buffer / MB:g}MB" if self.recv_buffer else "OS default"
+        return (f"compression={self.compression or 'off'} max_size={max_size} max_queue={self.max_queue} "
+                f"ping={self.ping_interval}s/{self.ping_timeout}s rcvbuf={recv_buffer}")
+
+
+# Per subscription type. Trades and L2 frames are small and compress well; L4 frames
+# are large and frequent, so decompressing them would cost the loop more CPU than it saves
+TRANSPORT_PROFILES = {
+    "trades": TransportConfig(compression="deflate", max_size=MB, max_queue=64),
+    "l2Book": TransportConfig(compression="deflate", max_size=MB, max_queue=64),
+    "l4Book": TransportConfig(compression=None, max_size=32 * MB, max_queue=256,
+                              ping_interval=20, ping_timeout=60, recv_buffer=4 * MB),
+}
+DEFAULT_PROFILE = TransportConfig()
+
+
+def for_subscriptions(sub_types):
+    """One config for a connection carrying several subscription types.
+
+    Limits take the largest value, pings the most patient setting, and
+    compression stays on only if every type wants it.
+    """
+    configs = [TRANSPORT_PROFILES.get(sub_type, DEFAULT_PROFILE) for sub_type in set(sub_types)]
+    if not configs:
+        return DEFAULT_PROFILE
+
+    def largest(values):
+        return None if None in values else max(values)
+
+    intervals = [config.ping_interval for config in configs if config.ping_interval]
+    recv_buffers = [config.recv_buffer for config in configs if config.recv_buffer]
+    return TransportConfig(
+        compression="deflate" if all(config.compression for config in configs) else None,
+        max_size=largest([config.max_size for config in configs]),
+        max_queue=largest([config.max_queue for config in configs]),
+        write_limit=max(config.write_limit for config in configs),
+        ping_interval=min(intervals) if intervals else None,
+        ping_timeout=largest([config.ping_timeout for config in configs]),
+        recv_buffer=max(recv_buffers) if recv_buffers else None,
+    )
+
+
+def loop_name(use_uvloop=True):
+    return "uvloop" if use_uvloop and uvloop is not None else "asyncio"
+
+
+def run(main, use_uvloop=True):
+    """asyncio.run(main), on uvloop when it is installed and wanted"""
+    if use_uvloop and uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
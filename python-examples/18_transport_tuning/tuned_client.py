@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tuned Client
+The reconnecting client on uvloop, with transport settings picked from its subscriptions
+"""
+
+import asyncio
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+
+import transport
+
+# Reuse the reconnecting client from example 05
+sys.path.insert(0, str(Path(__file__).parent.parent / "05_reconnection_handling"))
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+TRADE_COINS = ["BTC", "ETH", "SOL"]
+L4_COINS = ["BTC"]
+USE_UVLOOP = True
+STATS_INTERVAL = 10  # Seconds between throughput reports
+
+
+class TunedClient(RobustWSClient):
+    """RobustWSClient with a TransportConfig and throughput counters"""
+
+    def __init__(self, ws_url, config):
+        super().__init__(ws_url, connect_kwargs=config.connect_kwargs())
+        self.config = config
+        self.frames = 0
+        self.bytes = 0
+
+    async def _open(self):
+        return await self.config.connect(self.ws_url)
+
+    def process_message(self, message):
+        self.frames += 1
+        self.bytes += len(message)
+        super().process_message(message)
+
+    def handle_message(self, data):
+        pass  # Only the transport is measured here; plug in handlers from the other examples
+
+
+def response_headers(websocket):
+    """Handshake response headers; websockets >= 14 has websocket.response, older versions response_headers"""
+    response = getattr(websocket, "response", None)
+    if response is not None:
+        return response.headers
+    return getattr(websocket, "response_headers", None) or {}
+
+
+async def report_stats(client):
+    """Frames/s, MB/s (after decompression) and CPU used by this process"""
+    last_frames, last_bytes = 0, 0
+    last_time, last_cpu = time.monotonic(), time.process_time()
+    while True:
+        await asyncio.sleep(STATS_INTERVAL)
+        now, cpu = time.monotonic(), time.process_time()
+        elapsed = now - last_time
+        extensions = "-"
+        if client.websocket is not None:
+            extensions = response_headers(client.websocket).get("Sec-WebSocket-Extensions", "none")
+        print(f"📈 {(client.frames - last_frames) / elapsed:,.0f} frames/s | "
+              f"{(client.bytes - last_bytes) / elapsed / transport.MB:.2f} MB/s | "
+              f"CPU {(cpu - last_cpu) / elapsed:.0%} | extensions: {extensions}")
+        last_frames, last_bytes, last_time, last_cpu = client.frames, client.bytes, now, cpu
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    config = transport.for_subscriptions(["trades"] * len(TRADE_COINS) + ["l4Book"] * len(L4_COINS))
+    client = TunedClient(ws_url, config)
+    for coin in TRADE_COINS:
+        client.add_subscription("trades", coin)
+    for coin in L4_COINS:
+        client.add_subscription("l4Book", coin)
+
+    print(f"🔧 Event loop: {type(asyncio.get_running_loop()).__module__.split('.')[0]}")
+    print(f"🔧 Transport: {config.describe()}\n")
+
+    stats = asyncio.create_task(report_stats(client))
+    try:
+        await client.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        stats.cancel()
+        await client.stop()
+
+
+if __name__ == "__main__":
+    transport.run(main(), use_uvloop=USE_UVLOOP)
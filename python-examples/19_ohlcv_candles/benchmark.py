@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Candle Engine Benchmark
+Cost per trade for 4 intervals at 500 coins, a check against batch-built bars, and bulk vs per-row storage
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from candles import GRACE_MS, INTERVALS, CandleEngine, CandleStore
+
+COINS = 500
+TRADES = 300_000
+TRADES_PER_SECOND = 2_000
+JITTER_MS = 1_500     # Arrival order differs from exchange time by up to this much (within the grace window)
+VERY_LATE = 0.001     # Fraction of trades delayed past the grace window
+SEED = 11
+
+
+def make_trades(very_late=0.0):
+    """(coin, time, px, sz, is_buy) in arrival order"""
+    rng = random.Random(SEED)
+    coins = [f"COIN{i}" for i in range(COINS)]
+    weights = [1 / (rank + 1) for rank in range(COINS)]
+    prices = {coin: rng.uniform(0.01, 100_000) for coin in coins}
+    start = 1_700_000_000_000
+    trades = []
+    for i, coin in enumerate(rng.choices(coins, weights, k=TRADES)):
+        prices[coin] *= 1 + rng.gauss(0, 0.0005)
+        exchange_time = start + i * 1000 // TRADES_PER_SECOND
+        delay = rng.uniform(0, JITTER_MS)
+        if rng.random() < very_late:
+            delay += GRACE_MS + 60_000
+        trades.append((exchange_time + delay, (coin, exchange_time, prices[coin], rng.uniform(0.001, 5), rng.random() < 0.5)))
+    trades.sort(key=lambda item: item[0])
+    return [trade for _, trade in trades]
+
+
+def expected_bars(trades):
+    """Batch OHLCV per (coin, interval, start), grouping all trades at once"""
+    bars = {}
+    ordered = sorted(enumerate(trades), key=lambda item: (item[1][1], item[0]))  # Exchange time, then arrival
+    for _, (coin, time_ms, px, sz, _) in ordered:
+        for label, length in INTERVALS.items():
+            key = (coin, label, time_ms - time_ms % length)
+            bar = bars.get(key)
+            if bar is None:
+                bars[key] = [px, px, px, px, sz, 1]
+            else:
+                bar[1] = max(bar[1], px)
+                bar[2] = min(bar[2], px)
+                bar[3] = px
+                bar[4] += sz
+                bar[5] += 1
+    return bars
+
+
+def run_engine(trades, closed):
+    engine = CandleEngine(on_close=closed.append)
+    add_trade, advance = engine.add_trade, engine.advance
+    start = time.perf_counter_ns()
+    for i, (coin, time_ms, px, sz, is_buy) in enumerate(trades):
+        add_trade(coin, time_ms, px, sz, is_buy)
+        if i % 4 == 0:  # Frames carry a few trades each; bars roll once per frame
+            advance(engine.watermark)
+    elapsed = time.perf_counter_ns() - start
+    engine.close_all()
+    return elapsed / len(trades), engine
+
+
+def check(trades, closed):
+    expected = expected_bars(trades)
+    got = {(c.coin, c.interval, c.start): [c.open, c.high, c.low, c.close, c.volume, c.trades] for c in closed}
+    assert got.keys() == expected.keys(), "different set of bars"
+    for key, bar in expected.items():
+        other = got[key]
+        assert other[:4] == bar[:4] and other[5] == bar[5] and abs(other[4] - bar[4]) < 1e-6, (key, bar, other)
+
+
+def store_bulk(rows, path):
+    store = CandleStore(path, flush_rows=len(rows) + 1)
+    start = time.perf_counter()
+    store.pending = list(rows)
+    store.flush()
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed
+
+
+def store_per_row(rows, path):
+    db = sqlite3.connect(str(path))
+    db.execute("CREATE TABLE candles (coin TEXT, interval TEXT, start INTEGER, open REAL, high REAL, low REAL, "
+               "close REAL, volume REAL, buy_volume REAL, vwap REAL, trades INTEGER, PRIMARY KEY (coin, interval, start))")
+    start = time.perf_counter()
+    for row in rows:
+        with db:
+            db.execute("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def main():
+    print(f"⏱️  {TRADES:,} trades across {COINS} coins, intervals {', '.join(INTERVALS)}, "
+          f"arrival jitter up to {JITTER_MS}ms, grace {GRACE_MS}ms\n")
+
+    trades = make_trades()
+    closed = []
+    ns, engine = run_engine(trades, closed)
+    print(f"📈 {ns / 1e3:.2f} µs per trade for {len(INTERVALS)} intervals ({ns / len(INTERVALS):.0f} ns per bar update)")
+    check(trades, closed)
+    print(f"✅ {len(closed):,} bars identical to batch-built OHLCV despite out-of-order arrival")
+
+    late_closed = []
+    _, late_engine = run_engine(make_trades(VERY_LATE), late_closed)
+    print(f"🐢 With {VERY_LATE:.1%} of trades a minute late: {late_engine.late_trades:,} bar updates dropped "
+          f"out of {late_engine.trades * len(INTERVALS):,}")
+
+    rows = [candle.row() for candle in closed[:20_000]]
+    with tempfile.TemporaryDirectory() as tmp:
+        bulk = store_bulk(rows, os.path.join(tmp, "bulk.db"))
+        per_row = store_per_row(rows[:2_000], os.path.join(tmp, "rows.db")) * len(rows) / 2_000
+    print(f"\n💾 Storing {len(rows):,} closed bars")
+    print(f"   executemany, one transaction: {bulk * 1e3:8.1f} ms ({len(rows) / bulk:>10,.0f} bars/s)")
+    print(f"   one commit per bar (est.):    {per_row * 1e3:8.1f} ms ({len(rows) / per_row:>10,.0f} bars/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+OHLCV Candles
+Build 1s/1m/5m/1h bars for every coin live from the trades channel and store closed bars in SQLite
+"""
+
+import asyncio
+import heapq
+import os
+import sqlite3
+import sys
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the reconnecting client from example 05
+sys.path.insert(0, str(Path(__file__).parent.parent / "05_reconnection_handling"))
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+TRADE_COINS = ["BTC", "ETH", "SOL", "HYPE"]
+INTERVALS = {"1s": 1_000, "1m": 60_000, "5m": 300_000, "1h": 3_600_000}  # Label -> length in ms
+GRACE_MS = 2_000              # Keep a bar open this long past its end for late trades
+DB_PATH = Path(__file__).parent / "candles.db"
+FLUSH_ROWS = 5_000            # Write closed bars once this many are waiting...
+FLUSH_INTERVAL = 5            # ...or at least this often (seconds)
+
+
+class Candle:
+    """One OHLCV bar; open/close follow exchange time, not arrival order"""
+
+    __slots__ = ("coin", "interval", "start", "open", "high", "low", "close", "volume", "buy_volume",
+                 "notional", "trades", "first_time", "last_time")
+
+    def __init__(self, coin, interval, start, time_ms, px, sz, is_buy):
+        self.coin = coin
+        self.interval = interval
+        self.start = start
+        self.open = self.high = self.low = self.close = px
+        self.volume = sz
+        self.buy_volume = sz if is_buy else 0.0
+        self.notional = px * sz
+        self.trades = 1
+        self.first_time = self.last_time = time_ms
+
+    def add(self, time_ms, px, sz, is_buy):
+        if px > self.high:
+            self.high = px
+        elif px < self.low:
+            self.low = px
+        if time_ms >= self.last_time:
+            self.close = px
+            self.last_time = time_ms
+        elif time_ms < self.first_time:  # A late trade that happened before the current open
+            self.open = px
+            self.first_time = time_ms
+        self.volume += sz
+        if is_buy:
+            self.buy_volume += sz
+        self.notional += px * sz
+        self.trades += 1
+
+    @property
+    def vwap(self):
+        return self.notional / self.volume if self.volume else self.close
+
+    def row(self):
+        return (self.coin, self.interval, self.start, self.open, self.high, self.low, self.close,
+                self.volume, self.buy_volume, self.vwap, self.trades)
+
+    def __repr__(self):
+        return (f"Candle({self.coin} {self.interval} @{self.start} O={self.open} H={self.high} "
+                f"L={self.low} C={self.close} V={self.volume:.4f} n={self.trades})")
+
+
+class CandleEngine:
+    """Open bars for every coin and interval, closed in exchange-time order.
+
+    Each trade touches one open bar per interval (a dict lookup and a few
+    compares). A bar closes once exchange time passes its end plus `grace_ms`;
+    closing deadlines sit in a heap, so rolling bars never scans coins or
+    history. Trades for a bar that has already closed are counted and dropped.
+    """
+
+    def __init__(self, intervals=INTERVALS, grace_ms=GRACE_MS, on_close=None):
+        self.labels = list(intervals)
+        self.lengths = [intervals[label] for label in self.labels]
+        self.grace_ms = grace_ms
+        self.on_close = on_close   # Called with each closed Candle
+
+        self.bars = {}             # coin -> [{start: Candle} per interval]
+        self.closed_until = {}     # coin -> [end of the last closed bar per interval]
+        self.deadlines = []        # heap of (close time, coin, interval index, start)
+        self.watermark = 0         # Latest exchange time seen (ms)
+
+        self.trades = 0
+        self.late_trades = 0
+        self.bars_closed = 0
+
+    def handle_trades(self, data):
+        """Handler for `trades` frames"""
+        for trade in data["data"]:
+            self.add_trade(trade["coin"], trade["time"], float(trade["px"]), float(trade["sz"]), trade["side"] == "B")
+        self.advance(self.watermark)
+
+    def add_trade(self, coin, time_ms, px, sz, is_buy):
+        bars = self.bars.get(coin)
+        if bars is None:
+            bars = self.bars[coin] = [{} for _ in self.lengths]
+            self.closed_until[coin] = [0] * len(self.lengths)
+        closed_until = self.closed_until[coin]
+        self.trades += 1
+        if time_ms > self.watermark:
+            self.watermark = time_ms
+
+        for index, length in enumerate(self.lengths):
+            start = time_ms - time_ms % length
+            if start < closed_until[index]:
+                self.late_trades += 1
+                continue
+            series = bars[index]
+            candle = series.get(start)
+            if candle is None:
+                series[start] = Candle(coin, self.labels[index], start, time_ms, px, sz, is_buy)
+                heapq.heappush(self.deadlines, (start + length + self.grace_ms, coin, index, start))
+            else:
+                candle.add(time_ms, px, sz, is_buy)
+
+    def advance(self, time_ms):
+        """Close every bar whose grace period ended by `time_ms` (exchange time)"""
+        deadlines = self.deadlines
+        while deadlines and deadlines[0][0] <= time_ms:
+            _, coin, index, start = heapq.heappop(deadlines)
+            self._close(coin, index, start)
+
+    def close_all(self):
+        """Close every open bar, e.g. on shutdown"""
+        while self.deadlines:
+            _, coin, index, start = heapq.heappop(self.deadlines)
+            self._close(coin, index, start)
+
+    def _close(self, coin, index, start):
+        candle = self.bars[coin][index].pop(start)
+        self.closed_until[coin][index] = start + self.lengths[index]
+        self.bars_closed += 1
+        if self.on_close:
+            self.on_close(candle)
+
+    def open_bar(self, coin, interval):
+        """The newest open bar for a coin and interval label, or None"""
+        series = self.bars.get(coin, [None] * len(self.lengths))[self.labels.index(interval)]
+        return series[max(series)] if series else None
+
+    def display_stats(self):
+        open_bars = sum(len(series) for bars in self.bars.values() for series in bars)
+        print(f"🕯️  {self.trades:,} trades | {len(self.bars)} coins | {open_bars:,} open bars | "
+              f"{self.bars_closed:,} closed | {self.late_trades:,} late trade-bar updates dropped")
+
+
+class CandleStore:
+    """Closed bars buffered in memory and written to SQLite with one executemany per flush"""
+
+    def __init__(self, path=DB_PATH, flush_rows=FLUSH_ROWS):
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS candles (
+                coin TEXT, interval TEXT, start INTEGER,
+                open REAL, high REAL, low REAL, close REAL,
+                volume REAL, buy_volume REAL, vwap REAL, trades INTEGER,
+                PRIMARY KEY (coin, interval, start)
+            )""")
+        self.flush_rows = flush_rows
+        self.pending = []
+        self.rows_written = 0
+
+    def add(self, candle):
+        """on_close callback for CandleEngine"""
+        self.pending.append(candle.row())
+        if len(self.pending) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.db:  # One transaction per flush
+            self.db.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.pending)
+        self.rows_written += len(self.pending)
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+
+def format_candles(engine, coins, interval="1m"):
+    """The open bar of each coin for one interval"""
+    lines = [f"\n{'Coin':<8} {'Open':>12} {'High':>12} {'Low':>12} {'Close':>12} {'Volume':>12} {'Trades':>7}  ({interval})"]
+    for coin in coins:
+        candle = engine.open_bar(coin, interval)
+        if candle:
+            lines.append(f"{coin:<8} {candle.open:>12,.4f} {candle.high:>12,.4f} {candle.low:>12,.4f} "
+                         f"{candle.close:>12,.4f} {candle.volume:>12,.4f} {candle.trades:>7}")
+    return "\n".join(lines)
+
+
+async def maintain(engine, store):
+    """Close quiet coins' bars, flush closed bars and show progress"""
+    last_flush = time.monotonic()
+    last_watermark, last_seen = engine.watermark, time.monotonic()
+    while True:
+        await asyncio.sleep(1)
+        if engine.watermark != last_watermark:
+            last_watermark, last_seen = engine.watermark, time.monotonic()
+        else:
+            # No trades lately: move exchange time on by the time spent waiting, so quiet
+            # coins' bars still close (the local clock itself may be skewed from the exchange's)
+            engine.advance(engine.watermark + int((time.monotonic() - last_seen) * 1000))
+        if time.monotonic() - last_flush >= FLUSH_INTERVAL:
+            store.flush()
+            last_flush = time.monotonic()
+            print(format_candles(engine, TRADE_COINS))
+            engine.display_stats()
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    store = CandleStore()
+    engine = CandleEngine(on_close=store.add)
+    client = RobustWSClient(ws_url)
+    client.handlers["trades"] = engine.handle_trades
+    for coin in TRADE_COINS:
+        client.add_subscription("trades", coin)
+
+    print(f"🕯️  Building {', '.join(INTERVALS)} candles into {DB_PATH}, press Ctrl+C to stop\n")
+    task = asyncio.create_task(maintain(engine, store))
+    try:
+        await client.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        task.cancel()
+        await client.stop()
+        engine.close_all()
+        store.close()
+        engine.display_stats()
+        print(f"💾 {store.rows_written:,} bars written to {DB_PATH}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+L4 Checkpoint and Warm Restart
+Write the L4 book to a compact binary checkpoint and restart from it instead of the full snapshot
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import websockets
+import zlib
+from array import array
+from collections import defaultdict
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the L4 book from example 07 and the recording reader from example 15
+sys.path.insert(0, str(Path(__file__).parent.parent / "07_l4_orderbook"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "15_offline_replay"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from replay import iter_frames  # noqa: E402
+
+# Load .env from parent directory
+env_path = Path(__file__).parent.parent / '.env'
+load_dotenv(env_path)
+
+# Demo configuration
+L4_COIN = "BTC"
+CHECKPOINT_DIR = Path(__file__).parent / "checkpoints"
+RECORDINGS_DIR = Path(__file__).parent.parent / "15_offline_replay" / "recordings"
+CHECKPOINT_INTERVAL = 30  # Seconds between checkpoints (skipped if the book didn't change)
+
+# File layout (little endian):
+#   header: magic, format version, height, order count, written at, CRC32 of everything after
+#           the header, then byte lengths of the coin name and the price / size / user string tables
+#   columns, each starting on an 8-byte boundary, one entry per order in queue order
+#   (bids best-first, then asks best-first):
+#     oid (u64) | side (u8, 0 = bid) | price index (u32) | size index (u32) | user index (u32)
+#   string tables: unique values joined by NUL, indexed by the columns above
+MAGIC = b"L4CK"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHxxqQdIIIII")
+SEPARATOR = "\0"
+
+HEIGHT_PATTERN = re.compile(r'"height"\s*:\s*(\d+)')
+
+
+class CheckpointError(Exception):
+    """The checkpoint is missing, from another format version or corrupt"""
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _layout(count, coin_len):
+    """Byte offsets of each column after the header"""
+    offsets = {}
+    offset = _align(HEADER.size + coin_len)
+    for name, width in (("oid", 8), ("side", 1), ("px", 4), ("sz", 4), ("user", 4)):
+        offsets[name] = offset
+        offset = _align(offset + width * count)
+    offsets["strings"] = offset
+    return offsets
+
+
+def _string_table(values):
+    """(column of indexes, encoded table) for a list of strings"""
+    table = {}
+    indexes = array("I", [table.setdefault(value, len(table)) for value in values])
+    return indexes, SEPARATOR.join(table).encode()
+
+
+def copy_book(book):
+    """(coin, height, orders, levels) copied out of the book; the only part of a save that must run on the loop.
+
+    Order dicts are shared rather than copied: L4OrderBook replaces an order's
+    dict on a size change instead of mutating it, so the shallow copies stay
+    consistent while the book moves on.
+    """
+    if not isinstance(book.height, int):
+        raise CheckpointError(f"Book has no block height ({book.height!r}); nothing to resume from")
+    levels = (
+        [(price, list(book.bids[price])) for _, price in reversed(book.bid_ladder)],
+        [(price, list(book.asks[price])) for _, price in book.ask_ladder],
+    )
+    return book.coin, book.height, dict(book.orders), levels
+
+
+def encode_checkpoint(book):
+    """The book as checkpoint bytes"""
+    return encode_copy(*copy_book(book))
+
+
+def encode_copy(coin, height, orders, levels):
+    """Checkpoint bytes from copy_book output; touches no live state, so it can run in a thread"""
+    oids, sides, prices, sizes, users = array("Q"), array("B"), [], [], []
+    for side, side_levels in enumerate(levels):
+        for price, level in side_levels:
+            for oid in level:
+                order = orders[oid]
+                oids.append(oid)
+                sides.append(side)
+                prices.append(price)
+                sizes.append(order["sz"])
+                users.append(order["user"] or "")
+    return encode_columns(coin, height, (oids, sides, prices, sizes, users))
+
+
+def encode_columns(coin, height, columns):
+    """Checkpoint bytes from parallel columns"""
+    oids, sides, prices, sizes, users = columns
+    px_column, px_table = _string_table(prices)
+    sz_column, sz_table = _string_table(sizes)
+    user_column, user_table = _string_table(users)
+    coin = coin.encode()
+
+    count = len(oids)
+    offsets = _layout(count, len(coin))
+    body = bytearray(offsets["strings"] + len(px_table) + len(sz_table) + len(user_table) - HEADER.size)
+
+    def put(offset, data):
+        body[offset - HEADER.size:offset - HEADER.size + len(data)] = data
+
+    put(HEADER.size, coin)
+    put(offsets["oid"], oids.tobytes())
+    put(offsets["side"], sides.tobytes())
+    put(offsets["px"], px_column.tobytes())
+    put(offsets["sz"], sz_column.tobytes())
+    put(offsets["user"], user_column.tobytes())
+    put(offsets["strings"], px_table + sz_table + user_table)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, height, count, time.time(), zlib.crc32(body),
+                         len(coin), len(px_table), len(sz_table), len(user_table))
+    return header + bytes(body)
+
+
+def save_checkpoint(book, path):
+    """Encode and write a book (blocking; see Checkpointer for saving from the event loop)"""
+    return write_checkpoint(encode_checkpoint(book), path)
+
+
+def write_checkpoint(data, path):
+    """Write atomically: a reader (or a crash) never sees half a checkpoint"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())  # On disk before the rename makes it the checkpoint
+    os.replace(tmp, path)
+    return len(data)
+
+
+def _encode_and_write(path, coin, height, orders, levels):
+    return write_checkpoint(encode_copy(coin, height, orders, levels), path)
+
+
+def load_checkpoint(path):
+    """An L4OrderBook restored from a checkpoint file, read through mmap"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        raise CheckpointError(f"No checkpoint at {path}") from None
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise CheckpointError(f"Checkpoint {path} is empty")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mm:
+        view = memoryview(mm)
+        try:
+            return _restore(view)
+        finally:
+            view.release()
+
+
+def _restore(view):
+    if len(view) < HEADER.size:
+        raise CheckpointError("Checkpoint is truncated")
+    (magic, version, height, count, _, crc,
+     coin_len, px_len, sz_len, user_len) = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise CheckpointError(f"Not a version {FORMAT_VERSION} L4 checkpoint")
+    if zlib.crc32(view[HEADER.size:]) != crc:
+        raise CheckpointError("Checkpoint is corrupt (CRC mismatch)")
+
+    offsets = _layout(count, coin_len)
+    coin = bytes(view[HEADER.size:HEADER.size + coin_len]).decode()
+    oids = view[offsets["oid"]:offsets["oid"] + 8 * count].cast("Q").tolist()
+    sides = view[offsets["side"]:offsets["side"] + count].tolist()
+    px_indexes = view[offsets["px"]:offsets["px"] + 4 * count].cast("I").tolist()
+    sz_indexes = view[offsets["sz"]:offsets["sz"] + 4 * count].cast("I").tolist()
+    user_indexes = view[offsets["user"]:offsets["user"] + 4 * count].cast("I").tolist()
+
+    start = offsets["strings"]
+    prices = bytes(view[start:start + px_len]).decode().split(SEPARATOR)
+    sizes = bytes(view[start + px_len:start + px_len + sz_len]).decode().split(SEPARATOR)
+    users = [user or None for user in bytes(view[start + px_len + sz_len:start + px_len + sz_len + user_len])
+             .decode().split(SEPARATOR)]
+
+    orders = {}
+    levels = (defaultdict(list), defaultdict(list))
+    side_names = ("bid", "ask")
+    for oid, side, px_index, sz_index, user_index in zip(oids, sides, px_indexes, sz_indexes, user_indexes):
+        price = prices[px_index]
+        orders[oid] = {"user": users[user_index], "limitPx": price, "sz": sizes[sz_index], "side": side_names[side]}
+        levels[side][price].append(oid)
+
+    book = L4OrderBook()
+    book.restore(coin, height, orders, levels[0], levels[1])
+    return book
+
+
+def peek_height(message):
+    """Block height of a raw l4Book frame without decoding it; None if not found"""
+    match = HEIGHT_PATTERN.search(message)
+    return int(match.group(1)) if match else None
+
+
+def catch_up(book, updates, max_step=1):
+    """Apply buffered Updates newer than the book, in height order, until a gap.
+
+    Assumes the feed sends exactly one Updates frame per block height, so
+    consecutive frames differ by one height. Heights may not jump by more than
+    `max_step` (raise it if your feed skips blocks without changes); anything
+    after a gap is left unapplied. A second, different frame for a height that
+    was just applied breaks the assumption, so catching up stops there too
+    (exact duplicates, e.g. from overlapping recordings, are skipped).
+    Returns the number of updates applied.
+    """
+    applied = 0
+    last = None
+    for update in updates:
+        height = update.get("height")
+        if height is None:
+            continue
+        if last is not None and height == book.height:
+            if update == last:
+                continue
+            break  # Two different frames for one block: can't tell what the book already has
+        if height <= book.height:
+            continue
+        if height - book.height > max_step:
+            break
+        book.process_update(update)
+        last = update
+        applied += 1
+    return applied
+
+
+def recorded_updates(directory, coin, after_height):
+    """Updates for one coin newer than after_height, from example 15's recordings (oldest file first)"""
+    updates = []
+    for path in sorted(Path(directory).glob("*.jsonl*")):
+        for line in iter_frames(path):
+            if '"Updates"' not in line or f'"coin":"{coin}"' not in line:
+                continue
+            height = peek_height(line)
+            if height is not None and height > after_height:
+                updates.append(json.loads(line)["data"]["Updates"])
+    updates.sort(key=lambda update: update["height"])
+    return updates
+
+
+class Checkpointer:
+    """Save a book every `interval` seconds, if it changed since the last save.
+
+    Only copying the columns out of the book happens on the event loop; encoding,
+    writing, fsync and the rename run in the default executor, so ingestion keeps
+    going meanwhile. A save that comes due while the previous one is still being
+    written is skipped.
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self.last_save = time.monotonic()
+        self.last_version = None
+        self.pending = None       # Future of the save being written
+        self.saves = 0
+        self.skipped = 0
+
+    def maybe_save(self, book, force=False):
+        """Start a background save if one is due; call from the event loop"""
+        now = time.monotonic()
+        if not force and now - self.last_save < self.interval:
+            return False
+        if self.pending is not None and not self.pending.done():
+            self.skipped += 1
+            return False
+        self.last_save = now
+        if book.version == self.last_version or not isinstance(book.height, int):
+            return False
+        start = time.perf_counter()
+        coin, height, orders, levels = copy_book(book)
+        copied_ms = (time.perf_counter() - start) * 1000
+        self.last_version = book.version
+        self.pending = asyncio.get_running_loop().run_in_executor(
+            None, _encode_and_write, self.path, coin, height, orders, levels)
+        self.pending.add_done_callback(lambda future: self._saved(future, height, len(orders), copied_ms, start))
+        return True
+
+    def _saved(self, future, height, count, copied_ms, start):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.last_version = None  # Try again next interval
+            print(f"⚠️  Checkpoint at height {height} failed: {error}")
+            return
+        self.saves += 1
+        print(f"💾 Checkpoint at height {height}: {count:,} orders, {future.result() / 1024:,.0f} KB "
+              f"({copied_ms:.1f}ms on the loop, {(time.perf_counter() - start) * 1000:.1f}ms in total)")
+
+    async def close(self, book=None):
+        """Wait for the save in progress, then save `book` one last time if it changed"""
+        if self.pending is not None:
+            await asyncio.wait([self.pending])
+        if book is not None and self.maybe_save(book, force=True):
+            await asyncio.wait([self.pending])
+
+
+class WarmStart:
+    """Decides, on the first frame of a new subscription, whether the checkpoint can be used.
+
+    The checkpoint is loaded and brought forward with the buffered Updates before
+    the connection is even open. The server starts every l4Book subscription with
+    a Snapshot; if the book has already reached that Snapshot's height, the frame
+    is dropped without being decoded. Otherwise it is used as on a cold start.
+    """
+
+    def __init__(self, book, buffered=()):
+        self.book = book            # From load_checkpoint, or None
+        self.applied = catch_up(book, buffered) if book is not None else 0
+        self.mode = None            # "warm" or "cold" once decided
+
+    def on_snapshot_frame(self, message):
+        """Returns the ready book for the raw Snapshot frame"""
+        height = peek_height(message)
+        book = self.book
+        if book is not None and height is not None and book.height >= height:
+            self.mode = "warm"
+            return book
+        book = L4OrderBook()
+        book.process_snapshot(json.loads(message)["data"]["Snapshot"])
+        self.mode = "cold"
+        return book
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    started = time.perf_counter()
+    checkpoint_path = CHECKPOINT_DIR / f"{L4_COIN}.l4ck"
+    try:
+        book = load_checkpoint(checkpoint_path)
+        buffered = recorded_updates(RECORDINGS_DIR, L4_COIN, book.height) if RECORDINGS_DIR.exists() else []
+        print(f"📂 Checkpoint at height {book.height}: {len(book.orders):,} orders, "
+              f"{len(buffered):,} recorded updates after it")
+    except CheckpointError as e:
+        print(f"📂 {e}; starting cold")
+        book, buffered = None, []
+    warm_start = WarmStart(book, buffered)
+    if book is not None:
+        print(f"⏩ Caught up {warm_start.applied:,} updates to height {book.height}")
+    checkpointer = Checkpointer(checkpoint_path)
+
+    print(f"Connecting to {ws_url}...")
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    websocket = await websockets.connect(ws_url, max_size=10 * 1024 * 1024)
+    await websocket.send(json.dumps({"method": "subscribe", "subscription": {"type": "l4Book", "coin": L4_COIN}}))
+    print(f"📋 Subscribed to {L4_COIN} L4 Order Book\n")
+
+    orderbook = None
+    try:
+        async for message in websocket:
+            if orderbook is None:
+                if '"Snapshot"' not in message:
+                    continue
+                orderbook = warm_start.on_snapshot_frame(message)
+                print(f"✅ Ready ({warm_start.mode} start) at height {orderbook.height} with "
+                      f"{len(orderbook.orders):,} orders, {(time.perf_counter() - started) * 1000:.0f}ms after launch")
+                continue
+
+            data = json.loads(message)
+            updates = data.get("data", {}).get("Updates") if data.get("channel") == "l4Book" else None
+            if updates and updates.get("height", 0) > orderbook.height:
+                orderbook.process_update(updates)
+                checkpointer.maybe_save(orderbook)
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        await checkpointer.close(orderbook)
+        await websocket.close()
+        print("Disconnected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Alerting Engine
+Rule-based alerts over live book and trade metrics, evaluated only when the values they watch change
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import sys
+import time
+import urllib.request
+from collections import deque, namedtuple
+from datetime import datetime
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Reuse the reconnecting client and the L4 book from earlier examples
+examples_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(examples_dir / "05_reconnection_handling"))
+sys.path.insert(0, str(examples_dir / "07_l4_orderbook"))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+load_dotenv(examples_dir / '.env')
+
+# Demo configuration
+BOOK_COINS = ["BTC", "ETH", "SOL", "HYPE"]
+L4_COIN = "BTC"
+IMBALANCE_LEVELS = 5        # Top-of-book levels summed for the imbalance metric
+IMBALANCE_BAND = 0.3        # imbalance_side only flips once imbalance crosses +/- this
+ALERT_LOG = Path(__file__).parent / "alerts.jsonl"
+WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL")  # Optional: POST each alert as JSON here
+
+
+class Rule:
+    """One condition on one metric of one channel, for one coin or (coin=None) every coin.
+
+    Threshold rules fire when the value goes above `above` / below `below`
+    and clear once it comes back past the threshold by `hysteresis`, so a
+    value hovering at the line doesn't flap. With `hold` the condition must
+    stay true that many seconds before firing. Change rules (`on_change`)
+    fire on every change of the value, e.g. a sign flip. Event rules
+    (`on_event`) are for metrics that describe one event each, like the
+    largest trade of a frame: every update past the threshold fires, with
+    no firing state to clear. `cooldown` is the minimum time between two
+    notifications of the same rule and coin.
+    """
+
+    def __init__(self, name, channel, metric, above=None, below=None, hysteresis=0.0, hold=0.0,
+                 cooldown=0.0, coin=None, on_change=False, notify_clear=True, on_event=False):
+        if (above is None) == (below is None) and not on_change:
+            raise ValueError(f"{name}: give exactly one of above/below, or on_change=True")
+        if on_event and (on_change or hold):
+            raise ValueError(f"{name}: on_event rules take a threshold, without hold or on_change")
+        self.name = name
+        self.channel = channel
+        self.metric = metric
+        self.above = above
+        self.below = below
+        self.hysteresis = hysteresis
+        self.hold = hold
+        self.cooldown = cooldown
+        self.coin = coin
+        self.on_change = on_change
+        self.on_event = on_event
+        self.notify_clear = notify_clear and not on_change and not on_event
+
+    def holds(self, value, firing):
+        """Is the condition true? A firing rule uses the looser (hysteresis) threshold"""
+        if self.above is not None:
+            return value > (self.above - self.hysteresis if firing else self.above)
+        return value < (self.below + self.hysteresis if firing else self.below)
+
+    def __repr__(self):
+        target = self.coin or "*"
+        if self.on_change:
+            return f"Rule({self.name}: {self.channel}/{target} {self.metric} changes)"
+        op, threshold = (">", self.above) if self.above is not None else ("<", self.below)
+        hold = f" for {self.hold:g}s" if self.hold else ""
+        each = " (each event)" if self.on_event else ""
+        return f"Rule({self.name}: {self.channel}/{target} {self.metric} {op} {threshold}{hold}{each})"
+
+
+class Alert(namedtuple("Alert", "rule coin kind value context at")):
+    """A notification: kind is 'fire' or 'clear', `at` is wall-clock time"""
+
+    def to_dict(self):
+        return {"rule": self.rule.name, "channel": self.rule.channel, "metric": self.rule.metric,
+                "coin": self.coin, "kind": self.kind, "value": self.value, "context": self.context,
+                "at": self.at}
+
+    def __str__(self):
+        icon = "🚨" if self.kind == "fire" else "✅"
+        timestamp = datetime.fromtimestamp(self.at).strftime('%H:%M:%S')
+        context = " ".join(f"{key}={value}" for key, value in (self.context or {}).items())
+        return f"{icon} [{timestamp}] {self.rule.name} {self.kind} on {self.coin}: {self.rule.metric}={self.value} {context}"
+
+
+class RuleState:
+    """Where one (rule, coin) pair is: idle, pending since `since`, or firing"""
+
+    __slots__ = ("since", "firing", "last_notified", "value", "context")
+
+    def __init__(self):
+        self.since = None          # Monotonic time the condition became true (while holding)
+        self.firing = False
+        self.last_notified = None
+        self.value = None
+        self.context = None
+
+
+class AlertEngine:
+    """Rules indexed by (channel, coin, metric).
+
+    Metric sources call `update(channel, coin, metrics)` with their latest
+    values. Values equal to the previous ones are skipped, and each changed
+    value looks up only its own rules (plus the every-coin rules for that
+    metric), so the cost per update doesn't grow with the number of rules
+    or coins. Metrics watched by an event rule are evaluated on every
+    update, even when the value repeats. Held conditions that go quiet are fired from a deadline heap by
+    `tick()`. Alerts go to `publish` (e.g. AlertDispatcher.publish) and are
+    kept in `recent`.
+    """
+
+    def __init__(self, publish=None, clock=time.monotonic, recent=100):
+        self.publish = publish
+        self.clock = clock
+        self.rules = []
+        self.index = {}       # (channel, coin or None, metric) -> [Rule]
+        self.values = {}      # (channel, coin) -> {metric: last value}
+        self.events = set()   # (channel, metric) watched by an on_event rule
+        self.states = {}      # (Rule, coin) -> RuleState
+        self.deadlines = []   # heap of (due, sequence, Rule, coin, since)
+        self._sequence = 0
+        self.recent = deque(maxlen=recent)
+
+        self.updates = 0
+        self.evaluations = 0
+        self.alerts = 0
+        self.suppressed = 0   # Notifications skipped by a cooldown
+
+    def add_rule(self, rule):
+        self.rules.append(rule)
+        self.index.setdefault((rule.channel, rule.coin, rule.metric), []).append(rule)
+        if rule.on_event:
+            self.events.add((rule.channel, rule.metric))
+        return rule
+
+    def remove_rule(self, rule):
+        self.rules.remove(rule)
+        self.index[(rule.channel, rule.coin, rule.metric)].remove(rule)
+        if rule.on_event and not any(other.on_event and other.channel == rule.channel
+                                     and other.metric == rule.metric for other in self.rules):
+            self.events.discard((rule.channel, rule.metric))
+        for key in [key for key in self.states if key[0] is rule]:
+            del self.states[key]
+
+    def update(self, channel, coin, metrics, context=None):
+        """New metric values for one coin; evaluates the rules watching the ones that changed"""
+        self.updates += 1
+        last = self.values.get((channel, coin))
+        if last is None:
+            last = self.values[(channel, coin)] = {}
+        index = self.index
+        now = None
+        for metric, value in metrics.items():
+            previous = last.get(metric)
+            if previous == value and (channel, metric) not in self.events:
+                continue
+            last[metric] = value
+            exact = index.get((channel, coin, metric))
+            wildcard = index.get((channel, None, metric))
+            if not exact and not wildcard:
+                continue
+            if now is None:
+                now = self.clock()
+            for rules in (exact, wildcard):
+                if rules:
+                    for rule in rules:
+                        self.evaluate(rule, coin, value, previous, now, context)
+
+    def evaluate(self, rule, coin, value, previous, now, context=None):
+        """Advance one (rule, coin) state machine for a new value"""
+        self.evaluations += 1
+        key = (rule, coin)
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = RuleState()
+        state.value, state.context = value, context
+
+        if rule.on_change:
+            if previous is not None and value != previous:
+                self._notify(rule, coin, state, "fire", now)
+            return
+
+        if rule.on_event:
+            if rule.holds(value, False):
+                self._notify(rule, coin, state, "fire", now)
+            return
+
+        if not rule.holds(value, state.firing):
+            if state.firing:
+                state.firing = False
+                if rule.notify_clear:
+                    self._notify(rule, coin, state, "clear", now)
+            state.since = None
+            return
+
+        if state.firing:
+            return
+        if not rule.hold:
+            self._fire(rule, coin, state, now)
+        elif state.since is None:
+            state.since = now
+            self._sequence += 1
+            heapq.heappush(self.deadlines, (now + rule.hold, self._sequence, rule, coin, now))
+        elif now - state.since >= rule.hold:
+            self._fire(rule, coin, state, now)
+
+    def tick(self, now=None):
+        """Fire held conditions whose hold time has passed without the value changing"""
+        now = self.clock() if now is None else now
+        deadlines = self.deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, _, rule, coin, since = heapq.heappop(deadlines)
+            state = self.states.get((rule, coin))
+            # Stale if the condition went false (or restarted) since this was scheduled
+            if state is not None and state.since == since and not state.firing:
+                self._fire(rule, coin, state, now)
+
+    def _fire(self, rule, coin, state, now):
+        state.firing = True
+        state.since = None
+        self._notify(rule, coin, state, "fire", now)
+
+    def _notify(self, rule, coin, state, kind, now):
+        if kind == "fire" and rule.cooldown and state.last_notified is not None \
+                and now - state.last_notified < rule.cooldown:
+            self.suppressed += 1
+            return
+        if kind == "fire":
+            state.last_notified = now
+        alert = Alert(rule, coin, kind, state.value, state.context, time.time())
+        self.alerts += 1
+        self.recent.append(alert)
+        if self.publish:
+            self.publish(alert)
+
+    def firing(self):
+        """(rule name, coin) pairs currently firing"""
+        return sorted((rule.name, coin) for (rule, coin), state in self.states.items() if state.firing)
+
+    def display_stats(self):
+        print(f"🔔 {len(self.rules)} rules | {self.updates:,} updates | {self.evaluations:,} rule evaluations | "
+              f"{self.alerts:,} alerts ({self.suppressed:,} suppressed) | firing: {len(self.firing())}")
+
+
+class MetricFeed:
+    """Turn l2Book, trades and L4 frames into metric updates for an AlertEngine.
+
+    l2Book:  spread_bps, mid, imbalance and imbalance_side (+1/-1, only
+             switching once imbalance crosses the opposite band)
+    trades:  last_px, largest_trade (notional of the biggest trade in the frame)
+    l4Book:  largest_add (notional one user added on one side in one block)
+
+    Values are rounded so noise below the precision doesn't count as a change.
+    """
+
+    def __init__(self, engine, imbalance_levels=IMBALANCE_LEVELS, imbalance_band=IMBALANCE_BAND):
+        self.engine = engine
+        self.imbalance_levels = imbalance_levels
+        self.imbalance_band = imbalance_band
+        self.imbalance_side = {}  # coin -> +1 / -1
+
+    def handle_l2_book(self, data):
+        """Handler for l2Book frames"""
+        book = data["data"]
+        bids, asks = book["levels"]
+        if not bids or not asks:
+            return
+        coin = book["coin"]
+        bid, ask = float(bids[0]["px"]), float(asks[0]["px"])
+        mid = (bid + ask) / 2
+        n = self.imbalance_levels
+        bid_qty = sum(float(level["sz"]) for level in bids[:n])
+        ask_qty = sum(float(level["sz"]) for level in asks[:n])
+        total = bid_qty + ask_qty
+        imbalance = (bid_qty - ask_qty) / total if total > 0 else 0.0
+
+        metrics = {"spread_bps": round((ask - bid) / mid * 10_000, 2), "mid": mid, "imbalance": round(imbalance, 2)}
+        side = self.imbalance_side.get(coin)
+        if imbalance >= self.imbalance_band and side != 1:
+            side = self.imbalance_side[coin] = 1
+        elif imbalance <= -self.imbalance_band and side != -1:
+            side = self.imbalance_side[coin] = -1
+        if side is not None:
+            metrics["imbalance_side"] = side
+        self.engine.update("l2Book", coin, metrics, {"bid": bids[0]["px"], "ask": asks[0]["px"]})
+
+    def handle_trades(self, data):
+        """Handler for trades frames"""
+        by_coin = {}
+        for trade in data["data"]:
+            px = float(trade["px"])
+            notional = px * float(trade["sz"])
+            best = by_coin.get(trade["coin"])
+            if best is None or notional > best[1]:
+                by_coin[trade["coin"]] = (px, notional, trade)
+        for coin, (px, notional, trade) in by_coin.items():
+            self.engine.update("trades", coin, {"last_px": px, "largest_trade": round(notional)},
+                               {"side": trade["side"], "sz": trade["sz"], "px": trade["px"]})
+
+    def handle_l4_update(self, orderbook):
+        """Call after L4OrderBook.process_update"""
+        added = {}  # (user, side) -> notional added in this block
+        for order in orderbook.last_changes["added"]:
+            key = (order["user"], order["side"])
+            added[key] = added.get(key, 0.0) + float(order["limitPx"]) * float(order["sz"])
+        if added:
+            (user, side), notional = max(added.items(), key=lambda item: item[1])
+            context = {"user": user, "side": side}
+        else:
+            notional, context = 0.0, None
+        self.engine.update("l4Book", orderbook.coin, {"largest_add": round(notional)}, context)
+
+
+# --- Sinks ------------------------------------------------------------------------
+# A sink is any object with `async def send(alert)`.
+
+class ConsoleSink:
+    async def send(self, alert):
+        print(alert)
+
+
+class JsonlSink:
+    """Append alerts to a JSON-lines file (writes run in a worker thread)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _write(self, line):
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    async def send(self, alert):
+        line = json.dumps(alert.to_dict())
+        await asyncio.get_running_loop().run_in_executor(None, self._write, line)
+
+
+class WebhookSink:
+    """POST each alert as JSON to a URL (e.g. a chat webhook)"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, body):
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    async def send(self, alert):
+        body = json.dumps(alert.to_dict()).encode()
+        await asyncio.get_running_loop().run_in_executor(None, self._post, body)
+
+
+class AlertDispatcher:
+    """Deliver alerts to async sinks without ever blocking the receive loop.
+
+    Each sink has its own bounded queue and task, so a slow webhook only
+    delays its own alerts; when its queue is full new alerts for it are
+    dropped and counted.
+    """
+
+    def __init__(self, sinks, queue_size=1_000):
+        self.sinks = list(sinks)
+        self.queues = [asyncio.Queue(maxsize=queue_size) for _ in self.sinks]
+        self.tasks = []
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self._deliver(sink, queue)) for sink, queue in zip(self.sinks, self.queues)]
+
+    def publish(self, alert):
+        """AlertEngine publish callback; never blocks"""
+        for queue in self.queues:
+            try:
+                queue.put_nowait(alert)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def _deliver(self, sink, queue):
+        while True:
+            alert = await queue.get()
+            try:
+                await sink.send(alert)
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️  {type(sink).__name__} failed: {e}")
+            finally:
+                queue.task_done()
+
+    async def stop(self, timeout=5):
+        """Deliver what's queued (up to `timeout` seconds), then stop the sink tasks"""
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in self.queues)), timeout)
+        except asyncio.TimeoutError:
+            print("⚠️  Gave up on undelivered alerts")
+        for task in self.tasks:
+            task.cancel()
+
+
+def default_rules():
+    """The demo rules: the same conditions for every coin"""
+    return [
+        Rule("wide spread", "l2Book", "spread_bps", above=5, hysteresis=1, hold=2),
+        Rule("imbalance flip", "l2Book", "imbalance_side", on_change=True, cooldown=10),
+        Rule("large trade", "trades", "largest_trade", above=500_000, on_event=True),
+        Rule("large add", "l4Book", "largest_add", above=1_000_000, on_event=True),
+    ]
+
+
+class AlertingClient(RobustWSClient):
+    """l2Book and trades for a few coins plus one L4 book, all feeding an AlertEngine"""
+
+    def __init__(self, ws_url, engine):
+        # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+        super().__init__(ws_url, connect_kwargs={"max_size": 10 * 1024 * 1024})
+        self.feed = MetricFeed(engine)
+        self.book = L4OrderBook()
+        self.handlers["l2Book"] = self.feed.handle_l2_book
+        self.handlers["trades"] = self.feed.handle_trades
+        self.handlers["l4Book"] = self.handle_l4_book
+
+    def handle_l4_book(self, data):
+        payload = data["data"]
+        if "Snapshot" in payload:
+            self.book.process_snapshot(payload["Snapshot"])
+        elif "Updates" in payload:
+            self.book.process_update(payload["Updates"])
+            self.feed.handle_l4_update(self.book)
+
+
+async def tick_loop(engine, interval=0.25, stats_interval=30):
+    """Fire held conditions on quiet coins and show stats now and then"""
+    next_stats = time.monotonic() + stats_interval
+    while True:
+        await asyncio.sleep(interval)
+        engine.tick()
+        if time.monotonic() >= next_stats:
+            engine.display_stats()
+            next_stats = time.monotonic() + stats_interval
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    sinks = [ConsoleSink(), JsonlSink(ALERT_LOG)]
+    if WEBHOOK_URL:
+        sinks.append(WebhookSink(WEBHOOK_URL))
+    dispatcher = AlertDispatcher(sinks)
+    dispatcher.start()
+
+    engine = AlertEngine(publish=dispatcher.publish)
+    for rule in default_rules():
+        engine.add_rule(rule)
+
+    client = AlertingClient(ws_url, engine)
+    for coin in BOOK_COINS:
+        client.add_subscription("l2Book", coin)
+        client.add_subscription("trades", coin)
+    client.add_subscription("l4Book", L4_COIN)
+
+    print(f"🔔 Watching {', '.join(BOOK_COINS)} (L4: {L4_COIN}), alerts also go to {ALERT_LOG}")
+    for rule in engine.rules:
+        print(f"   {rule}")
+    print()
+
+    task = asyncio.create_task(tick_loop(engine))
+    try:
+        await client.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        task.cancel()
+        await client.stop()
+        await dispatcher.stop()
+        engine.display_stats()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Rolling Correlation Benchmark
+Cost per 1s step at 200 coins: incremental covariance vs recomputing the matrix from the window
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from correlation import WINDOW, RollingCorrelation, np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "04_multi_coin_tracker"))
+from multi_coin_tracker import MultiCoinTracker  # noqa: E402
+
+COINS = 200
+STEPS = 3_600          # An hour of 1s samples
+SEED = 17
+
+
+def make_prices(rng):
+    """(STEPS + 1) x COINS prices from a one-factor model, so coins are genuinely correlated"""
+    betas = np.array([1.0] + [rng.uniform(0.3, 2.0) for _ in range(COINS - 1)])
+    market = np.array([rng.gauss(0, 0.0005) for _ in range(STEPS)])
+    noise = np.array([[rng.gauss(0, 0.0008) for _ in range(COINS)] for _ in range(STEPS)])
+    noise[:, 0] = 0  # COIN0 is the market itself
+    returns = market[:, None] * betas[None, :] + noise
+    start = np.array([rng.uniform(0.01, 100_000) for _ in range(COINS)])
+    return np.vstack([start, start * np.exp(np.cumsum(returns, axis=0))]), betas
+
+
+def time_steps(step, prices):
+    timings = []
+    for row in prices:
+        start = time.perf_counter_ns()
+        step(row)
+        timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+    return timings[len(timings) // 2] / 1e3, timings[int(len(timings) * 0.99)] / 1e3
+
+
+def main():
+    if np is None:
+        print("Error: numpy is not installed (pip install numpy)")
+        return
+    rng = random.Random(SEED)
+    prices, betas = make_prices(rng)
+    coins = [f"COIN{i}" for i in range(COINS)]
+    print(f"⏱️  {COINS} coins, {WINDOW}-sample window, {STEPS:,} steps (µs per step, median / p99)\n")
+
+    incremental = RollingCorrelation()
+    for coin in coins:
+        incremental.add_coin(coin)
+
+    def incremental_step(row):
+        incremental.add_prices(row)
+        incremental.correlation()
+
+    update_only = RollingCorrelation()
+    for coin in coins:
+        update_only.add_coin(coin)
+
+    # Baseline: keep the same ring buffer, but rebuild the matrix from the whole window each step
+    full = RollingCorrelation()
+    for coin in coins:
+        full.add_coin(coin)
+
+    def full_step(row):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new = np.log(row / full.last_prices[:COINS])
+        new[~np.isfinite(new)] = 0.0
+        full.last_prices[:COINS] = row
+        full.returns[full.steps % WINDOW, :COINS] = new
+        full.steps += 1
+        window = full.returns[:min(full.steps, WINDOW), :COINS]
+        if len(window) > 1:
+            np.corrcoef(window, rowvar=False)
+
+    for label, step in (("full recompute (np.corrcoef)", full_step),
+                        ("incremental update", update_only.add_prices),
+                        ("incremental update + correlation", incremental_step)):
+        median, p99 = time_steps(step, prices)
+        print(f"{label:<34} {median:>9.1f} {p99:>9.1f}")
+
+    # Same answer as computing from scratch over the last WINDOW samples
+    window = np.diff(np.log(prices), axis=0)[-WINDOW:]
+    expected = np.corrcoef(window, rowvar=False)
+    error = np.nanmax(np.abs(incremental.correlation() - expected))
+    assert error < 1e-9, error
+    print(f"\n✅ Matches np.corrcoef over the last {WINDOW} returns (max error {error:.1e})")
+
+    estimated = np.array(list(incremental.betas("COIN0").values()))
+    print(f"📐 Betas vs COIN0 (the market factor) within {np.mean(np.abs(estimated - betas)):.2f} "
+          f"of the model's on average, over {WINDOW} samples")
+
+    # Sampling last prices from live trackers is part of each step too
+    tracker = MultiCoinTracker(display_interval=0)
+    tracker.handle_trade({"data": [{"coin": coin, "px": str(px), "sz": "1", "side": "B"}
+                                   for coin, px in zip(coins, prices[0])]})
+    sampled = RollingCorrelation()
+    start = time.perf_counter()
+    for _ in range(1_000):
+        sampled.sample(tracker.trackers)
+    elapsed = time.perf_counter() - start
+    print(f"🧮 Sampling {COINS} CoinTrackers' last prices, plus the update: {elapsed * 1e3:.1f} µs per step")
+
+
+if __name__ == "__main__":
+    main()
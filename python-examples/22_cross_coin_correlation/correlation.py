@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Cross-Coin Correlation
+Rolling return correlation and beta across every traded coin, updated once per second with NumPy
+"""
+
+import asyncio
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, see requirements.txt
+    np = None
+
+# Reuse the reconnecting client and the trade trackers from earlier examples
+examples_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(examples_dir / "04_multi_coin_tracker"))
+sys.path.insert(0, str(examples_dir / "05_reconnection_handling"))
+from multi_coin_tracker import MultiCoinTracker  # noqa: E402
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+load_dotenv(examples_dir / '.env')
+
+# Demo configuration
+TRADE_COINS = ["BTC", "ETH", "SOL", "HYPE", "XRP", "DOGE", "AVAX", "LINK", "SUI", "BNB"]
+BENCHMARK_COIN = "BTC"   # Betas are against this coin's returns
+STEP = 1.0               # Seconds between price samples
+WINDOW = 300             # Samples in the rolling window (5 minutes at 1s)
+MAX_COINS = 256          # Columns preallocated in the ring buffer
+RESYNC_EVERY = 3_600     # Rebuild the running sums from the window this often (steps) to shed float drift
+DISPLAY_INTERVAL = 10    # Seconds between printouts
+
+
+class RollingCorrelation:
+    """Rolling covariance, correlation and beta of per-step log returns across coins.
+
+    Each step samples every coin's last price onto a common time grid and
+    writes one row of log returns into a preallocated (window x coins) ring
+    buffer, overwriting the oldest row. The running sum of returns and the
+    N x N sum of return products are updated with just the new and the
+    evicted row (one rank-2 product, O(N²)), instead of rebuilding the
+    matrix from the whole window (O(window x N²)) every step.
+    """
+
+    def __init__(self, window=WINDOW, max_coins=MAX_COINS, resync_every=RESYNC_EVERY):
+        if np is None:
+            raise RuntimeError("numpy is not installed (pip install numpy)")
+        self.window = window
+        self.max_coins = max_coins
+        self.resync_every = resync_every
+
+        self.coins = []                                   # column -> coin
+        self.columns = {}                                 # coin -> column
+        self.returns = np.zeros((window, max_coins))      # Ring buffer, row = step % window
+        self.last_prices = np.full(max_coins, np.nan)     # Last sampled price per column
+        self.added_at = np.zeros(max_coins, dtype=np.int64)  # Step each column started at
+        self.sums = np.zeros(max_coins)                   # Sum of returns over the window
+        self.products = np.zeros((max_coins, max_coins))  # Sum of r rᵀ over the window
+        self.steps = 0
+
+        # Scratch for the rank-2 update: rows (new, old) times rows (new, -old)
+        self._left = np.zeros((2, max_coins))
+        self._right = np.zeros((2, max_coins))
+
+    def add_coin(self, coin):
+        """Give a coin a column; its window starts out as zero returns"""
+        column = self.columns.get(coin)
+        if column is None:
+            if len(self.coins) == self.max_coins:
+                raise ValueError(f"More than {self.max_coins} coins, raise max_coins")
+            column = self.columns[coin] = len(self.coins)
+            self.coins.append(coin)
+            self.added_at[column] = self.steps
+        return column
+
+    def sample(self, trackers):
+        """One step from a MultiCoinTracker's {coin: CoinTracker}: add new coins, sample last prices"""
+        for coin in trackers:
+            if coin not in self.columns:
+                self.add_coin(coin)
+        prices = np.fromiter((trackers[coin].get_latest_price() for coin in self.coins), float, len(self.coins))
+        self.add_prices(prices)
+
+    def add_prices(self, prices):
+        """One step of last prices, aligned with self.coins (nan or 0 = no price yet)"""
+        n = len(self.coins)
+        row = self.steps % self.window
+        left, right = self._left[:, :n], self._right[:, :n]
+        old = self.returns[row, :n]
+        left[1] = old
+        np.negative(old, out=right[1])
+
+        prices = np.where(prices > 0, prices, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            new = np.log(prices / self.last_prices[:n])
+        new[~np.isfinite(new)] = 0.0  # First price of a coin, or still none
+        self.last_prices[:n] = np.where(np.isnan(prices), self.last_prices[:n], prices)
+
+        self.returns[row, :n] = new
+        left[0] = new
+        right[0] = new
+        self.sums[:n] += new - left[1]
+        self.products[:n, :n] += left.T @ right  # new newᵀ - old oldᵀ
+        self.steps += 1
+        if self.steps % self.resync_every == 0:
+            self.resync()
+
+    def resync(self):
+        """Rebuild the running sums from the ring buffer"""
+        n = len(self.coins)
+        window = self.returns[:, :n]
+        self.sums[:n] = window.sum(axis=0)
+        self.products[:n, :n] = window.T @ window
+
+    @property
+    def count(self):
+        """Samples currently in the window"""
+        return min(self.steps, self.window)
+
+    def covariance(self):
+        """N x N sample covariance of returns over the window, or None before two samples"""
+        n, m = len(self.coins), self.count
+        if m < 2:
+            return None
+        sums = self.sums[:n]
+        cov = np.multiply.outer(sums, sums / m)
+        np.subtract(self.products[:n, :n], cov, out=cov)
+        cov /= m - 1
+        return cov
+
+    def correlation(self):
+        """N x N correlation matrix (nan for coins whose price hasn't moved)"""
+        cov = self.covariance()
+        if cov is None:
+            return None
+        with np.errstate(divide="ignore"):
+            scale = 1 / np.sqrt(np.diag(cov).clip(0))
+        scale[np.isinf(scale)] = np.nan  # Coins whose price hasn't moved
+        cov *= scale[:, None]  # Scaled in place: cov is a fresh array
+        cov *= scale[None, :]
+        np.fill_diagonal(cov, 1.0)
+        return cov
+
+    def betas(self, benchmark=BENCHMARK_COIN):
+        """{coin: beta of its returns against the benchmark coin's}"""
+        cov = self.covariance()
+        column = self.columns.get(benchmark)
+        if cov is None or column is None or cov[column, column] <= 0:
+            return {}
+        beta = cov[:, column] / cov[column, column]
+        return dict(zip(self.coins, beta.tolist()))
+
+    def ready(self):
+        """Mask of coins with a full window of their own samples"""
+        return self.steps - self.added_at[:len(self.coins)] >= self.window
+
+    def top_pairs(self, k=10, corr=None):
+        """The k most correlated pairs among coins with a full window: [(corr, coin_a, coin_b)]"""
+        corr = self.correlation() if corr is None else corr
+        if corr is None:
+            return []
+        ready = np.flatnonzero(self.ready())
+        if len(ready) < 2:
+            return []
+        sub = corr[np.ix_(ready, ready)]
+        rows, cols = np.triu_indices(len(ready), 1)
+        values = np.nan_to_num(sub[rows, cols], nan=-np.inf)
+        k = min(k, len(values))
+        best = np.argpartition(-values, k - 1)[:k]
+        best = best[np.argsort(-values[best])]
+        return [(float(values[i]), self.coins[ready[rows[i]]], self.coins[ready[cols[i]]])
+                for i in best if np.isfinite(values[i])]
+
+
+def format_correlation(matrix, coins, benchmark=BENCHMARK_COIN):
+    """Beta and correlation against the benchmark, plus the most correlated pairs"""
+    corr = matrix.correlation()
+    if corr is None:
+        return "⏳ Waiting for samples..."
+    betas = matrix.betas(benchmark)
+    bench = matrix.columns.get(benchmark)
+    lines = [
+        f"\n{'='*60}",
+        f"🔗 Rolling correlation: {matrix.count}/{matrix.window} samples, {len(matrix.coins)} coins",
+        f"{'='*60}",
+        f"{'Coin':<8} {'Beta vs ' + benchmark:>14} {'Corr vs ' + benchmark:>14}",
+    ]
+    for coin in coins:
+        column = matrix.columns.get(coin)
+        if column is None or bench is None:
+            continue
+        lines.append(f"{coin:<8} {betas.get(coin, float('nan')):>14.2f} {corr[column, bench]:>14.2f}")
+    pairs = matrix.top_pairs(5, corr)
+    if pairs:
+        lines.append("\nMost correlated pairs (full window):")
+        lines.extend(f"  {a}/{b}: {value:+.2f}" for value, a, b in pairs)
+    return "\n".join(lines)
+
+
+async def sample_loop(matrix, tracker, step=STEP):
+    """Sample on a fixed grid: sleep until the next multiple of `step`, not `step` after the last sample"""
+    next_sample = time.monotonic() + step
+    next_display = time.monotonic() + DISPLAY_INTERVAL
+    while True:
+        await asyncio.sleep(max(0.0, next_sample - time.monotonic()))
+        next_sample += step
+        if tracker.trackers:
+            matrix.sample(tracker.trackers)
+        if time.monotonic() >= next_display:
+            print(format_correlation(matrix, TRADE_COINS))
+            next_display = time.monotonic() + DISPLAY_INTERVAL
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+    if np is None:
+        print("Error: numpy is not installed (pip install numpy)")
+        return
+
+    tracker = MultiCoinTracker(display_interval=0)
+    matrix = RollingCorrelation()
+    client = RobustWSClient(ws_url)
+    client.handlers["trades"] = tracker.handle_trade
+    for coin in TRADE_COINS:
+        client.add_subscription("trades", coin)
+
+    print(f"🔗 Sampling {len(TRADE_COINS)} coins every {STEP:g}s over a {WINDOW}-sample window, press Ctrl+C to stop\n")
+    task = asyncio.create_task(sample_loop(matrix, tracker))
+    try:
+        await client.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        task.cancel()
+        await client.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
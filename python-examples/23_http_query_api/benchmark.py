@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Query API Benchmark
+Requests/sec under concurrent keep-alive load with and without the version cache, and SSE fan-out
+"""
+
+import asyncio
+import copy
+import itertools
+import sys
+import time
+from pathlib import Path
+
+from query_api import MarketState, QueryServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+from fixtures import synthetic  # noqa: E402
+
+COIN = "BTC"
+PATHS = [f"/l2/{COIN}?depth=20", f"/l4/{COIN}?depth=20", f"/metrics/{COIN}", f"/trades/{COIN}?limit=50"]
+CONCURRENCY = [1, 16, 64]
+DURATION = 3             # Seconds per load run
+FEED_RATE = 200          # Book/trade frames per second applied while serving
+SSE_CLIENTS = 200
+
+
+def load_state(fx):
+    """A MarketState filled from the fixtures, plus l2Book/trades frames (all for COIN) to keep feeding it"""
+    state = MarketState()
+    state.handle_l4_book({"data": {"Snapshot": fx.l4_snapshot()}})
+    for update in fx.l4_updates():
+        state.handle_l4_book({"data": {"Updates": update}})
+    frames = []
+    for l2, trades in zip(fx.decoded("l2Book")[:1000], fx.decoded("trades")):
+        l2, trades = copy.deepcopy(l2), copy.deepcopy(trades)
+        l2["data"]["coin"] = COIN
+        for trade in trades["data"]:
+            trade["coin"] = COIN
+        frames += [l2, trades]
+    handlers = {"l2Book": state.handle_l2_book, "trades": state.handle_trades}
+    for data in frames:
+        handlers[data["channel"]](data)
+    return state, handlers, frames
+
+
+async def feed(handlers, frames, rate):
+    """Apply frames at `rate` per second, in small batches"""
+    batch = max(1, rate // 50)
+    stream = itertools.cycle(frames)
+    while True:
+        for _ in range(batch):
+            data = next(stream)
+            handlers[data["channel"]](data)
+        await asyncio.sleep(batch / rate)
+
+
+async def http_client(port, deadline, counter):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    requests = [f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode() for path in PATHS]
+    for request in itertools.cycle(requests):
+        if time.monotonic() >= deadline:
+            break
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head[head.index(b"Content-Length: ") + 16:].split(b"\r\n", 1)[0])
+        await reader.readexactly(length)
+        counter[0] += 1
+    writer.close()
+
+
+async def sse_client(port, path, counter):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        while True:
+            await reader.readuntil(b"\n\n")
+            counter[0] += 1
+    except (asyncio.CancelledError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def load_run(state, handlers, frames, cache, concurrency):
+    server = QueryServer(state, port=0, cache=cache)
+    await server.start()
+    feeder = asyncio.create_task(feed(handlers, frames, FEED_RATE))
+    counter = [0]
+    start = time.monotonic()
+    await asyncio.gather(*(http_client(server.port, start + DURATION, counter) for _ in range(concurrency)))
+    elapsed = time.monotonic() - start
+    feeder.cancel()
+    await server.stop()
+    return counter[0] / elapsed, server.cache
+
+
+async def sse_run(state, handlers, frames):
+    server = QueryServer(state, port=0)
+    await server.start()
+    counter = [0]
+    clients = [asyncio.create_task(sse_client(server.port, f"/stream/l2/{COIN}?depth=20", counter))
+               for _ in range(SSE_CLIENTS)]
+    await asyncio.sleep(0.5)
+    versions = state.version(("l2",), COIN)
+    feeder = asyncio.create_task(feed(handlers, frames, FEED_RATE))
+    counter[0] = 0
+    misses = server.cache.misses
+    await asyncio.sleep(DURATION)
+    feeder.cancel()
+    events, builds = counter[0], server.cache.misses - misses
+    changes = state.version(("l2",), COIN)[0] - versions[0]
+    for client in clients:
+        client.cancel()
+    await asyncio.gather(*clients)
+    await server.stop()
+    return events, builds, changes
+
+
+def time_respond(server, path, repeats=20_000):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        server.respond(path)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+async def main():
+    fx = synthetic()
+    state, handlers, frames = load_state(fx)
+
+    print("🧮 Building one response, in-process (µs per request, data unchanged)\n")
+    print(f"{'Path':<26} {'Uncached':>10} {'Cached':>10}")
+    print("-" * 48)
+    cached, uncached = QueryServer(state), QueryServer(state, cache=False)
+    for path in PATHS:
+        print(f"{path:<26} {time_respond(uncached, path):>10.1f} {time_respond(cached, path):>10.2f}")
+
+    print(f"\n⏱️  Requests/sec over keep-alive connections, cycling {len(PATHS)} endpoints, "
+          f"{FEED_RATE} book/trade frames/s applied meanwhile\n   (load generator shares the process and CPU)\n")
+    print(f"{'Clients':>8} {'Uncached':>10} {'Cached':>10} {'Hit rate':>9}")
+    print("-" * 40)
+    for concurrency in CONCURRENCY:
+        rps_off, _ = await load_run(state, handlers, frames, False, concurrency)
+        rps_on, cache = await load_run(state, handlers, frames, True, concurrency)
+        hit_rate = cache.hits / max(1, cache.hits + cache.misses)
+        print(f"{concurrency:>8} {rps_off:>10,.0f} {rps_on:>10,.0f} {hit_rate:>9.0%}")
+
+    events, builds, changes = await sse_run(state, handlers, frames)
+    print(f"\n📡 SSE: {SSE_CLIENTS} streams of /stream/l2/{COIN} for {DURATION}s, {changes:,} book changes")
+    print(f"   {events:,} events delivered ({events / SSE_CLIENTS / DURATION:.1f}/s per stream, "
+          f"capped by the {1 / QueryServer(state).sse_interval:.0f}/s interval), {builds:,} payloads serialized")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+HTTP Query API
+Serve live book, metrics and trade state to other programs over HTTP and Server-Sent Events
+"""
+
+import asyncio
+import json
+import math
+import os
+import sys
+from collections import deque
+from dotenv import load_dotenv
+from pathlib import Path
+from urllib.parse import parse_qs
+
+# Reuse the client, books and analytics from earlier examples
+examples_dir = Path(__file__).parent.parent
+for example in ("04_multi_coin_tracker", "05_reconnection_handling", "06_data_analysis", "07_l4_orderbook",
+                "09_message_router"):
+    sys.path.insert(0, str(examples_dir / example))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from market_metrics import MarketAnalyzer  # noqa: E402
+from message_router import COIN_EXTRACTORS  # noqa: E402
+from multi_coin_tracker import MultiCoinTracker  # noqa: E402
+from robust_client import RobustWSClient  # noqa: E402
+
+# Load .env from parent directory
+load_dotenv(examples_dir / '.env')
+
+# Demo configuration
+BOOK_COINS = ["BTC", "ETH", "SOL", "HYPE"]
+L4_COIN = "BTC"
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8080"))
+MAX_DEPTH = 50           # Largest ?depth= served (also bounds the number of cache entries)
+TRADE_HISTORY = 200      # Recent trades kept per coin
+SSE_INTERVAL = 0.1       # At most one event per stream this often; changes in between are merged
+SSE_KEEPALIVE = 15       # Seconds between comment lines on a quiet stream
+MAX_HEADER_BYTES = 8_192
+MAX_ROUTES = 1_024       # Parsed request targets remembered (cleared when full)
+
+# Endpoint -> (state kinds it's versioned by, size parameter, default size, largest size)
+ENDPOINTS = {
+    "l2": (("l2",), "depth", 20, MAX_DEPTH),
+    "l4": (("l4",), "depth", 20, MAX_DEPTH),
+    "metrics": (("l2", "trades"), None, 0, 0),
+    "trades": (("trades",), "limit", 50, TRADE_HISTORY),
+}
+
+STATUS = {200: "200 OK", 304: "304 Not Modified", 400: "400 Bad Request", 404: "404 Not Found",
+          405: "405 Method Not Allowed",
+          431: "431 Request Header Fields Too Large"}
+
+
+def _dump(data):
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def http_response(status, body=b"", etag=None, content_type="application/json"):
+    """A complete HTTP/1.1 response as bytes, ready to write (and to cache)"""
+    head = [f"HTTP/1.1 {STATUS[status]}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}",
+            "Cache-Control: no-cache", "Access-Control-Allow-Origin: *"]
+    if etag:
+        head.append(f"ETag: {etag}")
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+def error_response(status, message):
+    return http_response(status, _dump({"error": message}))
+
+
+def _etag(version):
+    return '"' + ".".join(map(str, version)) + '"'
+
+
+class MarketState:
+    """Live per-coin state fed by the client's handlers. Every view has a version that
+    changes whenever the data behind it does, so responses can be cached per version."""
+
+    def __init__(self, trade_history=TRADE_HISTORY):
+        self.l2 = {}            # coin -> latest l2Book payload
+        self.l4 = {}            # coin -> L4OrderBook
+        self.analyzers = {}     # coin -> MarketAnalyzer
+        self.tracker = MultiCoinTracker(display_interval=0)
+        self.trades = {}        # coin -> deque of recent trades, oldest first
+        self.trade_history = trade_history
+        self.versions = {}      # (kind, coin) -> int
+        self.listeners = {}     # coin -> asyncio.Event, only while someone streams that coin
+
+    def version(self, kinds, coin):
+        return tuple(self.versions.get((kind, coin), 0) for kind in kinds)
+
+    def has(self, kinds, coin):
+        return any((kind, coin) in self.versions for kind in kinds)
+
+    def _bump(self, kind, coin, version=None):
+        key = (kind, coin)
+        self.versions[key] = self.versions.get(key, 0) + 1 if version is None else version
+        # Wake every stream waiting on this coin; later waiters get a fresh event
+        event = self.listeners.pop(coin, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_change(self, coin, timeout):
+        """Wait until anything about the coin changes; False if `timeout` seconds pass first"""
+        event = self.listeners.get(coin)
+        if event is None:
+            event = self.listeners[coin] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def analyzer(self, coin):
+        analyzer = self.analyzers.get(coin)
+        if analyzer is None:
+            analyzer = self.analyzers[coin] = MarketAnalyzer()
+        return analyzer
+
+    # --- Handlers ---
+
+    def handle_l2_book(self, data):
+        """Handler for l2Book frames"""
+        book = data["data"]
+        coin = book["coin"]
+        self.l2[coin] = book
+        bids, asks = book["levels"]
+        if bids and asks:
+            self.analyzer(coin).add_spread(float(asks[0]["px"]) - float(bids[0]["px"]))
+        self._bump("l2", coin)
+
+    def handle_trades(self, data):
+        """Handler for trades frames"""
+        self.tracker.handle_trade(data)
+        coins = set()
+        for trade in data["data"]:
+            coin = trade["coin"]
+            self.analyzer(coin).add_trade(trade["px"], trade["sz"], trade["side"])
+            recent = self.trades.get(coin)
+            if recent is None:
+                recent = self.trades[coin] = deque(maxlen=self.trade_history)
+            recent.append(trade)
+            coins.add(coin)
+        for coin in coins:
+            self._bump("trades", coin)
+
+    def handle_l4_book(self, data):
+        """Handler for l4Book frames"""
+        payload = data["data"]
+        snapshot = payload.get("Snapshot")
+        if snapshot:
+            book = self.l4.setdefault(snapshot["coin"], L4OrderBook())
+            book.process_snapshot(snapshot)
+            self._bump("l4", book.coin, book.version)
+            return
+        updates = payload.get("Updates")
+        if updates:
+            book = self.l4.get(COIN_EXTRACTORS["l4Book"](payload))
+            if book is not None:
+                book.process_update(updates)
+                self._bump("l4", book.coin, book.version)
+
+    # --- Views (JSON-ready dicts) ---
+
+    def coins_view(self):
+        coins = {}
+        for (kind, coin), version in self.versions.items():
+            coins.setdefault(coin, {})[kind] = version
+        return {"coins": coins}
+
+    def l2_view(self, coin, depth):
+        book = self.l2[coin]
+        bids, asks = book["levels"]
+        return {"coin": coin, "time": book.get("time"), "bids": bids[:depth], "asks": asks[:depth]}
+
+    def l4_view(self, coin, depth):
+        snapshot = self.l4[coin].snapshot(depth)
+
+        def levels(side):
+            return [{"px": level.px, "sz": round(level.sz, 8), "n": level.n} for level in side]
+        return {"coin": coin, "height": snapshot.height, "orders": len(self.l4[coin].orders),
+                "bids": levels(snapshot.bids), "asks": levels(snapshot.asks)}
+
+    def metrics_view(self, coin, _=None):
+        view = {"coin": coin}
+        analyzer = self.analyzers.get(coin)
+        if analyzer is not None:
+            view["analyzer"] = {key: (value if value is None or math.isfinite(value) else None)
+                                for key, value in analyzer.snapshot().items()}
+        tracker = self.tracker.trackers.get(coin)
+        if tracker is not None:
+            view["tracker"] = {
+                "latest_price": tracker.get_latest_price(),
+                "vwap": tracker.get_vwap(),
+                "total_volume": tracker.total_volume,
+                "buy_volume": tracker.buy_volume,
+                "sell_volume": tracker.sell_volume,
+                "trade_count": tracker.trade_count,
+                "price_change_pct": tracker.get_price_change(),
+            }
+        return view
+
+    def trades_view(self, coin, limit):
+        recent = self.trades[coin]
+        return {"coin": coin, "trades": [recent[-i] for i in range(1, min(limit, len(recent)) + 1)]}
+
+
+class ResponseCache:
+    """Serialized responses keyed by request, reused while the data's version is unchanged.
+
+    A hit is one dict lookup and one tuple compare, and hands back the exact
+    bytes to write: no view building, no json.dumps, no header formatting.
+    Entries are replaced in place when their version moves on, so the cache
+    holds at most one entry per distinct request.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.entries = {}  # key -> (version, bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, build):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        response = build()
+        if self.enabled:
+            self.entries[key] = (version, response)
+        return response
+
+
+class QueryServer:
+    """GET-only HTTP/1.1 server on asyncio streams, with keep-alive and SSE.
+
+    GET /coins                          coins and their data versions
+    GET /l2/{coin}?depth=20             top of the l2Book
+    GET /l4/{coin}?depth=20             aggregated levels of the L4 book
+    GET /metrics/{coin}                 MarketAnalyzer and CoinTracker metrics
+    GET /trades/{coin}?limit=50         recent trades, newest first
+    GET /stream/{endpoint}/{coin}?...   the same views as Server-Sent Events, pushed on change
+    """
+
+    def __init__(self, state, host=API_HOST, port=API_PORT, cache=True, sse_interval=SSE_INTERVAL):
+        self.state = state
+        self.host = host
+        self.port = port
+        self.cache = ResponseCache(enabled=cache)
+        self.routes = {}  # request target -> resolve() result, so hits skip URL parsing
+        self.sse_interval = sse_interval
+        self.server = None
+        self.connections = set()  # Connection handler tasks
+        self.requests = 0
+        self.streams = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            for task in self.connections:
+                task.cancel()  # Ends open streams and idle keep-alive connections
+            await asyncio.gather(*self.connections)
+            await self.server.wait_closed()
+
+    def resolve(self, target):
+        """(endpoint, coin, size, kinds) for a view URL, or an error response"""
+        path, _, query = target.partition("?")
+        parts = [part for part in path.split("/") if part]
+        if len(parts) != 2 or parts[0] not in ENDPOINTS:
+            return error_response(404, f"no such endpoint: {path}")
+        endpoint, coin = parts
+        kinds, param, default, largest = ENDPOINTS[endpoint]
+        if not self.state.has(kinds, coin):
+            return error_response(404, f"no {endpoint} data for {coin}")
+        size = default
+        if param:
+            values = parse_qs(query).get(param)
+            if values:
+                try:
+                    size = int(values[0])
+                except ValueError:
+                    return error_response(400, f"{param} must be an integer")
+            size = max(1, min(size, largest))
+        return endpoint, coin, size, kinds
+
+    def _build(self, endpoint, coin, size):
+        return _dump(getattr(self.state, f"{endpoint}_view")(coin, size))
+
+    def respond(self, target, if_none_match=None):
+        """The response bytes for one GET"""
+        if target.partition("?")[0].rstrip("/") == "/coins":
+            versions = tuple(sorted(self.state.versions.items()))
+            return self.cache.get(("coins",), versions, lambda: http_response(200, _dump(self.state.coins_view())))
+
+        resolved = self.routes.get(target)
+        if resolved is None:
+            resolved = self.resolve(target)
+            if isinstance(resolved, bytes):
+                return resolved
+            if self.cache.enabled:
+                if len(self.routes) >= MAX_ROUTES:
+                    self.routes.clear()
+                self.routes[target] = resolved
+        endpoint, coin, size, kinds = resolved
+        version = self.state.version(kinds, coin)
+        if if_none_match and if_none_match == _etag(version):
+            return http_response(304, etag=if_none_match)
+        return self.cache.get((endpoint, coin, size), version,
+                              lambda: http_response(200, self._build(endpoint, coin, size), _etag(version)))
+
+    async def _serve(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(error_response(431, f"request headers over {MAX_HEADER_BYTES:,} bytes"))
+                    await writer.drain()
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, protocol = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(error_response(400, "bad request line"))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                self.requests += 1
+                if method != "GET":
+                    writer.write(error_response(405, "only GET is supported"))
+                elif target.startswith("/stream/"):
+                    await self._stream(writer, target[len("/stream"):])
+                    break
+                else:
+                    writer.write(self.respond(target, headers.get("if-none-match")))
+                await writer.drain()
+                if protocol != "HTTP/1.1" or headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # Client went away, or the server is stopping
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def _stream(self, writer, target):
+        """Server-Sent Events: the view whenever its version changes, at most once per sse_interval"""
+        resolved = self.resolve(target)
+        if isinstance(resolved, bytes):
+            writer.write(resolved)
+            return
+        endpoint, coin, size, kinds = resolved
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\n")
+        self.streams += 1
+        sent = None
+        try:
+            while True:
+                version = self.state.version(kinds, coin)
+                if version == sent:
+                    if not await self.state.wait_for_change(coin, SSE_KEEPALIVE):
+                        writer.write(b": keepalive\n\n")  # Lets proxies and clients see the stream is alive
+                        await writer.drain()
+                    continue
+                # Shared by every stream of this view: serialized once per version
+                writer.write(self.cache.get(("sse", endpoint, coin, size), version, lambda: (
+                    f"id: {_etag(version)[1:-1]}\nevent: {endpoint}\ndata: ".encode()
+                    + self._build(endpoint, coin, size) + b"\n\n")))
+                await writer.drain()  # A slow reader holds up only its own stream
+                sent = version
+                await asyncio.sleep(self.sse_interval)
+        finally:
+            self.streams -= 1
+
+
+async def main():
+    ws_url = os.getenv("WEBSOCKET_URL")
+
+    if not ws_url:
+        print("Error: WEBSOCKET_URL not found in .env file")
+        return
+
+    state = MarketState()
+    # Increase max_size to handle large L4 orderbook messages (default is 1MB)
+    client = RobustWSClient(ws_url, connect_kwargs={"max_size": 10 * 1024 * 1024})
+    client.handlers["l2Book"] = state.handle_l2_book
+    client.handlers["trades"] = state.handle_trades
+    client.handlers["l4Book"] = state.handle_l4_book
+    for coin in BOOK_COINS:
+        client.add_subscription("l2Book", coin)
+        client.add_subscription("trades", coin)
+    client.add_subscription("l4Book", L4_COIN)
+
+    server = QueryServer(state)
+    await server.start()
+    base = f"http://{server.host}:{server.port}"
+    print(f"🌐 Serving on {base}")
+    print(f"   curl {base}/coins")
+    print(f"   curl {base}/l2/{BOOK_COINS[0]}?depth=10")
+    print(f"   curl {base}/l4/{L4_COIN}?depth=10")
+    print(f"   curl {base}/metrics/{BOOK_COINS[0]}")
+    print(f"   curl {base}/trades/{BOOK_COINS[0]}?limit=20")
+    print(f"   curl -N {base}/stream/l2/{BOOK_COINS[0]}?depth=5\n")
+
+    try:
+        await client.listen()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nStopping...")
+    finally:
+        await client.stop()
+        await server.stop()
+        cache = server.cache
+        print(f"🌐 {server.requests:,} requests | cache {cache.hits:,} hits / {cache.misses:,} misses")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
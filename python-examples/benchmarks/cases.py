@@ -0,0 +1,215 @@
+"""
+Benchmark Cases
+Each case times one hot path of the examples over a fixture
+"""
+
+import asyncio
+import json
+import multiprocessing
+import sys
+import websockets
+from pathlib import Path
+
+EXAMPLES = Path(__file__).parent.parent
+for example in ("04_multi_coin_tracker", "06_data_analysis", "07_l4_orderbook", "09_message_router"):
+    sys.path.insert(0, str(EXAMPLES / example))
+from l4_orderbook import L4OrderBook  # noqa: E402
+from market_metrics import MarketAnalyzer  # noqa: E402
+from message_router import MessageRouter  # noqa: E402
+from multi_coin_tracker import MultiCoinTracker  # noqa: E402
+
+from replay_server import HOST, run_server  # noqa: E402
+
+E2E_PORT = 8799
+
+CASES = {}  # name -> Case
+
+
+class Case:
+    """A benchmark: setup(fixtures) builds fresh state outside the timing, run(state) is timed
+    and returns the number of operations it performed. prepare/cleanup run once around all repeats."""
+
+    def __init__(self, name, setup, run, unit, prepare=None, cleanup=None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.unit = unit
+        self.prepare = prepare
+        self.cleanup = cleanup
+
+
+def case(name, unit, setup=lambda fx: fx, prepare=None, cleanup=None):
+    """Register the decorated function as the timed part of a case"""
+    def register(run):
+        CASES[name] = Case(name, setup, run, unit, prepare, cleanup)
+        return run
+    return register
+
+
+# --- Decoding -----------------------------------------------------------------
+
+def _decode_case(kind):
+    @case(f"decode.{kind}", "frame", setup=lambda fx: fx.raw[kind])
+    def run(frames):
+        loads = json.loads
+        for message in frames:
+            loads(message)
+        return len(frames)
+
+
+for _kind in ("trades", "l2Book", "l4Book_updates", "l4Book_snapshot"):
+    _decode_case(_kind)
+
+
+# --- L4 order book ------------------------------------------------------------
+
+@case("l4.process_snapshot", "snapshot", setup=lambda fx: fx.l4_snapshot())
+def l4_process_snapshot(snapshot):
+    L4OrderBook().process_snapshot(snapshot)
+    return 1
+
+
+def _book_with_snapshot(fx):
+    book = L4OrderBook()
+    book.process_snapshot(fx.l4_snapshot())
+    return book, fx.l4_updates()
+
+
+@case("l4.process_update", "update", setup=_book_with_snapshot)
+def l4_process_update(state):
+    book, updates = state
+    for update in updates:
+        book.process_update(update)
+    return len(updates)
+
+
+def _book_after_updates(fx):
+    book, updates = _book_with_snapshot(fx)
+    for update in updates:
+        book.process_update(update)
+    return book
+
+
+@case("l4.get_sorted_levels", "call", setup=_book_after_updates)
+def l4_get_sorted_levels(book):
+    for _ in range(1_000):
+        book.get_sorted_levels(max_orders=100)
+    return 1_000
+
+
+# --- Analytics ------------------------------------------------------------------
+
+def _trade_rows(fx):
+    return [(t["px"], t["sz"], t["side"]) for data in fx.decoded("trades") for t in data["data"]]
+
+
+@case("analyzer.add_trade", "trade", setup=lambda fx: (MarketAnalyzer(history_size=100), _trade_rows(fx)))
+def analyzer_add_trade(state):
+    analyzer, rows = state
+    for px, sz, side in rows:
+        analyzer.add_trade(px, sz, side)
+    return len(rows)
+
+
+def _filled_analyzer(fx):
+    analyzer = MarketAnalyzer(history_size=100)
+    for px, sz, side in _trade_rows(fx)[:100]:
+        analyzer.add_trade(px, sz, side)
+        analyzer.add_spread(0.5)
+    return analyzer
+
+
+@case("analyzer.metrics", "call", setup=_filled_analyzer)
+def analyzer_metrics(analyzer):
+    for _ in range(2_000):
+        analyzer.get_vwap()
+        analyzer.get_buy_sell_ratio()
+        analyzer.get_avg_spread()
+        analyzer.get_price_change()
+    return 2_000
+
+
+@case("tracker.handle_trade", "frame", setup=lambda fx: (MultiCoinTracker(display_interval=0), fx.decoded("trades")))
+def tracker_handle_trade(state):
+    tracker, frames = state
+    for data in frames:
+        tracker.handle_trade(data)
+    return len(frames)
+
+
+def _filled_tracker(fx):
+    tracker = MultiCoinTracker(display_interval=0)
+    for data in fx.decoded("trades"):
+        tracker.handle_trade(data)
+    return tracker
+
+
+@case("tracker.snapshot", "call", setup=_filled_tracker)
+def tracker_snapshot(tracker):
+    for _ in range(2_000):
+        tracker.snapshot()
+    return 2_000
+
+
+# --- End to end -------------------------------------------------------------------
+
+_server = {}
+
+
+def _start_server(fx):
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=run_server, args=(fx.all_frames(), HOST, E2E_PORT, ready), daemon=True)
+    process.start()
+    if not ready.wait(30):
+        process.terminate()
+        raise RuntimeError("Replay server did not start")
+    _server["process"] = process
+
+
+def _stop_server(fx):
+    process = _server.pop("process", None)
+    if process:
+        process.terminate()
+        process.join()
+
+
+def _e2e_pipeline(fx):
+    tracker = MultiCoinTracker(display_interval=0)
+    analyzer = MarketAnalyzer(history_size=100)
+    book = L4OrderBook()
+
+    def on_trades(data):
+        tracker.handle_trade(data)
+        for trade in data["data"]:
+            analyzer.add_trade(trade["px"], trade["sz"], trade["side"])
+
+    def on_l4(data):
+        snapshot = data["data"].get("Snapshot")
+        if snapshot:
+            book.process_snapshot(snapshot)
+        updates = data["data"].get("Updates")
+        if updates:
+            book.process_update(updates)
+
+    router = MessageRouter()
+    router.subscribe("trades", on_trades)
+    router.subscribe("l2Book", lambda data: None)
+    router.subscribe("l4Book", on_l4)
+    router.ignore("subscriptionResponse")
+    return router
+
+
+async def _consume(router):
+    frames = 0
+    async with websockets.connect(f"ws://{HOST}:{E2E_PORT}", max_size=None) as websocket:
+        await websocket.send(json.dumps({"method": "replay"}))
+        async for message in websocket:
+            router.dispatch_raw(message)
+            frames += 1
+    return frames
+
+
+@case("e2e.replay_server", "frame", setup=_e2e_pipeline, prepare=_start_server, cleanup=_stop_server)
+def e2e_replay_server(router):
+    """Socket receive + decode + route + handlers, against a local server in another process"""
+    return asyncio.run(_consume(router))
@@ -0,0 +1,169 @@
+"""
+Benchmark Fixtures
+Deterministic synthetic frames, or frames taken from a recording, for every channel
+"""
+
+import gzip
+import json
+import random
+
+SEED = 42
+COINS = [f"COIN{i}" for i in range(20)] + ["BTC", "ETH", "SOL", "HYPE", "ARB"]
+TRADE_FRAMES = 20_000
+L2_FRAMES = 5_000
+L2_LEVELS = 20
+L4_ORDERS = 4_000
+L4_UPDATES = 5_000
+L4_DIFFS_PER_UPDATE = 12
+MID = 97_000
+
+
+class Fixtures:
+    """Raw frames (as the socket delivers them) grouped by kind.
+
+    raw["trades"], raw["l2Book"], raw["l4Book_updates"]: lists of JSON strings
+    raw["l4Book_snapshot"]: a one-element list
+    """
+
+    def __init__(self, raw, source):
+        self.raw = raw
+        self.source = source
+        self._decoded = {}
+
+    def decoded(self, kind):
+        """Decoded frames, parsed once and cached"""
+        if kind not in self._decoded:
+            self._decoded[kind] = [json.loads(message) for message in self.raw[kind]]
+        return self._decoded[kind]
+
+    def l4_snapshot(self):
+        return self.decoded("l4Book_snapshot")[0]["data"]["Snapshot"]
+
+    def l4_updates(self):
+        return [data["data"]["Updates"] for data in self.decoded("l4Book_updates")]
+
+    def all_frames(self):
+        """Every frame in one stream, for end-to-end runs"""
+        frames = list(self.raw["l4Book_snapshot"])
+        streams = [self.raw["trades"], self.raw["l2Book"], self.raw["l4Book_updates"]]
+        longest = max(len(stream) for stream in streams)
+        for i in range(longest):
+            for stream in streams:
+                if i < len(stream):
+                    frames.append(stream[i])
+        return frames
+
+
+def _dump(data):
+    return json.dumps(data, separators=(",", ":"))
+
+
+def synthetic(seed=SEED):
+    """Synthetic frames shaped like the live feed; the same seed gives the same bytes"""
+    rng = random.Random(seed)
+    users = [f"0x{rng.getrandbits(160):040x}" for _ in range(300)]
+    now = 1_700_000_000_000
+
+    trades = []
+    for i in range(TRADE_FRAMES):
+        coin = rng.choice(COINS)
+        batch = [{
+            "coin": coin, "side": rng.choice("AB"), "px": f"{rng.uniform(1, 100_000):.2f}",
+            "sz": f"{rng.uniform(0.001, 10):.4f}", "time": now + i * 10, "hash": f"0x{rng.getrandbits(256):064x}",
+            "tid": i * 8 + j, "users": rng.sample(users, 2),
+        } for j in range(rng.randint(1, 4))]
+        trades.append(_dump({"channel": "trades", "data": batch}))
+
+    l2 = []
+    for i in range(L2_FRAMES):
+        mid = rng.uniform(1, 100_000)
+        tick = mid / 10_000
+        l2.append(_dump({"channel": "l2Book", "data": {"coin": rng.choice(COINS), "time": now + i * 50, "levels": [
+            [{"px": f"{mid - tick * (j + 1):.6f}", "sz": f"{rng.uniform(0.1, 10):.4f}", "n": rng.randint(1, 20)} for j in range(L2_LEVELS)],
+            [{"px": f"{mid + tick * (j + 1):.6f}", "sz": f"{rng.uniform(0.1, 10):.4f}", "n": rng.randint(1, 20)} for j in range(L2_LEVELS)],
+        ]}}))
+
+    live = {}  # oid -> [side, size when placed, size now]
+    next_oid = 1
+
+    def new_order(side):
+        nonlocal next_oid
+        oid = next_oid
+        next_oid += 1
+        distance = int(rng.expovariate(1 / 15)) + 1
+        px = MID - distance if side == "B" else MID + distance
+        sz = round(rng.uniform(0.001, 2), 4)
+        live[oid] = [side, sz, sz]
+        return {"oid": oid, "user": rng.choice(users), "limitPx": str(px), "sz": f"{sz:.4f}"}
+
+    bids, asks = [], []
+    for _ in range(L4_ORDERS):
+        side = rng.choice("BA")
+        (bids if side == "B" else asks).append(new_order(side))
+    snapshot = [_dump({"channel": "l4Book", "data": {"Snapshot": {"coin": "BTC", "height": 0, "levels": [bids, asks]}}})]
+
+    updates = []
+    for height in range(1, L4_UPDATES + 1):
+        diffs, statuses = [], []
+        for _ in range(L4_DIFFS_PER_UPDATE):
+            roll = rng.random()
+            if live and roll < 0.4:
+                oid = rng.choice(list(live)[-100:])
+                side = live.pop(oid)[0]
+                diffs.append({"user": None, "oid": oid, "px": None, "coin": "BTC", "raw_book_diff": "remove"})
+                statuses.append({"time": now, "user": None, "status": "canceled", "order": {"oid": oid, "side": side, "coin": "BTC"}})
+            elif live and roll < 0.55:
+                # Partial fill; picking among few recent orders makes repeated fills of one oid common.
+                # origSz stays the size when placed, as on the wire
+                oid = rng.choice(list(live)[-20:])
+                order = live[oid]
+                if order[2] < 0.002:
+                    continue
+                order[2] = round(order[2] * rng.uniform(0.2, 0.9), 4) or 0.0001
+                diffs.append({"user": None, "oid": oid, "px": None, "coin": "BTC",
+                              "raw_book_diff": {"update": {"origSz": f"{order[1]:.4f}", "newSz": f"{order[2]:.4f}"}}})
+                statuses.append({"time": now, "user": None, "status": "open", "order": {"oid": oid, "side": order[0], "coin": "BTC"}})
+            else:
+                side = rng.choice("BA")
+                order = new_order(side)
+                diffs.append({"user": order["user"], "oid": order["oid"], "px": order["limitPx"], "coin": "BTC",
+                              "raw_book_diff": {"new": {"sz": order["sz"]}}})
+                statuses.append({"time": now, "user": order["user"], "status": "open",
+                                 "order": {"oid": order["oid"], "side": side, "coin": "BTC", "limitPx": order["limitPx"], "sz": order["sz"]}})
+        updates.append(_dump({"channel": "l4Book", "data": {"Updates": {
+            "time": now + height * 100, "height": height, "order_statuses": statuses, "book_diffs": diffs,
+        }}}))
+
+    return Fixtures({"trades": trades, "l2Book": l2, "l4Book_snapshot": snapshot, "l4Book_updates": updates},
+                    f"synthetic (seed {seed})")
+
+
+def recorded(path, limit=None):
+    """Frames from a recording made with 15_offline_replay/recorder.py (.jsonl or .jsonl.gz)"""
+    limits = {"trades": TRADE_FRAMES, "l2Book": L2_FRAMES, "l4Book_updates": L4_UPDATES, "l4Book_snapshot": 1}
+    if limit:
+        limits = dict.fromkeys(limits, limit)
+        limits["l4Book_snapshot"] = 1
+    raw = {kind: [] for kind in limits}
+
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            channel = json.loads(line).get("channel")
+            if channel == "l4Book":
+                # Updates only make sense after the snapshot they apply to
+                kind = "l4Book_updates" if raw["l4Book_snapshot"] else "l4Book_snapshot"
+                if kind == "l4Book_snapshot" and '"Snapshot"' not in line:
+                    continue
+            else:
+                kind = channel
+            if kind in raw and len(raw[kind]) < limits[kind]:
+                raw[kind].append(line)
+
+    missing = [kind for kind, frames in raw.items() if not frames]
+    if missing:
+        raise ValueError(f"{path} has no frames for: {', '.join(missing)}")
+    return Fixtures(raw, f"recording {path}")
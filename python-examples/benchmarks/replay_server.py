@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Local Replay Server
+Serve recorded or synthetic frames over a local WebSocket, as fast as the client can take them
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import websockets
+from pathlib import Path
+
+import fixtures
+
+# Reuse the raw-frame routing peek from example 09
+sys.path.insert(0, str(Path(__file__).parent.parent / "09_message_router"))
+from message_router import peek_route  # noqa: E402
+
+HOST = "127.0.0.1"
+PORT = 8765
+SUBSCRIBE_WAIT = 0.2  # Seconds to collect subscriptions before streaming starts
+
+
+class ReplayServer:
+    """Streams a fixed list of raw frames to every client.
+
+    Clients subscribe the same way as with the real server; only frames matching
+    one of their (type, coin) subscriptions are sent. A client that sends
+    {"method": "replay"} gets every frame. The connection is closed at the end,
+    so a client's receive loop finishes once it has seen everything.
+    """
+
+    def __init__(self, frames, rate=None):
+        self.frames = frames
+        self.routes = [peek_route(frame) for frame in frames]
+        self.rate = rate  # Frames per second, None = unthrottled
+
+    async def handler(self, websocket):
+        wanted = set()
+        everything = False
+        try:
+            # Collect subscriptions until the client goes quiet
+            while True:
+                message = await asyncio.wait_for(websocket.recv(), SUBSCRIBE_WAIT)
+                request = json.loads(message)
+                if request.get("method") == "replay":
+                    everything = True
+                    break
+                subscription = request.get("subscription", {})
+                wanted.add((subscription.get("type"), subscription.get("coin")))
+                await websocket.send(json.dumps({"channel": "subscriptionResponse", "data": request}))
+        except asyncio.TimeoutError:
+            pass
+
+        delay = 1 / self.rate if self.rate else 0
+        for frame, route in zip(self.frames, self.routes):
+            if everything or route in wanted:
+                await websocket.send(frame)
+                if delay:
+                    await asyncio.sleep(delay)
+        await websocket.close()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """Run until cancelled; sets the `ready` event (if given) once listening"""
+        async with websockets.serve(self.handler, host, port, max_size=None):
+            if ready is not None:
+                ready.set()
+            await asyncio.Future()
+
+
+def run_server(frames, host, port, ready):
+    """Process entry point used by the end-to-end benchmark"""
+    asyncio.run(ReplayServer(frames).serve(host, port, ready))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve frames on a local WebSocket for the examples and benchmarks")
+    parser.add_argument("recording", nargs="?", help="A .jsonl / .jsonl.gz recording (default: synthetic frames)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--rate", type=float, help="Frames per second per client (default: as fast as possible)")
+    args = parser.parse_args()
+
+    data = fixtures.recorded(args.recording) if args.recording else fixtures.synthetic()
+    frames = data.all_frames()
+    print(f"🔁 Serving {len(frames):,} frames from {data.source} on ws://{HOST}:{args.port}")
+    print(f"💡 Point an example at it with WEBSOCKET_URL=ws://{HOST}:{args.port}\n")
+    try:
+        asyncio.run(ReplayServer(frames, args.rate).serve(HOST, args.port))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == "__main__":
+    main()
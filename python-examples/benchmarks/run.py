@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Time every case, save the results per commit and compare them with an earlier run
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fixtures
+from cases import CASES
+
+RESULTS_DIR = Path(__file__).parent / "results"
+REPEATS = 5
+REGRESSION_THRESHOLD = 0.10  # Flag cases more than 10% slower than the baseline
+
+
+def git_commit():
+    """Short commit hash of the tree being measured, with -dirty if it has local changes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True, cwd=Path(__file__).parent).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", str(Path(__file__).parent.parent)],
+                               capture_output=True, text=True, cwd=Path(__file__).parent).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def time_case(bench, fx, repeats):
+    """Run a case `repeats` times on fresh state; returns ns per operation for each repeat"""
+    samples = []
+    ops = 0
+    if bench.prepare:
+        bench.prepare(fx)
+    try:
+        for _ in range(repeats):
+            state = bench.setup(fx)
+            start = time.perf_counter_ns()
+            ops = bench.run(state)
+            samples.append((time.perf_counter_ns() - start) / ops)
+    finally:
+        if bench.cleanup:
+            bench.cleanup(fx)
+    return samples, ops
+
+
+def format_ns(ns):
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} µs"
+    return f"{ns:.0f} ns"
+
+
+def compare(results, meta, baseline_path):
+    """Print the change of each case's median against a saved run"""
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\n📊 Compared with {baseline['meta']['commit']} ({baseline_path})")
+    print(f"{'Case':<28} {'Baseline':>12} {'Now':>12} {'Change':>9}")
+    print("-" * 65)
+    regressions = 0
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"{name:<28} {'-':>12} {format_ns(result['median_ns']):>12} {'new':>9}")
+            continue
+        change = result["median_ns"] / before["median_ns"] - 1
+        flag = ""
+        if change > REGRESSION_THRESHOLD:
+            flag = " ⚠️"
+            regressions += 1
+        elif change < -REGRESSION_THRESHOLD:
+            flag = " 🚀"
+        print(f"{name:<28} {format_ns(before['median_ns']):>12} {format_ns(result['median_ns']):>12} {change:>+8.1%}{flag}")
+    for key in ("fixtures", "python", "machine"):
+        if baseline["meta"].get(key) != meta[key]:
+            print(f"💡 Baseline {key} differs ({baseline['meta'].get(key)} vs {meta[key]}): numbers may not be comparable")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the examples' hot paths")
+    parser.add_argument("-k", "--filter", default="*", help="Only run cases matching this glob, e.g. 'l4.*'")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--recording", help="Take fixtures from a recording instead of synthetic data")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare with")
+    parser.add_argument("--no-save", action="store_true", help=f"Don't write results to {RESULTS_DIR.name}/")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args()
+
+    selected = [bench for name, bench in CASES.items() if fnmatch.fnmatch(name, args.filter)]
+    if args.list or not selected:
+        print("\n".join(CASES) if args.list else f"No cases match {args.filter!r}")
+        return
+
+    fx = fixtures.recorded(args.recording) if args.recording else fixtures.synthetic()
+    meta = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "fixtures": fx.source,
+        "repeats": args.repeats,
+    }
+    print(f"⏱️  {len(selected)} cases, {args.repeats} repeats, fixtures: {fx.source}, commit {meta['commit']}\n")
+    print(f"{'Case':<28} {'Median':>12} {'Min':>12} {'Per second':>16} {'Spread':>8}")
+    print("-" * 80)
+
+    results = {}
+    for bench in selected:
+        samples, ops = time_case(bench, fx, args.repeats)
+        median = statistics.median(samples)
+        best = min(samples)
+        spread = (max(samples) - best) / median
+        results[bench.name] = {"median_ns": median, "min_ns": best, "unit": bench.unit, "ops": ops,
+                               "samples_ns": samples}
+        rate = f"{1e9 / median:,.0f}/{bench.unit}"
+        print(f"{bench.name:<28} {format_ns(median):>12} {format_ns(best):>12} {rate:>16} {spread:>8.0%}")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / f"{meta['commit']}.json"
+        path.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+        print(f"\n💾 Saved {path}")
+
+    if args.compare:
+        if compare(results, meta, args.compare):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
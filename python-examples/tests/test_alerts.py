@@ -0,0 +1,85 @@
+"""AlertEngine (example 21): the (channel, coin, metric) index raises the same alerts as scanning every rule"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "21_alerting"))
+from alerts import AlertEngine, Rule, default_rules  # noqa: E402
+
+COINS = [f"COIN{i}" for i in range(20)]
+
+
+class ScanEngine(AlertEngine):
+    """Every update evaluates every rule of the channel, changed or not"""
+
+    def update(self, channel, coin, metrics, context=None):
+        last = self.values.setdefault((channel, coin), {})
+        now = self.clock()
+        for rule in self.rules:
+            if rule.channel == channel and rule.coin in (None, coin) and rule.metric in metrics:
+                self.evaluate(rule, coin, metrics[rule.metric], last.get(rule.metric), now, context)
+        last.update(metrics)
+
+
+def make_rules(rng):
+    rules = list(default_rules())
+    for coin in COINS[:10]:
+        rules.append(Rule(f"{coin} above", "l2Book", "mid", above=rng.uniform(100.5, 102), hysteresis=0.3, coin=coin))
+        rules.append(Rule(f"{coin} below", "l2Book", "mid", below=rng.uniform(98, 99.5), hold=0.05, coin=coin))
+        rules.append(Rule(f"{coin} whale", "trades", "largest_trade", above=50_000, on_event=True,
+                          cooldown=0.02, coin=coin))
+    rules.append(Rule("any mid move", "l2Book", "mid", on_change=True, cooldown=0.1))
+    return rules
+
+
+def make_updates(rng, count=20_000):
+    mids = {coin: 100.0 for coin in COINS}
+    updates = []
+    for _ in range(count):
+        coin = rng.choice(COINS)
+        if rng.random() < 0.6:
+            if rng.random() < 0.4:
+                mids[coin] = round(mids[coin] * (1 + rng.gauss(0, 0.004)), 2)
+            metrics = {"mid": mids[coin], "spread_bps": rng.choice([1.0, 2.0, 2.0, 12.0]),
+                       "imbalance": round(rng.uniform(-1, 1), 1), "imbalance_side": rng.choice([1, -1])}
+            updates.append(("l2Book", coin, metrics))
+        else:
+            # Repeated values on purpose: each trades frame is a separate event
+            notional = rng.choice([1_000, 60_000, 60_000, 600_000])
+            updates.append(("trades", coin, {"last_px": mids[coin], "largest_trade": notional}))
+    return updates
+
+
+def run(engine_class, rules, updates):
+    clock = [0.0]
+    alerts = []
+    engine = engine_class(publish=alerts.append, clock=lambda: clock[0])
+    for rule in rules:
+        engine.add_rule(rule)
+    for channel, coin, metrics in updates:
+        clock[0] += 0.001
+        engine.tick(clock[0])
+        engine.update(channel, coin, metrics)
+    return sorted((a.rule.name, a.coin, a.kind, a.value) for a in alerts)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_scan(seed):
+    rng = random.Random(seed)
+    rules = make_rules(rng)
+    updates = make_updates(rng)
+    indexed = run(AlertEngine, rules, updates)
+    assert indexed == run(ScanEngine, rules, updates)
+    assert {name for name, *_ in indexed} >= {"large trade", "COIN0 whale", "any mid move"}
+
+
+def test_event_rule_fires_on_every_event():
+    alerts = []
+    engine = AlertEngine(publish=alerts.append, clock=lambda: 0.0)
+    engine.add_rule(Rule("large trade", "trades", "largest_trade", above=500_000, on_event=True))
+    for notional in (600_000, 600_000, 100, 700_000):
+        engine.update("trades", "BTC", {"largest_trade": notional})
+    assert [alert.value for alert in alerts] == [600_000, 600_000, 700_000]
@@ -0,0 +1,79 @@
+"""CandleEngine (example 19) rollover against grouping every trade by bar"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "19_ohlcv_candles"))
+from candles import CandleEngine  # noqa: E402
+
+INTERVALS = {"1s": 1_000, "1m": 60_000, "5m": 300_000}
+GRACE_MS = 2_000
+
+
+def make_trades(rng, count=20_000):
+    """(coin, time_ms, px, sz, is_buy) in arrival order; exchange times jitter less than the grace period"""
+    trades = []
+    now = 1_700_000_000_000
+    for _ in range(count):
+        now += rng.randint(0, 120)
+        time_ms = now - rng.randint(0, GRACE_MS // 2)
+        trades.append((rng.choice(("BTC", "ETH")), time_ms, round(rng.uniform(90, 110), 2),
+                       round(rng.uniform(0.01, 2), 3), rng.random() < 0.5))
+    return trades
+
+
+def brute_force(trades):
+    """(coin, interval, start) -> (open, high, low, close, volume, buy volume, trades)"""
+    bars = {}
+    for order, (coin, time_ms, px, sz, is_buy) in enumerate(trades):
+        for label, length in INTERVALS.items():
+            bars.setdefault((coin, label, time_ms - time_ms % length), []).append((time_ms, order, px, sz, is_buy))
+    result = {}
+    for key, rows in bars.items():
+        by_time = sorted(rows)  # Exchange time, then arrival order
+        result[key] = (by_time[0][2], max(r[2] for r in rows), min(r[2] for r in rows), by_time[-1][2],
+                       sum(r[3] for r in rows), sum(r[3] for r in rows if r[4]), len(rows))
+    return result
+
+
+def test_closed_bars_match_brute_force():
+    rng = random.Random(7)
+    trades = make_trades(rng)
+    closed = []
+    engine = CandleEngine(INTERVALS, grace_ms=GRACE_MS, on_close=closed.append)
+    for i, trade in enumerate(trades):
+        engine.add_trade(*trade)
+        if i % 5 == 0:
+            engine.advance(engine.watermark)
+    engine.close_all()
+
+    assert engine.late_trades == 0
+    got = {(c.coin, c.interval, c.start): c for c in closed}
+    expected = brute_force(trades)
+    assert got.keys() == expected.keys()
+    for key, (open_, high, low, close, volume, buy_volume, count) in expected.items():
+        candle = got[key]
+        # Open/close follow exchange time; on ties the first / last trade to arrive wins
+        assert (candle.open, candle.high, candle.low, candle.close, candle.trades) == \
+            (open_, high, low, close, count), key
+        assert candle.volume == pytest.approx(volume)
+        assert candle.buy_volume == pytest.approx(buy_volume)
+
+
+def test_rollover_closes_after_grace_and_drops_late_trades():
+    closed = []
+    engine = CandleEngine({"1s": 1_000}, grace_ms=500, on_close=closed.append)
+    engine.add_trade("BTC", 10_100, 100.0, 1.0, True)
+    engine.add_trade("BTC", 10_900, 101.0, 1.0, False)
+    engine.advance(11_499)
+    assert closed == []                      # Still inside the grace period
+    engine.add_trade("BTC", 10_400, 99.0, 1.0, True)   # Late, but in time
+    engine.advance(11_500)
+    assert [(c.start, c.open, c.high, c.low, c.close, c.trades) for c in closed] == \
+        [(10_000, 100.0, 101.0, 99.0, 101.0, 3)]
+    engine.add_trade("BTC", 10_950, 102.0, 1.0, True)  # Its bar has closed
+    assert engine.late_trades == 1
+    assert engine.open_bar("BTC", "1s") is None
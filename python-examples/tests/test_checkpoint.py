@@ -0,0 +1,71 @@
+"""L4 checkpoints (example 20): save, load and catch up give the same book as replaying the feed"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+EXAMPLES = Path(__file__).parent.parent
+sys.path.insert(0, str(EXAMPLES / "20_l4_checkpoint"))
+sys.path.insert(0, str(EXAMPLES / "benchmarks"))
+from checkpoint import CheckpointError, L4OrderBook, catch_up, load_checkpoint, save_checkpoint  # noqa: E402
+from fixtures import synthetic  # noqa: E402
+
+
+def state(book):
+    """Everything a checkpoint must preserve, levels in queue order"""
+    return (book.coin, book.height, book.orders,
+            [(px, list(book.bids[px])) for _, px in book.bid_ladder],
+            [(px, list(book.asks[px])) for _, px in book.ask_ladder])
+
+
+@pytest.fixture(scope="module")
+def feed():
+    fx = synthetic()
+    return fx.l4_snapshot(), fx.l4_updates()
+
+
+def replayed(feed, count):
+    snapshot, updates = feed
+    book = L4OrderBook()
+    book.process_snapshot(snapshot)
+    for update in updates[:count]:
+        book.process_update(update)
+    return book
+
+
+def test_round_trip(feed, tmp_path):
+    book = replayed(feed, 2_000)
+    path = tmp_path / "BTC.l4ck"
+    save_checkpoint(book, path)
+    assert state(load_checkpoint(path)) == state(book)
+
+
+def test_catch_up_matches_replay(feed, tmp_path):
+    path = tmp_path / "BTC.l4ck"
+    save_checkpoint(replayed(feed, 1_000), path)
+    book = load_checkpoint(path)
+    _, updates = feed
+    # Overlapping buffer: already applied heights and an exact duplicate are skipped
+    buffered = updates[900:1_500] + updates[1_499:1_500] + updates[1_500:2_000]
+    assert catch_up(book, buffered) == 1_000
+    assert state(book) == state(replayed(feed, 2_000))
+
+
+def test_catch_up_stops_at_gap(feed, tmp_path):
+    path = tmp_path / "BTC.l4ck"
+    save_checkpoint(replayed(feed, 1_000), path)
+    book = load_checkpoint(path)
+    _, updates = feed
+    assert catch_up(book, updates[1_000:1_100] + updates[1_200:1_300]) == 100
+    assert state(book) == state(replayed(feed, 1_100))
+
+
+def test_corrupt_checkpoint_is_rejected(feed, tmp_path):
+    path = tmp_path / "BTC.l4ck"
+    save_checkpoint(replayed(feed, 10), path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(CheckpointError):
+        load_checkpoint(path)
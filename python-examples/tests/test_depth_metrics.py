@@ -0,0 +1,91 @@
+"""DepthMetrics (example 13) against sums recomputed from every level"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+EXAMPLES = Path(__file__).parent.parent
+sys.path.insert(0, str(EXAMPLES / "13_depth_metrics"))
+sys.path.insert(0, str(EXAMPLES / "benchmarks"))
+from depth_metrics import DEPTH_BANDS_BPS, IMBALANCE_LEVELS, DepthMetrics, L4OrderBook  # noqa: E402
+from fixtures import synthetic  # noqa: E402
+
+
+def check(metrics, bids, asks):
+    """bids/asks: {price: size} with nothing at zero"""
+    bid_levels = sorted(bids.items(), reverse=True)
+    ask_levels = sorted(asks.items())
+    for n in IMBALANCE_LEVELS:
+        for side, levels in ((metrics.bids, bid_levels), (metrics.asks, ask_levels)):
+            assert side.qty[n] == pytest.approx(sum(sz for _, sz in levels[:n]), abs=1e-6)
+            assert side.notional[n] == pytest.approx(sum(px * sz for px, sz in levels[:n]), rel=1e-9, abs=1e-6)
+    mid = metrics.mid()
+    if mid is None:
+        return
+    assert mid == (bid_levels[0][0] + ask_levels[0][0]) / 2
+    for bps in DEPTH_BANDS_BPS:
+        expected = (sum(sz for px, sz in bid_levels if px >= mid * (1 - bps / 10_000)),
+                    sum(sz for px, sz in ask_levels if px <= mid * (1 + bps / 10_000)))
+        assert metrics.depth_within(bps) == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_level_changes_match_brute_force(seed):
+    rng = random.Random(seed)
+    metrics = DepthMetrics("TEST")
+    book = {"bid": {}, "ask": {}}
+    center = 100.0
+    for step in range(4_000):
+        center += rng.gauss(0, 0.01)  # Drifting prices make the mid, and so the bands, move
+        side = rng.choice(("bid", "ask"))
+        offset = round(rng.uniform(0.001, 0.5), 3)
+        price = round(center - offset if side == "bid" else center + offset, 3)
+        other = book["ask" if side == "bid" else "bid"]
+        if any(px <= price for px in other) if side == "bid" else any(px >= price for px in other):
+            continue  # Keep the book uncrossed
+        size = 0 if rng.random() < 0.3 else round(rng.uniform(0.1, 5), 3)
+        metrics.set_level(side, price, size)
+        if size:
+            book[side][price] = size
+        else:
+            book[side].pop(price, None)
+        metrics._after_changes()
+        if step % 10 == 0:
+            check(metrics, book["bid"], book["ask"])
+    check(metrics, book["bid"], book["ask"])
+
+
+def test_l4_changes_match_brute_force():
+    fx = synthetic()
+    orderbook = L4OrderBook()
+    orderbook.process_snapshot(fx.l4_snapshot())
+    metrics = DepthMetrics(orderbook.coin)
+    metrics.load_l4(orderbook)
+    for i, update in enumerate(fx.l4_updates()[:1_000]):
+        orderbook.process_update(update)
+        metrics.apply_l4_changes(orderbook.last_changes)
+        if i % 100 == 0:
+            levels = {}
+            for side, book_side in (("bid", orderbook.bids), ("ask", orderbook.asks)):
+                levels[side] = {float(px): sum(float(orderbook.orders[oid]["sz"]) for oid in oids)
+                                for px, oids in book_side.items()}
+            check(metrics, levels["bid"], levels["ask"])
+
+
+def test_repeated_partial_fills_move_level_by_each_delta():
+    orderbook = L4OrderBook()
+    orderbook.process_snapshot({"coin": "BTC", "height": 0, "levels": [
+        [{"oid": 1, "user": "a", "limitPx": "99", "sz": "10"}],
+        [{"oid": 2, "user": "b", "limitPx": "101", "sz": "5"}],
+    ]})
+    metrics = DepthMetrics(orderbook.coin)
+    metrics.load_l4(orderbook)
+    # origSz stays the size the order was placed with; only newSz moves
+    for height, new_sz in enumerate(("8", "5", "1"), start=1):
+        orderbook.process_update({"height": height, "order_statuses": [], "book_diffs": [
+            {"oid": 1, "user": None, "px": None, "raw_book_diff": {"update": {"origSz": "10", "newSz": new_sz}}},
+        ]})
+        metrics.apply_l4_changes(orderbook.last_changes)
+        check(metrics, {99.0: float(new_sz)}, {101.0: 5.0})
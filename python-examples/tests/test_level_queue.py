@@ -0,0 +1,63 @@
+"""LevelQueue (example 12) against a plain list of (oid, size) in queue order"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "12_order_analytics"))
+from order_analytics import LevelQueue  # noqa: E402
+
+
+def ahead(queue, oid):
+    """(orders ahead, size ahead) by walking the list"""
+    for i, (other, _) in enumerate(queue):
+        if other == oid:
+            return i, sum(size for _, size in queue[:i])
+    raise KeyError(oid)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    fenwick, brute = LevelQueue(), []
+    next_oid = 0
+    for _ in range(3_000):
+        action = rng.random()
+        if action < 0.45 or not brute:
+            size = round(rng.uniform(0.01, 10), 4)
+            fenwick.append(next_oid, size)
+            brute.append((next_oid, size))
+            next_oid += 1
+        elif action < 0.75:
+            oid = rng.choice(brute)[0]
+            expected = ahead(brute, oid)
+            count, size = fenwick.remove(oid)
+            brute = [entry for entry in brute if entry[0] != oid]
+            assert count == expected[0]
+            assert size == pytest.approx(expected[1], abs=1e-6)
+        else:
+            oid = rng.choice(brute)[0]
+            size = round(rng.uniform(0.01, 10), 4)
+            fenwick.resize(oid, size)
+            brute = [(other, size if other == oid else old) for other, old in brute]
+
+        assert len(fenwick) == len(brute)
+        oid = rng.choice(brute)[0] if brute else None
+        if oid is not None:
+            count, size = fenwick.position(oid)
+            expected = ahead(brute, oid)
+            assert count == expected[0]
+            assert size == pytest.approx(expected[1], abs=1e-6)
+
+
+def test_compaction_keeps_order():
+    queue = LevelQueue()
+    for oid in range(200):
+        queue.append(oid, 1.0)
+    for oid in range(0, 190):
+        queue.remove(oid)
+    queue.append(999, 2.0)  # Triggers _compact: far more slots than live orders
+    assert len(queue.counts) < 64 + 2 * len(queue)
+    assert [queue.position(oid) for oid in (190, 199, 999)] == [(0, 0.0), (9, 9.0), (10, 10.0)]
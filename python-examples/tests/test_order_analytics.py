@@ -0,0 +1,41 @@
+"""OrderAnalytics (example 12): amends are not counted as cancels"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "12_order_analytics"))
+from order_analytics import L4OrderBook, OrderAnalytics  # noqa: E402
+
+
+def update(height, diffs, statuses):
+    return {"time": height * 100, "height": height, "book_diffs": diffs,
+            "order_statuses": [{"status": status, "order": {"oid": oid, "side": "B"}} for oid, status in statuses]}
+
+
+def test_amend_is_not_a_cancel():
+    book, analytics = L4OrderBook(), OrderAnalytics()
+    book.process_snapshot({"coin": "BTC", "height": 0, "levels": [
+        [{"oid": 1, "user": "a", "limitPx": "99", "sz": "1"}],
+        [{"oid": 2, "user": "b", "limitPx": "101", "sz": "1"}],
+    ]})
+    analytics.on_snapshot(book)
+    steps = [
+        # A new order, then the same oid moved to 98 as remove + new, then placed again at 97 without a remove
+        update(1, [{"oid": 3, "user": "a", "px": "99", "raw_book_diff": {"new": {"sz": "2"}}}], [(3, "open")]),
+        update(2, [{"oid": 3, "user": "a", "px": None, "raw_book_diff": "remove"},
+                   {"oid": 3, "user": "a", "px": "98", "raw_book_diff": {"new": {"sz": "2"}}}], [(3, "open")]),
+        update(3, [{"oid": 3, "user": "a", "px": "97", "raw_book_diff": {"new": {"sz": "2"}}}], [(3, "open")]),
+        update(4, [{"oid": 3, "user": "a", "px": None, "raw_book_diff": "remove"}], [(3, "canceled")]),
+    ]
+    for step in steps:
+        book.process_update(step)
+        analytics.on_update(book, step)
+
+    counts = analytics.by_user["a"]
+    assert (counts.adds, counts.amends, counts.cancels, counts.fills) == (1, 2, 1, 0)
+    assert counts.cancel_to_add() == 1
+    # The lifetime runs from the original add, not the last amend
+    assert analytics.time_to_cancel.total == 1
+    assert analytics.time_to_cancel.percentile(100) >= 300
+    assert ("bid", "98") not in analytics.queues and ("bid", "97") not in analytics.queues
+    assert analytics.queue_position(1, "bid", "99") == (0, 0)